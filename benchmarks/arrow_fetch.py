@@ -0,0 +1,117 @@
+"""
+Latensi dan memori pd.read_sql vs read_sql_arrow (COPY -> pyarrow).
+
+Setiap kombinasi (jumlah baris, metode) dijalankan di proses terpisah agar
+puncak RSS (ru_maxrss) tidak saling memengaruhi. Sumber data default adalah
+query sintetis generate_series dengan campuran tipe kolom dashboard (tanggal,
+timestamptz, teks berulang, numeric, integer), jadi tidak butuh tabel apa pun;
+--source menjalankan SELECT * FROM <tabel/view> LIMIT n sebagai gantinya.
+Koneksi diambil dari .streamlit/secrets.toml.
+
+Jalankan dari root project:
+    python -m benchmarks.arrow_fetch
+    python -m benchmarks.arrow_fetch --rows 100000 1000000 --repeat 3
+    python -m benchmarks.arrow_fetch --source vw_shipments_delivery --rows 200000
+"""
+
+import argparse
+import multiprocessing
+import resource
+import time
+
+SYNTHETIC_QUERY = """
+    SELECT
+        i AS id,
+        DATE '2025-01-01' + (i %% 365) AS tanggal,
+        TIMESTAMPTZ '2025-01-01 00:00:00+07' + i * INTERVAL '1 minute'
+            AS timestamp_input_data,
+        'Toko ' || (i %% 40) AS nama_toko,
+        'Brand ' || (i %% 12) AS nama_brand,
+        'SKU-' || (i %% 800) AS sku,
+        'Sesi ' || (i %% 4 + 1) AS sesi,
+        'R' || i AS no_resi,
+        (i %% 7 + 1)::int AS jumlah_item,
+        round((random() * 500000)::numeric, 2) AS total_omset,
+        CASE WHEN i %% 20 = 0 THEN NULL ELSE random() * 100 END AS rasio
+    FROM generate_series(1, %(rows)s) AS s(i)
+"""
+
+
+def _source_query(source: str | None) -> str:
+    if source is None:
+        return SYNTHETIC_QUERY
+    return f"SELECT * FROM {source} LIMIT %(rows)s"
+
+
+def _run(method: str, source: str | None, rows: int) -> dict:
+    """Dijalankan di proses anak: satu kali fetch, kembalikan metrik."""
+    import pandas as pd
+
+    from database.arrow_fetch import read_sql_arrow
+    from database.db_connection import get_connection
+
+    query = _source_query(source)
+    conn = get_connection()
+    try:
+        # Koneksi dan import sudah siap; yang diukur hanya fetch + konversi
+        rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        if method == "read_sql":
+            df = pd.read_sql(query, conn, params={"rows": rows})
+        else:
+            df = read_sql_arrow(query, params={"rows": rows}, conn=conn)
+        elapsed = time.perf_counter() - start
+        rss_after_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finally:
+        conn.close()
+
+    return {
+        "rows": len(df),
+        "seconds": elapsed,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+        "peak_rss_delta_mb": (rss_after_kb - rss_before_kb) / 1e3,
+    }
+
+
+def measure(method: str, source: str | None, rows: int, repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for _ in range(repeat):
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(_run, (method, source, rows)))
+    best = min(results, key=lambda r: r["seconds"])
+    best["peak_rss_delta_mb"] = max(r["peak_rss_delta_mb"] for r in results)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--source", default=None, help="tabel/view (default sintetis)")
+    args = parser.parse_args()
+
+    print(
+        f"Sumber: {args.source or 'generate_series'}, terbaik dari {args.repeat} kali"
+    )
+    print(
+        f"{'baris':>10} {'metode':<15} {'waktu (ms)':>11} "
+        f"{'frame (MB)':>11} {'puncak RSS (MB)':>16}"
+    )
+    for rows in args.rows:
+        baseline = None
+        for method in ("read_sql", "read_sql_arrow"):
+            r = measure(method, args.source, rows, args.repeat)
+            baseline = baseline or r
+            print(
+                f"{r['rows']:>10,} {method:<15} {r['seconds'] * 1000:>11.1f} "
+                f"{r['frame_mb']:>11.1f} {r['peak_rss_delta_mb']:>16.1f}"
+            )
+        print(
+            f"{'':>10} {'speedup':<15} {baseline['seconds'] / r['seconds']:>10.1f}x "
+            f"{baseline['frame_mb'] / r['frame_mb']:>10.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
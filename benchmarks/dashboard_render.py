@@ -0,0 +1,280 @@
+"""
+Waktu render dashboard Streamlit per halaman via AppTest.
+
+Setiap halaman dijalankan dengan streamlit.testing AppTest: sekali dengan
+cache kosong (first run) lalu beberapa kali rerun (cache terisi). Jumlah
+query dihitung dari log query_telemetry (panggilan cache miss selama run).
+Sebelum pengukuran, halaman pertama dijalankan sekali tanpa dicatat agar
+biaya import modul (plotly, pandas, dst.) tidak masuk ke angka first run.
+
+Tiga mode sumber data:
+    db      langsung ke database dari .streamlit/secrets.toml
+    record  seperti db, sekaligus menyimpan hasil setiap helper ber-track_query
+            ke fixture (pickle) untuk dipakai ulang
+    replay  tanpa database: hasil query diambil dari fixture dan baris
+            DataFrame direplikasi sesuai --scale (small x1, medium x10,
+            large x100)
+
+Perekaman dan replay memasang pembungkus di dalam setiap helper
+ber-track_query: track_query di-patch (mock.patch) sebelum modul query
+pertama kali di-import oleh halaman, sehingga kode produksi tidak perlu hook
+khusus benchmark.
+
+Jalankan dari root project:
+    python -m benchmarks.dashboard_render --mode record --fixtures /tmp/dash_fx
+    python -m benchmarks.dashboard_render --mode replay --fixtures /tmp/dash_fx
+    python -m benchmarks.dashboard_render --mode replay --fixtures /tmp/dash_fx \\
+        --scales large --pages finance regular
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import statistics
+import time
+import tomllib
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from database import db_connection, query_telemetry
+from database.query_telemetry import clear_query_log, get_query_log
+
+ROOT = Path(__file__).resolve().parent.parent
+SECRETS_FILE = ROOT / ".streamlit" / "secrets.toml"
+FIXTURE_FILE = "fixtures.pkl"
+
+PAGES = {
+    "finance": "views/dashboard/finance.py",
+    "admin": "views/dashboard/project_zyy/dashboard_admin_zyy.py",
+    "marketing": "views/dashboard/project_zyy/dashboard_marketing_zyy.py",
+    "advertiser": "views/dashboard/project_zyy/dashboard_advertiser_zyy.py",
+    "regular": "views/regular/dashboard_regular.py",
+}
+
+SCALES = {"small": 1, "medium": 10, "large": 100}
+
+DUMMY_SECRETS = {
+    "host": "localhost",
+    "port": 5432,
+    "dbname": "benchmark",
+    "user": "benchmark",
+    "password": "benchmark",
+}
+
+
+# Interceptor aktif: interceptor(function, params_hash, execute) -> hasil.
+# Global (bukan ContextVar) karena AppTest menjalankan script di thread lain
+_interceptor = None
+_track_query = query_telemetry.track_query
+
+
+def _intercepting_track_query(cache=None):
+    """
+    Pengganti track_query selama benchmark: fungsi asli dibungkus agar saat
+    cache miss hasilnya bisa direkam atau diganti fixture, lalu diteruskan ke
+    track_query asli sehingga telemetri (jumlah query) tetap tercatat.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        function_name = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def intercepted(*args, **kwargs):
+            interceptor = _interceptor
+            if interceptor is None:
+                return func(*args, **kwargs)
+            params = query_telemetry._describe_params(signature, args, kwargs)
+            params_hash = hashlib.md5(params.encode()).hexdigest()[:12]
+            return interceptor(
+                function_name, params_hash, lambda: func(*args, **kwargs)
+            )
+
+        return _track_query(cache)(intercepted)
+
+    return decorator
+
+
+def set_interceptor(interceptor):
+    global _interceptor
+    _interceptor = interceptor
+
+
+class FixtureRecorder:
+    """Interceptor yang menjalankan query asli dan menyimpan hasilnya."""
+
+    def __init__(self):
+        self.results = {}
+
+    def __call__(self, function, params_hash, execute):
+        result = execute()
+        self.results[(function, params_hash)] = result
+        return result
+
+    def save(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / FIXTURE_FILE, "wb") as f:
+            pickle.dump(self.results, f)
+
+
+class FixtureReplayer:
+    """
+    Interceptor yang mengembalikan hasil dari fixture. Jika parameter tidak
+    cocok persis (mis. tanggal default = kemarin), dipakai fixture lain dari
+    fungsi yang sama; jika fungsi tidak pernah direkam, DataFrame kosong.
+    """
+
+    def __init__(self, directory: Path, factor: int):
+        with open(directory / FIXTURE_FILE, "rb") as f:
+            recorded = pickle.load(f)
+        self.results = {key: _scale(value, factor) for key, value in recorded.items()}
+        self.by_function = {key[0]: key for key in self.results}
+        self.missing = set()
+
+    def __call__(self, function, params_hash, execute):
+        key = (function, params_hash)
+        if key not in self.results:
+            key = self.by_function.get(function)
+        if key is None:
+            self.missing.add(function)
+            return pd.DataFrame()
+        result = self.results[key]
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+
+
+def _scale(value, factor: int):
+    if isinstance(value, pd.DataFrame) and factor > 1 and not value.empty:
+        return pd.concat([value] * factor, ignore_index=True)
+    return value
+
+
+def _load_secrets() -> dict:
+    with open(SECRETS_FILE, "rb") as f:
+        return tomllib.load(f)["database"]
+
+
+def _query_count() -> int:
+    df_log = get_query_log()
+    return int((~df_log["cache_hit"]).sum()) if not df_log.empty else 0
+
+
+def _timed_run(at: AppTest) -> tuple:
+    clear_query_log()
+    start = time.perf_counter()
+    at.run()
+    return time.perf_counter() - start, _query_count()
+
+
+def measure_page(path: str, secrets: dict, reruns: int, timeout: float) -> dict:
+    st.cache_data.clear()
+    at = AppTest.from_file(str(ROOT / path), default_timeout=timeout)
+    at.secrets["database"] = secrets
+    at.session_state["role"] = "owner"
+
+    first_s, first_queries = _timed_run(at)
+    rerun_timings, rerun_queries = [], 0
+    for _ in range(reruns):
+        rerun_s, rerun_queries = _timed_run(at)
+        rerun_timings.append(rerun_s)
+
+    return {
+        "first_run_ms": round(first_s * 1000, 1),
+        "first_run_queries": first_queries,
+        "rerun_ms": (
+            round(statistics.median(rerun_timings) * 1000, 1) if rerun_timings else None
+        ),
+        "rerun_queries": rerun_queries,
+        "exceptions": [e.message for e in at.exception],
+    }
+
+
+def run_benchmark(args) -> list:
+    results = []
+    warmed_up = False
+    if args.mode == "replay":
+        # Halaman yang membuka koneksi psycopg2 sendiri tidak boleh menyentuh
+        # database saat replay
+        with mock.patch.object(db_connection, "get_connection", lambda: None):
+            for scale in args.scales:
+                replayer = FixtureReplayer(args.fixtures, SCALES[scale])
+                set_interceptor(replayer)
+                try:
+                    if not warmed_up:
+                        measure_page(
+                            PAGES[args.pages[0]], DUMMY_SECRETS, 0, args.timeout
+                        )
+                        warmed_up = True
+                    for page in args.pages:
+                        replayer.missing = set()
+                        result = measure_page(
+                            PAGES[page], DUMMY_SECRETS, args.reruns, args.timeout
+                        )
+                        result["missing_fixtures"] = sorted(replayer.missing)
+                        results.append({"page": page, "scale": scale, **result})
+                finally:
+                    set_interceptor(None)
+    else:
+        secrets = _load_secrets()
+        recorder = FixtureRecorder() if args.mode == "record" else None
+        set_interceptor(recorder)
+        try:
+            measure_page(PAGES[args.pages[0]], secrets, 0, args.timeout)
+            for page in args.pages:
+                result = measure_page(PAGES[page], secrets, args.reruns, args.timeout)
+                results.append({"page": page, "scale": args.mode, **result})
+        finally:
+            set_interceptor(None)
+        if recorder is not None:
+            recorder.save(args.fixtures)
+            print(f"{len(recorder.results)} fixture disimpan ke {args.fixtures}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["db", "record", "replay"], default="replay")
+    parser.add_argument("--fixtures", type=Path, default=ROOT / ".benchmark_fixtures")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument(
+        "--scales", nargs="+", choices=list(SCALES), default=list(SCALES)
+    )
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    # Harus aktif sebelum halaman pertama meng-import modul query
+    with mock.patch.object(query_telemetry, "track_query", _intercepting_track_query):
+        results = run_benchmark(args)
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+        return
+
+    print(
+        f"{'halaman':<11} {'skala':<7} {'first (ms)':>11} {'query':>6} "
+        f"{'rerun (ms)':>11} {'query':>6}  catatan"
+    )
+    for r in results:
+        notes = []
+        if r["exceptions"]:
+            notes.append(f"{len(r['exceptions'])} exception")
+        if r.get("missing_fixtures"):
+            notes.append(f"tanpa fixture: {', '.join(r['missing_fixtures'])}")
+        print(
+            f"{r['page']:<11} {r['scale']:<7} {r['first_run_ms']:>11.1f} "
+            f"{r['first_run_queries']:>6} {r['rerun_ms']:>11.1f} "
+            f"{r['rerun_queries']:>6}  {'; '.join(notes)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Benchmark end-to-end jalur upload marketplace dengan file BigSeller sintetis.
+
+Untuk setiap ukuran (default 1k/10k/100k/1M baris) dibuat file sintetis
+berformat BigSeller: kolom sesuai bigseller_schema, SKU bundling
+("ZYY-001 + 004") dan kemasan ("ERA-010-3-PCS"), nama bulan Indonesia
+("05 Agu 2024 13:22"), serta format mata uang campuran ("6,000", "9856,5",
+"12.345,67", "5000"). Lalu load_dataframe -> standardize_silver_data
+(-> process_silver_to_gold jika --gold) dijalankan dan waktunya dicatat per
+tahap dengan PipelineRun.
+
+Setiap ukuran dijalankan di subprocess terpisah agar peak RSS
+(ru_maxrss) tidak tercampur antar ukuran.
+
+--gold menulis ke database dari .streamlit/secrets.toml [database]; arahkan
+ke Postgres lokal yang skemanya sudah dibuat, JANGAN ke warehouse produksi.
+
+Jalankan dari root project:
+    python -m benchmarks.etl_pipeline
+    python -m benchmarks.etl_pipeline --sizes 1000 10000 --gold --trace-memory
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pipeline.config.value_mappings import (
+    BRAND_MAP,
+    PAYMENT_METHOD_MAP,
+    PROVINCE_MAPPING,
+    SHIPPING_PROVIDER_MAP,
+)
+from pipeline.schemas.bigseller_schema import bigseller_schema
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+BULAN = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "Mei",
+    "Jun",
+    "Jul",
+    "Agu",
+    "Sep",
+    "Okt",
+    "Nov",
+    "Des",
+]
+MARKETPLACES = ["Shopee", "TikTok", "Lazada", "Tokopedia"]
+ITEMS_PER_ORDER = 1.4
+
+
+def _format_currency(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Angka rupiah dalam format campuran seperti hasil export BigSeller/Excel."""
+    whole = values.round().astype(np.int64)
+    style = rng.integers(0, 4, len(values))
+    plain = whole.astype(str)
+    us_thousands = np.array([f"{v:,}" for v in whole])
+    euro_thousands = np.char.replace(us_thousands, ",", ".")
+    decimal_comma = np.char.add(np.char.add(plain, ","), "5")
+    return np.select(
+        [style == 0, style == 1, style == 2],
+        [plain, us_thousands, euro_thousands],
+        default=decimal_comma,
+    )
+
+
+def _format_datetime(values: pd.DatetimeIndex, rng: np.random.Generator) -> np.ndarray:
+    """Campuran "05 Agu 2024 13:22" (bulan Indonesia) dan ISO "2024-08-05 13:22"."""
+    bulan = np.array(BULAN)[values.month - 1]
+    indonesian = (
+        values.strftime("%d ").to_numpy().astype(str)
+        + bulan
+        + values.strftime(" %Y %H:%M").to_numpy().astype(str)
+    )
+    iso = values.strftime("%Y-%m-%d %H:%M").to_numpy().astype(str)
+    return np.where(rng.random(len(values)) < 0.7, indonesian, iso)
+
+
+def _build_skus(rows: int, rng: np.random.Generator) -> np.ndarray:
+    prefixes = np.array(list(BRAND_MAP.keys()))
+    brand = prefixes[rng.integers(0, len(prefixes), rows)]
+    code = np.char.zfill(rng.integers(1, 40, rows).astype(str), 3)
+    base = np.char.add(np.char.add(brand, "-"), code)
+
+    kind = rng.random(rows)
+    bundle_code = np.char.zfill(rng.integers(1, 40, rows).astype(str), 3)
+    bundle = np.char.add(np.char.add(base, " + "), bundle_code)
+    pack_size = rng.integers(2, 6, rows).astype(str)
+    pack = np.char.add(np.char.add(np.char.add(base, "-"), pack_size), "-PCS")
+    return np.select([kind < 0.15, kind < 0.25], [bundle, pack], default=base)
+
+
+def generate_bigseller_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """DataFrame string berformat export BigSeller (semua kolom bigseller_schema)."""
+    rng = np.random.default_rng(seed)
+    n_orders = max(1, int(rows / ITEMS_PER_ORDER))
+    order_idx = np.sort(rng.integers(0, n_orders, rows))
+
+    def per_order(values):
+        return np.asarray(values)[order_idx]
+
+    def pick(options, size):
+        options = np.asarray(list(options))
+        return options[rng.integers(0, len(options), size)]
+
+    marketplace = per_order(pick(MARKETPLACES, n_orders))
+    toko_suffix = per_order(pick(["Official Store", "Herbal Store", "Mall"], n_orders))
+    n_customers = max(1, int(n_orders * 0.8))
+    customer_idx = per_order(rng.integers(0, n_customers, n_orders))
+
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        per_order(rng.integers(0, 365 * 24 * 60, n_orders)), unit="min"
+    )
+    created = pd.DatetimeIndex(created)
+    jumlah = rng.integers(1, 6, rows)
+    harga_satuan = rng.integers(15, 250, rows) * 1000.0
+    subtotal = harga_satuan * jumlah
+    ongkir = per_order(rng.integers(0, 40, n_orders) * 1000.0)
+
+    df = pd.DataFrame(
+        {
+            "Nomor Pesanan": np.char.add(
+                f"BM{seed:02d}", np.char.zfill(order_idx.astype(str), 10)
+            ),
+            "Status Pesanan": per_order(
+                pick(["Selesai", "Dikirim", "Dibatalkan"], n_orders)
+            ),
+            "Marketplace": marketplace,
+            "Toko Marketplace": np.char.add(
+                np.char.add(marketplace.astype(str), " "), toko_suffix.astype(str)
+            ),
+            "Nama Pembeli": np.char.add("Pembeli ", customer_idx.astype(str)),
+            "Nomor Telepon": np.char.add(
+                "62812", np.char.zfill(customer_idx.astype(str), 7)
+            ),
+            "Kode Pos": per_order(rng.integers(10000, 99999, n_orders).astype(str)),
+            "Negara": "Indonesia",
+            "Provinsi": per_order(pick(PROVINCE_MAPPING.keys(), n_orders)),
+            "Kabupaten/Kota": per_order(pick(["Kota Bandung", "Kab. Bogor"], n_orders)),
+            "Kecamatan": per_order(pick(["Coblong", "Cibinong", "Tebet"], n_orders)),
+            "Kelurahan": per_order(pick(["Dago", "Pakansari", "Manggarai"], n_orders)),
+            "Alamat Lengkap": np.char.add(
+                "Jl. Mawar No. ", np.char.mod("%d", customer_idx % 200)
+            ),
+            "SKU": _build_skus(rows, rng),
+            "Nama Produk": pick(["Kapsul Herbal 30", "Minyak Urut 60ml"], rows),
+            "Jumlah": jumlah.astype(str),
+            "Harga Satuan": _format_currency(harga_satuan, rng),
+            "Subtotal Produk": _format_currency(subtotal, rng),
+            "Harga Awal Produk": _format_currency(harga_satuan * 1.2, rng),
+            "Jasa Kirim yang Dipilih Pembeli": per_order(
+                pick(SHIPPING_PROVIDER_MAP.keys(), n_orders)
+            ),
+            "Nomor Resi": np.char.add(
+                f"RS{seed:02d}", np.char.zfill(order_idx.astype(str), 10)
+            ),
+            "Ongkos Kirim": _format_currency(ongkir, rng),
+            "Diskon Ongkos Kirim Penjual": _format_currency(ongkir * 0.1, rng),
+            "Diskon Ongkos Kirim Marketplace": _format_currency(ongkir * 0.5, rng),
+            "Total Pesanan": _format_currency(subtotal + ongkir, rng),
+            "Metode Pembayaran": per_order(pick(PAYMENT_METHOD_MAP.keys(), n_orders)),
+            "Biaya Pengelolaan": _format_currency(subtotal * 0.02, rng),
+            "Biaya Transaksi": _format_currency(subtotal * 0.01, rng),
+            "Diskon Penjual": _format_currency(subtotal * 0.05, rng),
+            "Diskon Marketplace": _format_currency(subtotal * 0.03, rng),
+            "Voucher": _format_currency(subtotal * 0.02, rng),
+            "Voucher Toko": _format_currency(subtotal * 0.01, rng),
+            "Gudang": "GUDANG BANDUNG",
+            "Sesi Pengiriman": per_order(pick(["Sesi 1", "Sesi 2"], n_orders)),
+            "Jenis Resi": "Resi Otomatis",
+        }
+    )
+    offsets = {
+        "Waktu Pesanan Dibuat": "0min",
+        "Waktu Pesanan Dibayar": "5min",
+        "Waktu Kedaluwarsa": "3D",
+        "Waktu Proses": "2h",
+        "Waktu Cetak": "3h",
+        "Waktu Pesanan Dikirim": "1D",
+        "Waktu Selesai": "4D",
+        "Tanggal Gudang": "1D",
+    }
+    for column, offset in offsets.items():
+        df[column] = _format_datetime(created + pd.Timedelta(offset), rng)
+    df["Waktu Pembatalan"] = np.where(
+        df["Status Pesanan"] == "Dibatalkan", df["Waktu Proses"], ""
+    )
+
+    # Urutan kolom mengikuti bigseller_schema, seperti template export
+    return df[list(bigseller_schema.columns)]
+
+
+def run_single(rows: int, with_gold: bool, trace_memory: bool) -> dict:
+    """Menjalankan satu ukuran di proses ini dan mengembalikan hasilnya."""
+    # Impor di sini agar generator bisa dipakai tanpa dependensi Streamlit/DB
+    from pipeline.transformers.silver_standardizer import standardize_silver_data
+    from pipeline.utils.helpers import load_dataframe
+    from pipeline.utils.instrumentation import PipelineRun
+
+    start = time.perf_counter()
+    df_raw = generate_bigseller_frame(rows)
+    generate_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, f"bigseller_{rows}.csv")
+        df_raw.to_csv(path, index=False)
+        file_mb = os.path.getsize(path) / (1024 * 1024)
+        del df_raw
+
+        run = PipelineRun("benchmark_etl", track_memory=trace_memory)
+        try:
+            with open(path, "rb") as file:
+                df_dirty = run.timed("load file", load_dataframe, file)
+            run.rows_in = len(df_dirty)
+            df_clean = run.timed(
+                "standardize silver", standardize_silver_data, df_dirty
+            )
+            del df_dirty
+
+            if with_gold:
+                from pipeline.transformers.silver_to_gold import process_silver_to_gold
+
+                process_silver_to_gold(df_clean, run=run)
+            run.finish()
+        finally:
+            run.stop_memory_tracking()
+
+    # ru_maxrss dalam KB di Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "rows": rows,
+        "file_mb": round(file_mb, 1),
+        "generate_s": round(generate_s, 2),
+        "total_s": run.duration_s,
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "stages": run.stages,
+    }
+
+
+def report(result: dict):
+    print(
+        f"\n=== {result['rows']:,} baris | file {result['file_mb']} MB | "
+        f"total {result['total_s']:.2f} s | peak RSS {result['peak_rss_mb']:,.0f} MB"
+    )
+    print(
+        f"{'tahap':<32} {'durasi (s)':>10} {'baris':>10} {'COPY (MB)':>10} {'mem (MB)':>9}"
+    )
+    for stage in result["stages"]:
+        rows_out = "" if stage["rows_out"] is None else f"{stage['rows_out']:,}"
+        copy_mb = stage["copy_bytes"] / (1024 * 1024)
+        peak = "" if stage["peak_mem_mb"] is None else f"{stage['peak_mem_mb']:,.0f}"
+        print(
+            f"{stage['stage']:<32} {stage['duration_s']:>10.3f} {rows_out:>10} "
+            f"{copy_mb:>10.1f} {peak:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--gold",
+        action="store_true",
+        help="Ikut jalankan process_silver_to_gold ke database lokal.",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Catat peak memori per tahap (tracemalloc, menambah overhead).",
+    )
+    parser.add_argument("--json", help="Simpan hasil mentah ke file JSON.")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, force=True)
+
+    if args.single:
+        result = run_single(args.single, args.gold, args.trace_memory)
+        print(json.dumps(result, default=str))
+        return
+
+    results = []
+    for rows in args.sizes:
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.etl_pipeline",
+            "--single",
+            str(rows),
+        ]
+        if args.gold:
+            command.append("--gold")
+        if args.trace_memory:
+            command.append("--trace-memory")
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"\n! Ukuran {rows:,} gagal:\n{completed.stderr[-2000:]}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        report(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Laporan waktu import modul aplikasi (gaya `python -X importtime`).
+
+Setiap modul di-import pada proses Python baru dengan flag -X importtime,
+lalu output stderr-nya diringkas: total waktu kumulatif modul tersebut dan
+daftar import paling lambat di dalamnya. Berguna untuk memastikan import
+modul view tidak lagi memicu query database (cold start & pindah halaman).
+
+Jalankan dari root project:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time views.config --top 20
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "database.queries.dimmension_query",
+    "views.config",
+    "data_preprocessor.utils",
+    "views.management.management_config",
+    "views.renderer.dashboard_marketing",
+    "views.render_pages",
+]
+
+IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|\s+(?P<name>.+)$"
+)
+
+
+def profile_import(module: str) -> list:
+    """
+    Meng-import satu modul di subprocess dan mengembalikan list
+    (nama_modul, self_us, cumulative_us) dari output -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append(
+                (
+                    match["name"].strip(),
+                    int(match["self"]),
+                    int(match["cumulative"]),
+                )
+            )
+    if result.returncode != 0:
+        error_lines = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        print(f"  ! Import {module} gagal: {error_lines[-1] if error_lines else ''}")
+    return entries
+
+
+def report(module: str, top: int):
+    entries = profile_import(module)
+    if not entries:
+        return
+
+    total_us = next(
+        (cumulative for name, _, cumulative in entries if name == module),
+        max(cumulative for _, _, cumulative in entries),
+    )
+    print(f"\n=== {module}: {total_us / 1000:.1f} ms (kumulatif)")
+    print(f"{'self (ms)':>10} {'kumulatif (ms)':>15}  modul")
+    for name, self_us, cumulative_us in sorted(
+        entries, key=lambda entry: entry[1], reverse=True
+    )[:top]:
+        print(f"{self_us / 1000:>10.1f} {cumulative_us / 1000:>15.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument(
+        "--top", type=int, default=10, help="Jumlah import paling lambat per modul."
+    )
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, args.top)
+
+
+if __name__ == "__main__":
+    main()
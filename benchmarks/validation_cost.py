@@ -0,0 +1,99 @@
+"""
+Biaya validasi pandera per skema: mode "full" vs "sampled".
+
+Untuk setiap skema di jalur ETL dibuat DataFrame sintetis yang valid
+(default 100k baris, kolom unik benar-benar unik, kolom nullable berisi
+sebagian null), lalu validate_frame dijalankan beberapa kali per mode dan
+waktu terbaiknya dilaporkan.
+
+Jalankan dari root project:
+    python -m benchmarks.validation_cost
+    python -m benchmarks.validation_cost --rows 200000 --repeat 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from pandera.engines import pandas_engine
+
+from pipeline.schemas import gold_schema
+from pipeline.schemas.bigseller_schema import bigseller_schema
+from pipeline.schemas.validation import validate_frame
+
+SCHEMAS = {
+    "bigseller_schema": bigseller_schema,
+    "orders_schema": gold_schema.orders_schema,
+    "order_items_schema": gold_schema.order_items_schema,
+    "shipments_schema": gold_schema.shipments_schema,
+    "payments_schema": gold_schema.payments_schema,
+}
+
+
+def _synthetic_column(column, rows: int, rng: np.random.Generator) -> pd.Series:
+    dtype = str(pandas_engine.Engine.dtype(column.dtype))
+    if dtype.startswith("datetime"):
+        values = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+            rng.integers(0, 365 * 24 * 3600, rows), unit="s"
+        )
+        series = pd.Series(values)
+    elif dtype.startswith("int"):
+        series = pd.Series(rng.integers(1, 1000, rows))
+    elif dtype.startswith("float"):
+        series = pd.Series(rng.uniform(0, 500_000, rows).round(2))
+    else:
+        series = pd.Series(rng.integers(0, 50_000, rows).astype(str)).radd("v")
+
+    if column.unique:
+        series = pd.Series(np.arange(rows).astype(str)).radd("u")
+    if column.nullable and not dtype.startswith("int"):
+        series = series.mask(rng.random(rows) < 0.05)
+    return series
+
+
+def synthetic_frame(schema, rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            name: _synthetic_column(column, rows, rng)
+            for name, column in schema.columns.items()
+        }
+    )
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sample-size", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"Validasi {args.rows:,} baris, terbaik dari {args.repeat} kali")
+    print(f"{'skema':<22} {'full (ms)':>10} {'sampled (ms)':>13} {'speedup':>8}")
+    for name, schema in SCHEMAS.items():
+        df = synthetic_frame(schema, args.rows)
+        full_s = best_of(lambda: validate_frame(schema, df, mode="full"), args.repeat)
+        sampled_s = best_of(
+            lambda: validate_frame(
+                schema, df, mode="sampled", sample_size=args.sample_size
+            ),
+            args.repeat,
+        )
+        print(
+            f"{name:<22} {full_s * 1000:>10.1f} {sampled_s * 1000:>13.1f} "
+            f"{full_s / sampled_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Penyimpanan state st.data_editor per tab dengan memori terbatas.
+
+Setiap DataFrame editor disimpan di st.session_state dengan kuncinya sendiri
+(mis. "df_enzhico_omset"), tetapi hanya DataFrame milik tab yang sedang aktif
+yang dipertahankan dalam bentuk DataFrame. DataFrame lain dalam grup yang sama
+di-"spill" menjadi bytes terkompresi (Parquet, atau pickle+zlib sebagai
+cadangan) dan baru dikembalikan menjadi DataFrame saat tab-nya dibuka lagi.
+"""
+
+import io
+import logging
+import pickle
+import zlib
+
+import pandas as pd
+import streamlit as st
+
+SPILL_STATE_KEY = "_editor_state_spill"
+ACTIVE_STATE_KEY = "_editor_state_active"
+
+
+def _spill(df: pd.DataFrame) -> tuple:
+    """Mengubah DataFrame menjadi representasi ringkas (format, bytes)."""
+    try:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=True, compression="zstd")
+        return "parquet", buffer.getvalue()
+    except Exception as e:
+        # Kolom object dengan tipe campuran tidak selalu bisa ditulis ke Parquet
+        logging.info(f"Spill Parquet gagal, memakai pickle: {e}")
+        return "pickle", zlib.compress(pickle.dumps(df))
+
+
+def _restore(spilled: tuple) -> pd.DataFrame:
+    """Mengembalikan DataFrame dari hasil _spill."""
+    fmt, payload = spilled
+    if fmt == "parquet":
+        return pd.read_parquet(io.BytesIO(payload))
+    return pickle.loads(zlib.decompress(payload))
+
+
+def activate_editor_state(session_key: str, build_default, group: str = None):
+    """
+    Memastikan DataFrame editor untuk session_key tersedia di st.session_state.
+
+    Urutan sumber: DataFrame yang sudah ada, hasil spill sebelumnya, lalu
+    build_default() (dipanggil secara lazy hanya jika belum pernah dibuat).
+    Jika group diberikan, DataFrame yang sebelumnya aktif di grup yang sama
+    akan di-spill agar hanya satu DataFrame per grup yang tersimpan utuh.
+
+    Args:
+        session_key (str): Kunci DataFrame di st.session_state.
+        build_default (callable): Fungsi tanpa argumen yang membuat DataFrame default.
+        group (str, optional): Nama grup tab (mis. "omset").
+    """
+    spilled = st.session_state.setdefault(SPILL_STATE_KEY, {})
+    active = st.session_state.setdefault(ACTIVE_STATE_KEY, {})
+
+    if group is not None:
+        previous_key = active.get(group)
+        is_switch = previous_key not in (None, session_key)
+        if is_switch and previous_key in st.session_state:
+            spilled[previous_key] = _spill(st.session_state.pop(previous_key))
+        active[group] = session_key
+
+    if session_key in st.session_state:
+        return
+
+    if session_key in spilled:
+        st.session_state[session_key] = _restore(spilled.pop(session_key))
+    else:
+        st.session_state[session_key] = build_default()
+
+
+def select_active_tab(tab_names: list, key: str) -> str:
+    """
+    Pengganti st.tabs untuk form editor: hanya tab yang dipilih yang dirender.
+
+    st.tabs selalu merender seluruh isi tab pada setiap rerun, sehingga semua
+    DataFrame editor ikut dibuat. Selector ini membuat halaman cukup memproses
+    satu tab saja (tab lain tetap tersimpan dalam bentuk spill).
+
+    Args:
+        tab_names (list): Daftar nama tab.
+        key (str): Kunci widget selector yang unik per halaman.
+
+    Returns:
+        str: Nama tab yang aktif.
+    """
+    selected = st.segmented_control(
+        "Pilih tab",
+        options=tab_names,
+        default=tab_names[0],
+        key=key,
+        label_visibility="collapsed",
+    )
+    # segmented_control bisa dikosongkan dengan klik ulang; kembali ke tab pertama
+    return selected or tab_names[0]
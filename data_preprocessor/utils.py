@@ -8,14 +8,15 @@ import streamlit as st
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
-from psycopg2 import sql
 
+from data_preprocessor.editor_state import activate_editor_state
+from database.editor_changes import apply_editor_changes
 from views.config import (
     AKUN_REGULAR,
     MARKETPLACE_LIST,
     PLATFORM_REGULAR,
-    PROJECT_NAME_LIST,
     TOKO_BANDUNG,
+    get_project_name_list,
     get_yesterday_in_jakarta,
 )
 
@@ -267,8 +268,8 @@ def initialize_omset_data_session(project_name, marketplace_list, store_list):
     """
     session_key = f"df_{project_name}_omset"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -283,7 +284,9 @@ def initialize_omset_data_session(project_name, marketplace_list, store_list):
             "Bukti": [None] * len(store_list),
             "Akun Bank": [None] * len(store_list),
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="omset")
 
 
 def get_omset_column_config(store_list):
@@ -343,8 +346,8 @@ def initialize_omset_reg_data_session(project_name):
     """
     session_key = f"df_{project_name}_omset_reg"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -356,7 +359,9 @@ def initialize_omset_reg_data_session(project_name):
             "Bukti": [None] * len(PLATFORM_REGULAR),
             "Akun Bank": [None] * len(PLATFORM_REGULAR),
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="omset_reg")
 
 
 def get_omset_reg_column_config():
@@ -403,8 +408,8 @@ def initialize_ads_data_session(project_name, marketplace_list, store_list):
     """
     session_key = f"df_{project_name}_ads"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -415,7 +420,9 @@ def initialize_ads_data_session(project_name, marketplace_list, store_list):
             # "Nominal Budget Ads": [0.0] * len(store_list),
             "Nominal Aktual Ads": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="ads")
 
 
 def get_ads_column_config(store_list):
@@ -459,8 +466,8 @@ def initialize_finance_cpas_data_session(project_name, store_list, akun_list):
     """
     session_key = f"df_{project_name}_cpas"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -470,7 +477,9 @@ def initialize_finance_cpas_data_session(project_name, store_list, akun_list):
             "Akun": akun_list,
             "Nominal Aktual Ads": [0.0] * len(akun_list),
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="finance_cpas")
 
 
 def get_finance_cpas_column_config(store_list, akun_list):
@@ -507,15 +516,17 @@ def initialize_non_ads_lainnya_data_session():
     """
     session_key = "df_non_ads_lainnya"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(get_yesterday_in_jakarta(), index=range(1)),
             "Nama Project": ["Enzhico"],
             "Keterangan": ["Talent"],
             "Nominal Aktual Non Ads": [0.0],
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="non_ads_lainnya")
 
 
 def get_non_ads_lainnya_column_config():
@@ -531,7 +542,7 @@ def get_non_ads_lainnya_column_config():
             required=True,
         ),
         "Nama Project": st.column_config.SelectboxColumn(
-            "Nama Project", options=PROJECT_NAME_LIST, required=True
+            "Nama Project", options=get_project_name_list(), required=True
         ),
         "Keterangan": st.column_config.TextColumn("Keterangan", required=True),
         "Nominal Aktual Non Ads": st.column_config.NumberColumn(
@@ -552,10 +563,10 @@ def initialize_non_ads_data_session(project_name, marketplace_list, store_list):
         marketplace__list (list): Daftar nama marketplace yang akan diisi ke DataFrame.
         store_list (list): Daftar nama toko yang akan diisi ke DataFrame.
     """
-    session_key = f"df_{project_name}_ads"
+    session_key = f"df_{project_name}_non_ads"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -565,7 +576,9 @@ def initialize_non_ads_data_session(project_name, marketplace_list, store_list):
             "Nama Toko": store_list,
             "Nominal Aktual Non Ads": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="non_ads")
 
 
 def get_non_ads_column_config(store_list):
@@ -604,14 +617,16 @@ def initialize__ads_reg_data_session(branch_name):
     """
     session_key = f"df_{branch_name}_reg_ads"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(get_yesterday_in_jakarta(), index=range(3)),
             "Akun": AKUN_REGULAR,
             "Nominal Aktual Ads": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="ads_reg")
 
 
 def get_ads_reg_column_config():
@@ -642,8 +657,8 @@ def initialize_stock_data_session():
     """
     session_key = "df_stock"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(get_yesterday_in_jakarta(), index=range(5)),
             "Marketplace": None,
@@ -651,7 +666,9 @@ def initialize_stock_data_session():
             "Nominal Budget Ads": [0.0] * 5,
             "Nominal Aktual Ads": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="stock")
 
 
 def get_stock_column_config(store_list):
@@ -697,8 +714,8 @@ def initialize_marketplace_data_session(project_name, marketplace_list, store_li
     """
     session_key = f"df_{project_name}_marketplace"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -712,7 +729,9 @@ def initialize_marketplace_data_session(project_name, marketplace_list, store_li
             "Gross Revenue": None,
             "CTR": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="marketplace")
 
 
 def get_marketplace_column_config(store_list):
@@ -777,8 +796,8 @@ def initialize_cpas_data_session(project_name, store_list, akun_list):
     """
     session_key = f"df_{project_name}_cpas"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -790,7 +809,9 @@ def initialize_cpas_data_session(project_name, store_list, akun_list):
             "Konversi": None,
             "Gross Revenue": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="cpas")
 
 
 def get_cpas_column_config(store_list, akun_list):
@@ -1310,8 +1331,8 @@ def initialize_adv_reg_data_session(platform, project_list, produk_list):
     """
     session_key = f"df_{platform}_adv_reg"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -1324,7 +1345,9 @@ def initialize_adv_reg_data_session(platform, project_list, produk_list):
             "Thruplays": [0.0] * len(produk_list),
             "Lead": [0] * len(produk_list),
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="adv_reg")
 
 
 def get_adv_reg_column_config(store_list):
@@ -1365,91 +1388,53 @@ def get_adv_reg_column_config(store_list):
     }
 
 
-@st.cache_data(ttl=3600)
-def fetch_data(_conn):
-    """Mengambil semua data, diurutkan dengan channel."""
-    query = "SELECT * FROM advertiser_cs_regular ORDER BY performance_date DESC, product_name, channel;"
-    try:
-        df = pd.read_sql(query, _conn)
-        df["performance_date"] = pd.to_datetime(df["performance_date"]).dt.date
-        return df
-    except Exception as e:
-        st.error(f"Gagal mengambil data: {e}")
-        return pd.DataFrame()
+def create_daily_template(conn, start_date, product_channel_list, end_date=None):
+    """
+    Memasukkan baris template (tanggal, produk, channel) untuk satu tanggal
+    atau rentang tanggal (backfill) dalam satu statement. Baris yang sudah
+    ada dilewati.
 
+    Args:
+        conn: Koneksi psycopg2.
+        start_date (date): Tanggal template (awal rentang).
+        product_channel_list (list[tuple]): Pasangan (product_name, channel).
+        end_date (date, optional): Akhir rentang; default sama dengan start_date.
 
-def create_daily_template(conn, template_date, product_channel_list):
-    """Memasukkan baris template dengan menyertakan channel."""
+    Returns:
+        int: Jumlah baris template yang baru dibuat.
+    """
+    if not product_channel_list:
+        return 0
+
+    products, channels = zip(*product_channel_list)
+    query = """
+        INSERT INTO advertiser_cs_regular (performance_date, product_name, channel)
+        SELECT d::date, p.product_name, p.channel
+        FROM generate_series(%s::date, %s::date, INTERVAL '1 day') AS d
+        CROSS JOIN UNNEST(%s::text[], %s::text[]) AS p(product_name, channel)
+        ON CONFLICT (performance_date, product_name, channel) DO NOTHING;
+    """
     with conn.cursor() as cur:
-        for product, channel in product_channel_list:
-            query = """
-                INSERT INTO advertiser_cs_regular (performance_date, product_name, channel)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (performance_date, product_name, channel) DO NOTHING;
-            """
-            cur.execute(query, (template_date, product, channel))
+        cur.execute(
+            query,
+            (start_date, end_date or start_date, list(products), list(channels)),
+        )
+        created = cur.rowcount
     conn.commit()
+    return created
 
 
 def process_changes(conn, original_df, changes):
     """Memproses perubahan dengan primary key tiga bagian."""
     with conn.cursor() as cur:
-        # Proses Hapus
-        for index in changes["deleted_rows"]:
-            row = original_df.iloc[index]
-            cur.execute(
-                "DELETE FROM advertiser_cs_regular WHERE performance_date = %s AND product_name = %s AND channel = %s;",
-                (row["performance_date"], row["product_name"], row["channel"]),
-            )
-
-        # Proses Tambah (UPSERT)
-        for new_row in changes["added_rows"]:
-            new_row.pop("_index", None)
-            if not all(
-                new_row.get(k) for k in ["performance_date", "product_name", "channel"]
-            ):
-                continue
-
-            cols = [sql.Identifier(k) for k, v in new_row.items() if v is not None]
-            if not cols:
-                continue
-            vals = [v for v in new_row.values() if v is not None]
-            update_assignments = sql.SQL(", ").join(
-                sql.SQL("{col} = EXCLUDED.{col}").format(col=col)
-                for col in cols
-                if col.string not in ["performance_date", "product_name", "channel"]
-            )
-
-            query = sql.SQL("""
-                INSERT INTO advertiser_cs_regular ({cols}) VALUES ({vals})
-                ON CONFLICT (performance_date, product_name, channel) DO UPDATE SET {updates};
-            """).format(
-                cols=sql.SQL(", ").join(cols),
-                vals=sql.SQL(", ").join(sql.Placeholder() * len(vals)),
-                updates=update_assignments,
-            )
-            cur.execute(query, vals)
-
-        # Proses Edit
-        for index, updates in changes["edited_rows"].items():
-            updates.pop("_index", None)
-            if not updates:
-                continue
-
-            original_row = original_df.iloc[index]
-            set_clauses = [
-                sql.SQL("{} = %s").format(sql.Identifier(col)) for col in updates.keys()
-            ]
-            query = sql.SQL(
-                "UPDATE advertiser_cs_regular SET {} WHERE performance_date = %s AND product_name = %s AND channel = %s;"
-            ).format(sql.SQL(", ").join(set_clauses))
-
-            params = list(updates.values()) + [
-                original_row["performance_date"],
-                original_row["product_name"],
-                original_row["channel"],
-            ]
-            cur.execute(query, params)
+        apply_editor_changes(
+            cur,
+            "advertiser_cs_regular",
+            ["performance_date", "product_name", "channel"],
+            original_df,
+            changes,
+            upsert=True,
+        )
     conn.commit()
 
 
@@ -1459,8 +1444,8 @@ def initialize_adv_cs_reg_data_session(project_name, marketplace_list, store_lis
     """
     session_key = f"df_{project_name}_marketplace"
 
-    if session_key not in st.session_state:
-        # Buat DataFrame default dengan kolom yang dibutuhkan
+    # Buat DataFrame default dengan kolom yang dibutuhkan (lazy, hanya saat tab aktif)
+    def build_default():
         data = {
             "Tanggal": pd.Series(
                 get_yesterday_in_jakarta(),
@@ -1474,7 +1459,9 @@ def initialize_adv_cs_reg_data_session(project_name, marketplace_list, store_lis
             "Gross Revenue": None,
             "CTR": None,
         }
-        st.session_state[session_key] = pd.DataFrame(data)
+        return pd.DataFrame(data)
+
+    activate_editor_state(session_key, build_default, group="adv_cs_reg")
 
 
 def get_adv_cs_reg_column_config(store_list):
@@ -0,0 +1,177 @@
+"""
+Jalur baca berbasis Arrow untuk view/tabel besar.
+
+pd.read_sql membangun tuple dan objek Python per baris sebelum DataFrame
+terbentuk. read_sql_arrow mengalirkan hasil query lewat
+COPY (...) TO STDOUT (CSV) melalui pipe ke pembaca CSV streaming pyarrow,
+dengan tipe kolom diambil dari metadata query (bukan ditebak). Teks CSV tidak
+pernah ditampung utuh di memori: COPY berjalan di thread terpisah dan
+pyarrow mem-parse per blok selagi data datang.
+
+Catatan tipe:
+    - Kolom teks menjadi string[pyarrow]; kolom lain dikonversi seperti
+      read_sql (float64/int64 numpy, date object, datetime64), sehingga
+      aritmetika (mis. 0/0 -> NaN lalu fillna) tetap berperilaku sama.
+    - numeric dibaca sebagai float64 (read_sql menghasilkan Decimal object).
+    - timestamptz dibaca dalam UTC lalu diberi zona waktu sesi, sehingga
+      nilainya sama dengan hasil read_sql.
+    - Tipe yang tidak dipetakan (json, array, interval, ...) dibaca sebagai string.
+"""
+
+import logging
+import os
+import threading
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from database.db_connection import get_connection
+
+# OID tipe PostgreSQL -> tipe Arrow
+PG_OID_TO_ARROW = {
+    16: pa.bool_(),  # bool
+    20: pa.int64(),  # int8
+    21: pa.int16(),  # int2
+    23: pa.int32(),  # int4
+    700: pa.float32(),  # float4
+    701: pa.float64(),  # float8
+    1700: pa.float64(),  # numeric
+    1082: pa.date32(),  # date
+    1114: pa.timestamp("us"),  # timestamp
+}
+PG_TIMESTAMPTZ_OID = 1184
+
+
+def _arrow_schema(description) -> pa.Schema:
+    fields = []
+    for column in description:
+        if column.type_code == PG_TIMESTAMPTZ_OID:
+            arrow_type = pa.timestamp("us", tz="UTC")
+        else:
+            arrow_type = PG_OID_TO_ARROW.get(column.type_code, pa.string())
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _with_session_tz(table: pa.Table, session_tz: str) -> pa.Table:
+    """Mengganti zona waktu kolom timestamptz dari UTC ke zona waktu sesi."""
+    if not session_tz or session_tz.upper() == "UTC":
+        return table
+    try:
+        ZoneInfo(session_tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        logging.warning(f"Zona waktu sesi '{session_tz}' tidak dikenali, memakai UTC.")
+        return table
+    target = pa.timestamp("us", tz=session_tz)
+    columns = [
+        col.cast(target) if pa.types.is_timestamp(col.type) and col.type.tz else col
+        for col in table.columns
+    ]
+    return pa.Table.from_arrays(columns, names=table.column_names)
+
+
+def read_sql_arrow_table(query: str, params=None, conn=None) -> pa.Table:
+    """
+    Menjalankan SELECT lewat COPY ... TO STDOUT dan mengembalikan pa.Table.
+
+    Args:
+        query (str): Query SELECT (placeholder gaya psycopg2, tanpa titik koma
+            di dalam query).
+        params (dict | tuple, optional): Parameter query.
+        conn: Koneksi psycopg2; jika None, koneksi baru dibuka dan ditutup.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            bound = cur.mogrify(query.strip().rstrip(";"), params).decode()
+
+            # Tipe kolom dari metadata query, tanpa mengambil baris
+            cur.execute(f"SELECT * FROM ({bound}) AS _arrow_q LIMIT 0;")
+            description = cur.description
+
+            cur.execute("SHOW TimeZone;")
+            session_tz = cur.fetchone()[0]
+            schema = _arrow_schema(description)
+
+            cur.execute("SELECT set_config('TimeZone', 'UTC', true);")
+            batches = _stream_copy(
+                cur, f"COPY ({bound}) TO STDOUT WITH (FORMAT csv)", schema
+            )
+            cur.execute("SELECT set_config('TimeZone', %s, true);", (session_tz,))
+        if own_conn:
+            conn.rollback()
+    finally:
+        if own_conn:
+            conn.close()
+
+    table = pa.Table.from_batches(batches, schema=schema)
+    return _with_session_tz(table, session_tz)
+
+
+def _stream_copy(cur, copy_sql: str, schema: pa.Schema) -> list:
+    """
+    Menjalankan COPY ... TO STDOUT di thread terpisah yang menulis ke pipe,
+    sementara thread ini mem-parse CSV per blok dengan pa_csv.open_csv.
+    """
+    read_fd, write_fd = os.pipe()
+    reader = os.fdopen(read_fd, "rb")
+    writer = os.fdopen(write_fd, "wb")
+    errors = []
+
+    def _copy():
+        try:
+            cur.copy_expert(copy_sql, writer)
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            try:
+                writer.close()
+            except BrokenPipeError:
+                pass  # ujung baca sudah ditutup karena parsing gagal
+
+    thread = threading.Thread(target=_copy, name="arrow-copy", daemon=True)
+    thread.start()
+    batches = []
+    try:
+        # peek() menunggu blok pertama atau EOF; hasil kosong = tanpa baris
+        if reader.peek(1):
+            csv_reader = pa_csv.open_csv(
+                reader,
+                read_options=pa_csv.ReadOptions(column_names=schema.names),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    strings_can_be_null=True,
+                    # COPY CSV: NULL = kosong tanpa kutip, string kosong = ""
+                    quoted_strings_can_be_null=False,
+                    true_values=["t"],
+                    false_values=["f"],
+                ),
+            )
+            batches = list(csv_reader)
+    finally:
+        # Menutup ujung baca membuat COPY yang masih menulis berhenti dengan
+        # BrokenPipe jika parsing gagal di tengah jalan
+        reader.close()
+        thread.join()
+    if errors and not isinstance(errors[0], BrokenPipeError):
+        raise errors[0]
+    return batches
+
+
+def read_sql_arrow(query: str, params=None, conn=None) -> pd.DataFrame:
+    """
+    Pengganti pd.read_sql untuk hasil besar. Kolom teks ber-dtype
+    string[pyarrow]; kolom numerik, tanggal, dan boolean memakai dtype numpy
+    yang sama dengan read_sql agar perilaku NaN/fillna tidak berubah.
+
+    Raises:
+        psycopg2.Error: Jika query gagal; pemanggil menangani seperti read_sql.
+    """
+    table = read_sql_arrow_table(query, params, conn)
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+    logging.debug(f"read_sql_arrow: {len(df)} baris, {table.nbytes:,} byte Arrow.")
+    return df
@@ -0,0 +1,143 @@
+"""
+Cache data autentikasi per proses Streamlit.
+
+users × roles × user_projects × dim_projects dimuat sekali ke memori dan tidak
+ikut terhapus oleh st.cache_data.clear(). Paling sering setiap
+AUTH_CACHE_CHECK_INTERVAL detik cache diperiksa: baris users dengan
+updated_at >= watermark - AUTH_CACHE_WATERMARK_MARGIN detik dimuat ulang
+secara inkremental, dan jika versi
+'auth_users' di cache_versions berubah (user dihapus, role/project berubah)
+seluruh data dimuat ulang (lihat database/migrations/008_auth_cache.sql).
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+import psycopg2
+
+from database.cache_versions import get_cache_versions
+from database.db_connection import get_connection
+from database.query_telemetry import track_query
+
+AUTH_VERSION_NAME = "auth_users"
+CHECK_INTERVAL_S = float(os.getenv("AUTH_CACHE_CHECK_INTERVAL", "60"))
+# Transaksi yang commit setelah refresh bisa membawa updated_at di bawah
+# watermark; margin ini harus lebih panjang dari transaksi users terlama
+WATERMARK_MARGIN = timedelta(
+    seconds=float(os.getenv("AUTH_CACHE_WATERMARK_MARGIN", "300"))
+)
+
+_lock = threading.Lock()
+_users = None
+_version = None
+_watermark = None
+_checked_at = 0.0
+
+
+@track_query()
+def _fetch_users(since=None) -> list:
+    """
+    Satu baris per user: username, nama, hash password, role, daftar project,
+    dan updated_at. since=None berarti semua user.
+    """
+    query = """
+        SELECT
+            u.username,
+            u.full_name,
+            u.password_hash,
+            r.name AS role_name,
+            COALESCE(
+                ARRAY_AGG(DISTINCT p.project_name)
+                    FILTER (WHERE p.project_name IS NOT NULL),
+                '{}'
+            ) AS projects,
+            u.updated_at
+        FROM users u
+        LEFT JOIN roles r ON u.role_id = r.id
+        LEFT JOIN user_projects up ON u.id = up.user_id
+        LEFT JOIN dim_projects p ON up.project_id = p.project_id
+        WHERE %(since)s::timestamptz IS NULL OR u.updated_at >= %(since)s
+        GROUP BY u.id, r.name;
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(query, {"since": since})
+            return cur.fetchall()
+    finally:
+        if conn:
+            conn.close()
+
+
+def _apply_rows(users: dict, rows: list):
+    global _watermark
+    for username, full_name, password_hash, role_name, projects, updated_at in rows:
+        users[username.lower()] = {
+            "username": username,
+            "name": full_name,
+            "password": password_hash,
+            "role": role_name.strip().lower() if role_name else None,
+            "projects": sorted(projects),
+        }
+        if _watermark is None or updated_at > _watermark:
+            _watermark = updated_at
+
+
+def _refresh():
+    """Memuat ulang penuh atau inkremental sesuai versi dan watermark."""
+    global _users, _version, _watermark
+    version = get_cache_versions([AUTH_VERSION_NAME]).get(AUTH_VERSION_NAME)
+    if _users is None or version is None or version != _version:
+        _watermark = None
+        users = {}
+        _apply_rows(users, _fetch_users())
+        _users, _version = users, version
+        logging.info(f"Cache autentikasi dimuat: {len(users)} user (versi {version}).")
+        return
+
+    # Baris sedikit di bawah watermark ikut diambil ulang agar perubahan dari
+    # transaksi yang commit belakangan tidak terlewat; menimpa entri yang sama
+    # tidak berpengaruh. Tanpa watermark (muatan pertama kosong) ambil semua.
+    since = None if _watermark is None else _watermark - WATERMARK_MARGIN
+    rows = _fetch_users(since=since)
+    if rows:
+        users = dict(_users)
+        _apply_rows(users, rows)
+        _users = users
+
+
+def get_auth_users() -> dict:
+    """
+    Snapshot user yang sedang di-cache: {username_lower: {"username", "name",
+    "password", "role", "projects"}}. Snapshot tidak pernah diubah di tempat,
+    jadi aman dibaca tanpa lock.
+
+    Raises:
+        Exception: Jika data belum pernah berhasil dimuat sama sekali. Setelah
+            pernah berhasil, kegagalan refresh hanya dicatat di log dan
+            snapshot lama tetap dipakai.
+    """
+    global _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _users is not None and now - _checked_at < CHECK_INTERVAL_S:
+            return _users
+        try:
+            _refresh()
+        except (Exception, psycopg2.DatabaseError) as error:
+            if _users is None:
+                raise
+            logging.error(f"Gagal memperbarui cache autentikasi: {error}")
+        _checked_at = now
+        return _users
+
+
+def invalidate_auth_cache():
+    """Memaksa data autentikasi dimuat ulang penuh pada akses berikutnya."""
+    global _users
+    with _lock:
+        _users = None
@@ -0,0 +1,65 @@
+"""
+Nomor versi untuk cache in-memory yang bergantung pada tabel database.
+
+Versi disimpan di tabel cache_versions dan dinaikkan oleh trigger pada tabel
+sumbernya (lihat database/migrations/007_cache_versions.sql). Pemilik cache
+cukup membandingkan versi yang tersimpan dengan hasil get_cache_versions()
+untuk tahu apakah data perlu dimuat ulang.
+"""
+
+import logging
+
+import psycopg2
+
+from database.db_connection import get_connection
+from database.query_telemetry import track_query
+
+
+@track_query()
+def get_cache_versions(names: list) -> dict:
+    """
+    Mengambil versi terkini untuk beberapa nama cache dalam satu query.
+
+    Returns:
+        dict: {name: version}. Nama yang belum terdaftar (atau jika query
+              gagal) tidak ada di hasil, sehingga pemanggil memuat ulang.
+    """
+    query = "SELECT name, version FROM cache_versions WHERE name = ANY(%s);"
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(query, (list(names),))
+            return dict(cur.fetchall())
+    except (Exception, psycopg2.DatabaseError) as error:
+        logging.warning(f"Gagal membaca cache_versions: {error}")
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
+
+def bump_cache_versions(names: list) -> dict:
+    """
+    Menaikkan versi beberapa nama cache sekaligus, mis. setelah REFRESH
+    MATERIALIZED VIEW yang tidak bisa diberi trigger
+    (lihat database/migrations/009_result_cache_versions.sql).
+
+    Returns:
+        dict: Status operasi dan pesan.
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT bump_cache_versions(VARIADIC %s);", (list(names),))
+        conn.commit()
+        return {"status": "success", "message": f"Versi {', '.join(names)} dinaikkan."}
+    except (Exception, psycopg2.DatabaseError) as error:
+        if conn:
+            conn.rollback()
+        logging.error(f"Gagal menaikkan versi cache {names}: {error}")
+        return {"status": "error", "message": str(error)}
+    finally:
+        if conn:
+            conn.close()
@@ -6,6 +6,10 @@ import streamlit as st
 from sqlalchemy import Engine, inspect, text
 from sqlalchemy.exc import SQLAlchemyError
 
+from database.db_manager import ADS_PERFORMANCE_SOURCE_TABLES, sync_ads_performance_mart
+from database.query_telemetry import track_query
+from database.store_mapping import get_store_project_mapping
+
 # @st.cache_data(ttl=300, show_spinner=False)
 # def fetch_filtered_data(
 #     _engine: Engine, table_name: str, active_filters: dict
@@ -82,7 +86,7 @@ from sqlalchemy.exc import SQLAlchemyError
 #         return pd.DataFrame()
 
 
-@st.cache_data(ttl=300, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=300, show_spinner=False))
 def fetch_filtered_data(
     _engine: Engine,
     table_name: str,
@@ -160,7 +164,6 @@ def fetch_filtered_data(
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_distinct_options(
     _engine: Engine,
     table_name: str,
@@ -170,45 +173,75 @@ def fetch_distinct_options(
     """
     Helper function untuk mengambil opsi unik.
     Sekarang bisa memfilter berdasarkan project_context jika diperlukan.
+    Toko per project diambil dari mapping in-memory (database.store_mapping),
+    sehingga tidak perlu join map_project_stores di setiap panggilan.
     """
-    params = {}
+    if project_context and table_name == "dim_stores":
+        stores = get_store_project_mapping().stores_for_project(project_context)
+        if column_name in stores.columns:
+            return sorted(stores[column_name].dropna().unique().tolist())
+
+    if project_context and table_name == "dim_cpas_accounts":
+        store_ids = get_store_project_mapping().store_ids(project_context)
+        if not store_ids:
+            return []
+        # store_ids ikut menjadi key cache: hasil otomatis baru jika mapping berubah
+        return _query_distinct_options(
+            _engine, table_name, column_name, store_ids=tuple(store_ids)
+        )
+
+    return _query_distinct_options(_engine, table_name, column_name, project_context)
+
+
+def _distinct_options_filter(
+    table_name: str,
+    project_context: str,
+    store_ids: tuple,
+    params: dict,
+    suffix: str = "",
+) -> tuple[str, str]:
+    """
+    JOIN dan WHERE untuk query opsi unik satu sumber. Nama parameter diberi
+    suffix agar beberapa sumber bisa digabung dalam satu query.
+    """
+    if store_ids:
+        params[f"store_ids{suffix}"] = store_ids
+        return "", f"WHERE tn.store_id IN :store_ids{suffix}"
 
     if project_context and table_name == "dim_stores":
-        query_str = f"""
-            SELECT DISTINCT ds."{column_name}" 
-            FROM dim_stores ds
-            JOIN map_project_stores mps ON ds.store_id = mps.store_id
+        params[f"project_name{suffix}"] = project_context
+        join = """
+            JOIN map_project_stores mps ON tn.store_id = mps.store_id
             JOIN dim_projects dp ON mps.project_id = dp.project_id
-            WHERE dp.project_name = :project_name
-            ORDER BY 1
-        """
-        params["project_name"] = project_context
-        query = text(query_str)
-
-    elif project_context and table_name == "dim_cpas_accounts":
-        query_str = f"""
-            SELECT DISTINCT dca."{column_name}" 
-            FROM dim_cpas_accounts dca
-            JOIN map_project_stores mps ON dca.store_id = mps.store_id
-            JOIN dim_projects dp ON mps.project_id = dp.project_id
-            WHERE dp.project_name = :project_name
-            ORDER BY 1
-        """
-        params["project_name"] = project_context
-        query = text(query_str)
-
-    elif project_context and table_name == "dim_reg_products":
-        query_str = f"""
-            SELECT DISTINCT tn."{column_name}" 
-            FROM {table_name} tn
-            WHERE tn.tim = :tim
-            ORDER BY 1
         """
-        params["tim"] = project_context
-        query = text(query_str)
+        return join, f"WHERE dp.project_name = :project_name{suffix}"
 
-    else:
-        query = text(f'SELECT DISTINCT "{column_name}" FROM {table_name} ORDER BY 1')
+    if project_context and table_name == "dim_reg_products":
+        params[f"tim{suffix}"] = project_context
+        return "", f"WHERE tn.tim = :tim{suffix}"
+
+    return "", ""
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def _query_distinct_options(
+    _engine: Engine,
+    table_name: str,
+    column_name: str,
+    project_context: str = None,
+    store_ids: tuple = None,
+) -> list:
+    params = {}
+    join, where = _distinct_options_filter(
+        table_name, project_context, store_ids, params
+    )
+    query = text(f"""
+        SELECT DISTINCT tn."{column_name}"
+        FROM {table_name} tn
+        {join}
+        {where}
+        ORDER BY 1
+    """)
 
     try:
         with _engine.connect() as conn:
@@ -219,6 +252,96 @@ def fetch_distinct_options(
         return []
 
 
+def fetch_distinct_options_batch(
+    _engine: Engine, sources: list, project_context: str = None
+) -> dict:
+    """
+    Mengambil opsi unik untuk beberapa sumber sekaligus (mis. semua filter
+    dan dropdown satu config data editor) dalam satu round trip.
+
+    Aturan per sumber sama dengan fetch_distinct_options: toko per project
+    dari mapping in-memory, akun CPAS lewat store_id milik project, dan
+    sisanya digabung menjadi satu query UNION ALL yang di-cache per
+    kombinasi sumber dan project_context.
+
+    Args:
+        sources (list): Daftar (table_name, column_name, use_project_context).
+        project_context (str): Nama project aktif, dipakai hanya untuk sumber
+            dengan use_project_context=True.
+
+    Returns:
+        dict: {(table_name, column_name, use_project_context): list opsi}
+    """
+    results = {}
+    pending = {}
+    for source in sources:
+        table_name, column_name, use_project_context = source
+        context = project_context if use_project_context else None
+
+        if context and table_name == "dim_stores":
+            stores = get_store_project_mapping().stores_for_project(context)
+            if column_name in stores.columns:
+                results[source] = sorted(stores[column_name].dropna().unique().tolist())
+                continue
+
+        if context and table_name == "dim_cpas_accounts":
+            store_ids = get_store_project_mapping().store_ids(context)
+            if not store_ids:
+                results[source] = []
+                continue
+            pending[source] = (table_name, column_name, None, tuple(store_ids))
+            continue
+
+        pending[source] = (table_name, column_name, context, None)
+
+    if pending:
+        # Urutan spesifikasi dibuat stabil agar key cache sama antar-rerun
+        specs = tuple(sorted(set(pending.values()), key=str))
+        options = _query_distinct_options_batch(_engine, specs)
+        results.update({source: options[spec] for source, spec in pending.items()})
+    return results
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def _query_distinct_options_batch(_engine: Engine, specs: tuple) -> dict:
+    """
+    Satu query UNION ALL untuk banyak sumber opsi. Setiap sumber menjadi satu
+    baris berisi array jsonb opsinya yang sudah terurut.
+
+    Args:
+        specs (tuple): (table_name, column_name, project_context, store_ids).
+
+    Returns:
+        dict: {spec: list opsi}
+    """
+    params = {}
+    selects = []
+    for i, (table_name, column_name, project_context, store_ids) in enumerate(specs):
+        join, where = _distinct_options_filter(
+            table_name, project_context, store_ids, params, suffix=f"_{i}"
+        )
+        selects.append(f"""
+            SELECT {i} AS source_idx,
+                COALESCE(jsonb_agg(s.option ORDER BY s.option), '[]'::jsonb) AS options
+            FROM (
+                SELECT DISTINCT tn."{column_name}" AS option
+                FROM {table_name} tn
+                {join}
+                {where}
+            ) s
+        """)
+    query = text(" UNION ALL ".join(selects))
+
+    try:
+        with _engine.connect() as conn:
+            rows = conn.execute(query, params).all()
+        options = dict(rows)
+        return {spec: options.get(i, []) for i, spec in enumerate(specs)}
+    except Exception as e:
+        logging.warning(f"Gagal fetch distinct options (batch): {e}")
+        return {spec: [] for spec in specs}
+
+
 def process_generic_changes(
     _engine: Engine, config: dict, original_df: pd.DataFrame, changes: dict
 ):
@@ -313,6 +436,28 @@ def process_generic_changes(
         logging.error(f"Unexpected Error processing changes for {target_table}: {e}")
         raise e
 
+    if target_table in ADS_PERFORMANCE_SOURCE_TABLES:
+        sync_ads_performance_mart(_changed_dates(original_df, changes))
+
+
+def _changed_dates(original_df: pd.DataFrame, changes: dict) -> pd.Series:
+    """
+    Semua nilai kolom tanggal yang tersentuh perubahan editor: tanggal lama
+    baris yang dihapus/diedit, tanggal baru hasil edit, dan tanggal baris baru.
+    """
+    dates = []
+    if "tanggal" in original_df.columns:
+        touched = list(changes.get("deleted_rows", [])) + [
+            int(index) for index in changes.get("edited_rows", {})
+        ]
+        dates.extend(original_df["tanggal"].iloc[touched].tolist())
+    for updates in changes.get("edited_rows", {}).values():
+        if "tanggal" in updates:
+            dates.append(updates["tanggal"])
+    for new_row in changes.get("added_rows", []):
+        dates.append(new_row.get("tanggal"))
+    return pd.Series(dates, dtype=object)
+
 
 # def fetch_table_data(conn, source_view: str) -> pd.DataFrame:
 #     """
@@ -10,7 +10,13 @@ import streamlit as st
 from psycopg2 import extras
 from psycopg2.extensions import AsIs, register_adapter
 
+from database.arrow_fetch import read_sql_arrow
 from database.db_connection import get_connection
+from database.editor_changes import apply_editor_changes
+from database.frame_dtypes import apply_view_dtypes
+from database.query_telemetry import track_query
+from database.result_cache import expire_table_versions, result_cache
+from database.store_mapping import get_store_project_mapping, invalidate_store_mapping
 
 # Konfigurasi dasar logging
 logging.basicConfig(
@@ -68,13 +74,19 @@ def get_table_columns(table_name):
 
 
 # --- DIm TABLE
-def get_table_data(table_name: str, order_by_column: str = None) -> pd.DataFrame:
+@track_query()
+def get_table_data(
+    table_name: str, order_by_column: str = None, arrow: bool = False
+) -> pd.DataFrame:
     """
     Mengambil semua data dari tabel yang ditentukan secara generik.
 
     Args:
         table_name (str): Nama tabel yang akan diambil datanya.
         order_by_column (str, optional): Nama kolom untuk mengurutkan data. Default None.
+        arrow (bool): Jika True, data dibaca lewat COPY ke Arrow
+            (database.arrow_fetch): kolom teks string[pyarrow], kolom lain
+            ber-dtype numpy seperti read_sql. Dipakai untuk tabel/view besar.
 
     Returns:
         pd.DataFrame: DataFrame berisi data tabel, atau DataFrame kosong jika error.
@@ -90,7 +102,11 @@ def get_table_data(table_name: str, order_by_column: str = None) -> pd.DataFrame
         if order_by_column:
             query += f" ORDER BY {order_by_column} ASC"
 
-        df = pd.read_sql(query, conn)
+        if arrow:
+            df = read_sql_arrow(query, conn=conn)
+        else:
+            df = pd.read_sql(query, conn)
+        apply_view_dtypes(df, table_name.strip())
         logging.info(f"Berhasil mengambil {len(df)} records dari tabel {table_name}.")
         return df
 
@@ -163,6 +179,7 @@ def get_dim_shipping_services():
     )
 
 
+@track_query()
 def get_finance_budget_plan_by_project(
     project_name: str, start_date: date, end_date: date
 ) -> pd.DataFrame:
@@ -182,14 +199,12 @@ def get_finance_budget_plan_by_project(
             dim_projects dp ON dp.project_id = fbp.project_id
         WHERE
             dp.project_name = %(project_name)s
-            -- PERBAIKAN DI SINI:
-            -- Kita membandingkan tanggal 1 dari database dengan tanggal 1 dari filter.
-            AND TO_DATE(fbp.bulan || ' ' || fbp.tahun, 'FMMonth YYYY') 
-                BETWEEN DATE_TRUNC('month', %(start_date)s::date) 
-                    AND DATE_TRUNC('month', %(end_date)s::date)
+            -- Bandingkan tanggal 1 (kolom month_start) dengan tanggal 1 dari filter.
+            AND fbp.month_start
+                BETWEEN DATE_TRUNC('month', %(start_date)s::date)::date
+                    AND DATE_TRUNC('month', %(end_date)s::date)::date
         ORDER BY
-            fbp.tahun, 
-            TO_DATE(fbp.bulan, 'FMMonth');
+            fbp.month_start;
     """
     try:
         conn = get_connection()
@@ -218,35 +233,35 @@ def get_dim_payment_methods():
 
 def get_shipments():
     """Mengambil semua data dari tabel shipments."""
-    return get_table_data(table_name="shipments")
+    return get_table_data(table_name="shipments", arrow=True)
 
 
 def get_orders():
     """Mengambil semua data dari tabel orders."""
-    return get_table_data(table_name="orders")
+    return get_table_data(table_name="orders", arrow=True)
 
 
 def get_order_items():
     """Mengambil semua data dari tabel order_items."""
-    return get_table_data(table_name="order_items")
+    return get_table_data(table_name="order_items", arrow=True)
 
 
 def get_vw_admin_shipments():
     """Mengambil semua data dari tabel vw_admin_shipments."""
-    return get_table_data(table_name="vw_admin_shipments")
+    return get_table_data(table_name="vw_admin_shipments", arrow=True)
 
 
 def get_vw_shipments_delivery():
     """Mengambil semua data dari tabel vw_shipments_delivery."""
-    return get_table_data(table_name="vw_shipments_delivery")
+    return get_table_data(table_name="vw_shipments_delivery", arrow=True)
 
 
 def get_vw_admin_shipments_delivery():
     """Mengambil semua data dari tabel vw_admin_shipments_delivery."""
-    return get_table_data(table_name="vw_admin_shipments_delivery")
+    return get_table_data(table_name="vw_admin_shipments_delivery", arrow=True)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
 def get_target_ads_ratio(project_id: int, year: int, quarter: int) -> float | None:
     """
     Mengambil target rasio ads/omset dari budget plan untuk kuartal tertentu.
@@ -312,12 +327,14 @@ def get_finance_budget_non_ads():
 #     return get_table_data(table_name="vw_budget_ads_monitoring")
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+@result_cache(tables=("mart_ads_performance_summary",))
 def get_vw_ads_performance_summary(
     project_name: str, start_date: date, end_date: date
 ) -> pd.DataFrame:
     """
-    Mengambil data dari view vw_ads_performance_summary berdasarkan filter.
+    Mengambil data performa iklan dari mart_ads_performance_summary
+    (materialisasi vw_ads_performance_summary) berdasarkan filter.
 
     Args:
         project_name (str): Nama project yang akan difilter.
@@ -332,7 +349,7 @@ def get_vw_ads_performance_summary(
     SELECT
         *
     FROM
-        vw_ads_performance_summary
+        mart_ads_performance_summary
     WHERE
         project_name = %(project_name)s
         AND tanggal BETWEEN %(start_date)s AND %(end_date)s
@@ -342,25 +359,229 @@ def get_vw_ads_performance_summary(
     conn = None
     try:
         conn = get_connection()
-        df = pd.read_sql(
+        df = read_sql_arrow(
             query,
-            conn,
             params={
                 "project_name": project_name,
                 "start_date": start_date,
                 "end_date": end_date,
             },
+            conn=conn,
         )
+        apply_view_dtypes(df, "mart_ads_performance_summary")
         logging.info(f"Successfully fetched {len(df)} rows for project {project_name}.")
         return df
     except Exception as e:
-        logging.error(f"Failed to fetch data from vw_ads_performance_summary: {e}")
+        logging.error(f"Failed to fetch data from mart_ads_performance_summary: {e}")
         return pd.DataFrame()  # Kembalikan dataframe kosong jika error
     finally:
         if conn:
             conn.close()
 
 
+# --- MART ADS PERFORMANCE
+ADS_PERFORMANCE_MART = "mart_ads_performance_summary"
+# Tabel sumber vw_ads_performance_summary; perubahan di sini harus disinkronkan
+ADS_PERFORMANCE_SOURCE_TABLES = (
+    "finance_omset",
+    "advertiser_marketplace",
+    "advertiser_cpas",
+)
+
+
+def _to_date_range(tanggal: pd.Series):
+    """Mengembalikan (min, max) tanggal dari sebuah Series, atau (None, None) jika kosong."""
+    tanggal = pd.to_datetime(tanggal, errors="coerce").dropna()
+    if tanggal.empty:
+        return None, None
+    return tanggal.min().date(), tanggal.max().date()
+
+
+def refresh_ads_performance_summary(start_date: date = None, end_date: date = None):
+    """
+    Memperbarui mart_ads_performance_summary dari vw_ads_performance_summary.
+
+    Jika start_date dan end_date diberikan, hanya baris pada rentang tanggal tersebut
+    yang dihitung ulang (refresh inkremental). Jika tidak, seluruh mart dibangun ulang.
+
+    Args:
+        start_date (date, optional): Tanggal awal rentang yang diperbarui.
+        end_date (date, optional): Tanggal akhir rentang yang diperbarui.
+
+    Returns:
+        dict: Status operasi dan pesan.
+    """
+    is_incremental = start_date is not None and end_date is not None
+    range_clause = (
+        "WHERE tanggal BETWEEN %(start_date)s AND %(end_date)s"
+        if is_incremental
+        else ""
+    )
+    params = {
+        "mart_name": ADS_PERFORMANCE_MART,
+        "start_date": start_date if is_incremental else None,
+        "end_date": end_date if is_incremental else None,
+    }
+
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(f"DELETE FROM {ADS_PERFORMANCE_MART} {range_clause};", params)
+            cur.execute(
+                f"""
+                INSERT INTO {ADS_PERFORMANCE_MART}
+                SELECT * FROM vw_ads_performance_summary {range_clause};
+                """,
+                params,
+            )
+            row_count = cur.rowcount
+            cur.execute(
+                """
+                INSERT INTO mart_refresh_log (
+                    mart_name, last_refreshed_at, refreshed_start, refreshed_end,
+                    is_stale, last_error
+                ) VALUES (
+                    %(mart_name)s, NOW(), %(start_date)s, %(end_date)s, FALSE, NULL
+                )
+                ON CONFLICT (mart_name) DO UPDATE SET
+                    last_refreshed_at = EXCLUDED.last_refreshed_at,
+                    refreshed_start = EXCLUDED.refreshed_start,
+                    refreshed_end = EXCLUDED.refreshed_end,
+                    is_stale = FALSE,
+                    last_error = NULL;
+                """,
+                params,
+            )
+        conn.commit()
+
+        scope = f"{start_date} s/d {end_date}" if is_incremental else "seluruh periode"
+        logging.info(
+            f"Mart {ADS_PERFORMANCE_MART} diperbarui ({scope}): {row_count} baris."
+        )
+
+        expire_table_versions((ADS_PERFORMANCE_MART,))
+        get_vw_ads_performance_summary.clear()
+        get_ads_performance_freshness.clear()
+        return {
+            "status": "success",
+            "message": f"{row_count} baris {ADS_PERFORMANCE_MART} diperbarui ({scope}).",
+        }
+
+    except (Exception, psycopg2.DatabaseError) as error:
+        if conn:
+            conn.rollback()
+        logging.error(
+            f"Gagal memperbarui {ADS_PERFORMANCE_MART}: {error}", exc_info=True
+        )
+        _mark_mart_stale(ADS_PERFORMANCE_MART, str(error))
+        return {"status": "error", "message": str(error)}
+    finally:
+        if conn:
+            conn.close()
+
+
+def _mark_mart_stale(mart_name: str, error_message: str = None):
+    """Menandai sebuah mart sebagai stale agar dashboard menampilkan peringatan."""
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO mart_refresh_log (mart_name, is_stale, last_error)
+                VALUES (%s, TRUE, %s)
+                ON CONFLICT (mart_name) DO UPDATE SET
+                    is_stale = TRUE,
+                    last_error = EXCLUDED.last_error;
+                """,
+                (mart_name, error_message),
+            )
+        conn.commit()
+    except (Exception, psycopg2.DatabaseError) as error:
+        logging.error(f"Gagal menandai {mart_name} sebagai stale: {error}")
+    finally:
+        if conn:
+            conn.close()
+        get_ads_performance_freshness.clear()
+
+
+def sync_ads_performance_mart(tanggal: pd.Series):
+    """
+    Refresh inkremental mart performa iklan untuk rentang tanggal data yang baru disimpan.
+    Kegagalan refresh tidak membatalkan penyimpanan data sumber; mart cukup ditandai stale.
+    """
+    start_date, end_date = _to_date_range(tanggal)
+    if start_date is None:
+        return
+    result = refresh_ads_performance_summary(start_date, end_date)
+    if result["status"] != "success":
+        logging.warning(
+            f"Refresh inkremental {ADS_PERFORMANCE_MART} gagal, mart ditandai stale."
+        )
+
+
+@track_query(cache=st.cache_data(ttl=60, show_spinner=False))
+def get_ads_performance_freshness() -> dict:
+    """
+    Mengambil status kesegaran mart_ads_performance_summary.
+
+    Returns:
+        dict: {"last_refreshed_at": datetime | None, "is_stale": bool, "last_error": str | None}.
+              Dianggap stale jika status tidak dapat dibaca.
+    """
+    query = """
+        SELECT last_refreshed_at, is_stale, last_error
+        FROM mart_refresh_log
+        WHERE mart_name = %s;
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(query, (ADS_PERFORMANCE_MART,))
+            row = cur.fetchone()
+        if row is None:
+            return {"last_refreshed_at": None, "is_stale": True, "last_error": None}
+        return {"last_refreshed_at": row[0], "is_stale": row[1], "last_error": row[2]}
+    except (Exception, psycopg2.DatabaseError) as error:
+        logging.error(f"Gagal mengambil status {ADS_PERFORMANCE_MART}: {error}")
+        return {"last_refreshed_at": None, "is_stale": True, "last_error": str(error)}
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_recent_pipeline_runs(pipeline_name: str = None, limit: int = 20):
+    """
+    Mengambil run ETL terbaru dari tabel pipeline_runs (tanpa kolom stages).
+
+    Args:
+        pipeline_name (str, optional): Filter nama pipeline (mis. "marketplace_upload").
+        limit (int): Jumlah run maksimum.
+    """
+    query = """
+        SELECT run_id, pipeline_name, started_at, status, duration_s,
+               rows_in, peak_mem_mb, error
+        FROM pipeline_runs
+        WHERE %(pipeline_name)s IS NULL OR pipeline_name = %(pipeline_name)s
+        ORDER BY started_at DESC
+        LIMIT %(limit)s;
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        return pd.read_sql(
+            query, conn, params={"pipeline_name": pipeline_name, "limit": limit}
+        )
+    except (Exception, psycopg2.DatabaseError) as error:
+        logging.error(f"Gagal mengambil pipeline_runs: {error}")
+        return pd.DataFrame()
+    finally:
+        if conn:
+            conn.close()
+
+
 def get_payments():
     """Mengambil semua data dari tabel payments."""
     return get_table_data(table_name="payments")
@@ -381,27 +602,29 @@ def get_map_project_stores():
     return get_table_data(table_name="map_project_stores ")
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+TOTAL_SALES_TARGET_QUERY = """
+    SELECT
+        SUM(target_bulanan_rp) AS total_target
+    FROM
+        finance_budget_plan
+    WHERE
+        project_id = %(project_id)s
+        AND parameter_name = 'Target Omset'
+        AND month_start BETWEEN %(start_date)s AND %(end_date)s;
+"""
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
 def get_total_sales_target(project_id: int, start_date: str, end_date: str):
     """
     Menghitung total TARGET OMSET untuk sebuah project dalam rentang tanggal.
     """
     conn = None
-    query = """
-        SELECT
-            SUM(target_bulanan_rp) AS total_target
-        FROM
-            finance_budget_plan
-        WHERE
-            project_id = %(project_id)s
-            AND parameter_name = 'Target Omset'
-            AND to_date(tahun || '-' || bulan, 'YYYY-Month') BETWEEN %(start_date)s AND %(end_date)s;
-    """
     try:
         conn = get_connection()
         cur = conn.cursor()
         cur.execute(
-            query,
+            TOTAL_SALES_TARGET_QUERY,
             {"project_id": project_id, "start_date": start_date, "end_date": end_date},
         )
         result = cur.fetchone()
@@ -414,6 +637,62 @@ def get_total_sales_target(project_id: int, start_date: str, end_date: str):
             conn.close()
 
 
+MONTH_NAMES = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
+
+def get_month_keys(start_date: date, end_date: date) -> tuple:
+    """
+    Menghasilkan pasangan (tahun, nama_bulan) untuk setiap bulan dalam rentang tanggal.
+    Dipakai untuk filter berbasis kesamaan (sargable) pada kolom tahun + bulan.
+    """
+    months = pd.period_range(
+        pd.Timestamp(start_date).to_period("M"),
+        pd.Timestamp(end_date).to_period("M"),
+        freq="M",
+    )
+    # Tahun dikirim sebagai literal string (tipe unknown) sehingga mengikuti
+    # tipe kolom tahun, baik integer maupun teks, tanpa cast pada kolom
+    return tuple((str(p.year), MONTH_NAMES[p.month - 1]) for p in months)
+
+
+MONITORING_CASHFLOW_QUERY = """
+    SELECT 
+        project_name AS "Project",
+        report_year AS "Tahun",
+        report_month_name AS "Bulan",
+        parameter_name AS "Parameter Budget",
+        maksimal_budget AS "Maksimal Budget (Plan)",
+        total_realisasi AS "Total Realisasi (Actual)",
+        sisa_budget AS "Sisa Budget",
+        persentase_terpakai AS "Persentase Terpakai",
+        status AS "Status"
+    FROM 
+        vw_monitoring_cashflow
+    WHERE
+        project_name = %(project_name)s
+        -- Kolom dibandingkan apa adanya agar sargable; nama bulan dinormalkan
+        -- saat ditulis (migrasi 010)
+        AND (report_year, report_month_name) IN %(month_keys)s
+    ORDER BY
+        report_year, 
+        array_position(%(month_names)s::text[], report_month_name);
+"""
+
+
+@track_query()
 def get_vw_monitoring_cashflow(
     project_name: str, start_date: date, end_date: date
 ) -> pd.DataFrame:
@@ -422,28 +701,6 @@ def get_vw_monitoring_cashflow(
     Fungsi ini ideal untuk digunakan langsung di UI seperti Streamlit.
     """
     conn = None
-    query = """
-        SELECT 
-            project_name AS "Project",
-            report_year AS "Tahun",
-            report_month_name AS "Bulan",
-            parameter_name AS "Parameter Budget",
-            maksimal_budget AS "Maksimal Budget (Plan)",
-            total_realisasi AS "Total Realisasi (Actual)",
-            sisa_budget AS "Sisa Budget",
-            persentase_terpakai AS "Persentase Terpakai",
-            status AS "Status"
-        FROM 
-            vw_monitoring_cashflow
-        WHERE
-            project_name = %(project_name)s
-            AND TO_DATE(report_month_name || ' ' || report_year, 'FMMonth YYYY') 
-                BETWEEN DATE_TRUNC('month', %(start_date)s::date) 
-                    AND DATE_TRUNC('month', %(end_date)s::date)
-        ORDER BY
-            report_year, 
-            TO_DATE(report_month_name, 'FMMonth');
-    """
     try:
         conn = get_connection()
         # Jika koneksi gagal, kembalikan DataFrame kosong
@@ -452,12 +709,12 @@ def get_vw_monitoring_cashflow(
 
         params = {
             "project_name": project_name,
-            "start_date": start_date,
-            "end_date": end_date,
+            "month_keys": get_month_keys(start_date, end_date),
+            "month_names": MONTH_NAMES,
         }
 
         # pd.read_sql_query adalah cara paling efisien untuk mendapatkan DataFrame
-        df = pd.read_sql_query(query, conn, params=params)
+        df = pd.read_sql_query(MONITORING_CASHFLOW_QUERY, conn, params=params)
         return df
 
     except (Exception, psycopg2.Error) as e:
@@ -470,31 +727,34 @@ def get_vw_monitoring_cashflow(
             conn.close()
 
 
+MARKETING_ADS_RATIO_QUERY = """
+    SELECT 
+        fbp.project_id,
+        dp.project_name,
+        fbp.tahun,
+        fbp.kuartal,
+        fbp.bulan,
+        fbp.parameter_name,
+        fbp.target_rasio_persen
+    FROM 
+        finance_budget_plan fbp
+    JOIN 
+        dim_projects dp ON fbp.project_id = dp.project_id
+    WHERE 
+        dp.project_name = %(project_name)s
+        AND fbp.parameter_name = 'Biaya Marketing (Ads)'
+        -- Membandingkan bulan (month_start), bukan hari.
+        AND fbp.month_start
+            BETWEEN DATE_TRUNC('month', %(start_date)s::date)::date
+                AND DATE_TRUNC('month', %(end_date)s::date)::date
+"""
+
+
+@track_query()
 def get_marketing_ads_ratio(project_name, start_date, end_date):
-    query = """
-        SELECT 
-            fbp.project_id,
-            dp.project_name,
-            fbp.tahun,
-            fbp.kuartal,
-            fbp.bulan,
-            fbp.parameter_name,
-            fbp.target_rasio_persen
-        FROM 
-            finance_budget_plan fbp
-        JOIN 
-            dim_projects dp ON fbp.project_id = dp.project_id
-        WHERE 
-            dp.project_name = %(project_name)s
-            AND fbp.parameter_name = 'Biaya Marketing (Ads)'
-            -- PERUBAIKAN: Logika perbandingan diubah untuk membandingkan bulan, bukan hari.
-            AND TO_DATE(fbp.bulan || ' ' || fbp.tahun, 'Month YYYY') 
-                BETWEEN DATE_TRUNC('month', %(start_date)s::date) 
-                    AND DATE_TRUNC('month', %(end_date)s::date)
-    """
     conn = get_connection()
     df = pd.read_sql(
-        query,
+        MARKETING_ADS_RATIO_QUERY,
         conn,
         params={
             "project_name": project_name,
@@ -541,6 +801,8 @@ def insert_new_stores(df_new_stores: pd.DataFrame):
         logging.info(
             f"Berhasil memasukkan/memperbarui {inserted_rows} toko di dim_stores."
         )
+        # Versi mapping sudah dinaikkan trigger; proses ini langsung memuat ulang
+        invalidate_store_mapping()
         return {"status": "success", "count": inserted_rows}
 
     except psycopg2.Error as e:
@@ -589,6 +851,7 @@ def insert_project_store_mapping(df_mapping: pd.DataFrame):
         logging.info(
             f"Berhasil memasukkan {inserted_rows} baris pemetaan project-toko."
         )
+        invalidate_store_mapping()
         return {"status": "success", "count": inserted_rows}
 
     except psycopg2.Error as e:
@@ -602,54 +865,27 @@ def insert_project_store_mapping(df_mapping: pd.DataFrame):
             conn.close()
 
 
+@track_query()
 def get_financial_summary(project_id: int, start_date: str, end_date: str):
     """
-    Query yang diperbarui untuk mencocokkan budget plan 'parameter_name'
-    dengan 'bidang' dari kategori pengeluaran.
+    Mengambil ringkasan keuangan harian per tipe beban untuk sebuah project.
+
+    Budget harian dibaca dari tabel finance_budget_daily yang sudah dialokasikan
+    saat budget plan disimpan, lalu digabung dengan omset dan cash out harian.
     """
     conn = None
     query = """
-    WITH 
-    date_series AS (
-        SELECT generate_series(%(start_date)s::date, %(end_date)s::date, '1 day'::interval) AS tanggal
-    ),
-    budget_with_categories AS (
-        SELECT 
-            fbp.parameter_name,
-            dec.id AS category_id, -- <-- Kunci: Mengambil category_id
-            dec.tipe_beban,      -- <-- Mengambil tipe beban spesifik
-            fbp.target_bulanan_rp,
-            to_date(fbp.tahun || '-' || fbp.bulan || '-01', 'YYYY-Month-DD') AS month_start
-        FROM finance_budget_plan fbp
-        -- Join berdasarkan parameter_name = bidang
-        JOIN dim_expense_categories dec ON fbp.parameter_name = dec.bidang
-        WHERE fbp.project_id = %(project_id)s AND fbp.parameter_name != 'Target Omset'
-    ),
-    -- 2. Scaffold sekarang berisi baris untuk setiap 'tipe_beban' yang spesifik
-    scaffold AS (
-        SELECT
-            d.tanggal,
-            bwc.parameter_name, -- Ini adalah 'bidang' (misal: HPP)
-            bwc.tipe_beban,     -- Ini adalah kategori spesifik (misal: Beban Gudang)
-            bwc.category_id,    -- ID untuk join
-            -- Alokasi budget harian dibagi rata ke semua tipe_beban dalam satu bidang
-            (bwc.target_bulanan_rp / EXTRACT(DAY FROM (bwc.month_start + interval '1 month - 1 day'))::integer) 
-                / COUNT(*) OVER(PARTITION BY bwc.month_start, bwc.parameter_name) AS budget_harian_rp
-        FROM date_series d
-        CROSS JOIN budget_with_categories bwc
-        WHERE date_trunc('month', d.tanggal) = bwc.month_start
-    ),
+    WITH
     daily_sales AS (
         SELECT
             fo.tanggal,
             SUM(fo.akrual_basis) AS total_omset_akrual
         FROM finance_omset fo
-        JOIN dim_stores ds ON fo.nama_toko = ds.nama_toko
-        JOIN map_project_stores mps ON ds.store_id = mps.store_id
-        WHERE mps.project_id = %(project_id)s
+        WHERE fo.nama_toko = ANY(%(store_names)s)
+            AND fo.tanggal BETWEEN %(start_date)s AND %(end_date)s
         GROUP BY fo.tanggal
     ),
-    -- 3. Agregasi cash out berdasarkan category_id
+    -- Agregasi cash out berdasarkan category_id
     daily_cash_out AS (
         SELECT
             ft.transaction_date,
@@ -657,23 +893,25 @@ def get_financial_summary(project_id: int, start_date: str, end_date: str):
             SUM(ft.amount) AS total_cash_out
         FROM finance_transactions ft
         WHERE ft.project_id = %(project_id)s AND ft.transaction_type = 'OUT'
+            AND ft.transaction_date BETWEEN %(start_date)s AND %(end_date)s
         GROUP BY ft.transaction_date, ft.category_id
     )
     -- FINAL SELECT: Menggabungkan semuanya berdasarkan category_id
     SELECT
-        sc.tanggal,
-        sc.tipe_beban AS parameter_name, -- Tampilkan nama yang lebih detail (tipe_beban)
+        fbd.tanggal,
+        fbd.tipe_beban AS parameter_name, -- Tampilkan nama yang lebih detail (tipe_beban)
         0 AS target_rasio_persen, -- Kolom ini mungkin perlu penyesuaian logika
-        sc.budget_harian_rp,
+        fbd.budget_harian_rp,
         COALESCE(ds.total_omset_akrual, 0) AS omset_akrual,
         COALESCE(dco.total_cash_out, 0) AS total_cash_out
-    FROM scaffold sc
-    LEFT JOIN daily_sales ds ON sc.tanggal = ds.tanggal
-    -- Join final menggunakan category_id
-    LEFT JOIN daily_cash_out dco ON sc.tanggal = dco.transaction_date AND sc.category_id = dco.category_id
-    WHERE 
-        sc.tanggal BETWEEN %(start_date)s AND %(end_date)s
-    ORDER BY sc.tanggal, sc.parameter_name;
+    FROM finance_budget_daily fbd
+    LEFT JOIN daily_sales ds ON fbd.tanggal = ds.tanggal
+    LEFT JOIN daily_cash_out dco
+        ON fbd.tanggal = dco.transaction_date AND fbd.category_id = dco.category_id
+    WHERE
+        fbd.project_id = %(project_id)s
+        AND fbd.tanggal BETWEEN %(start_date)s AND %(end_date)s
+    ORDER BY fbd.tanggal, fbd.parameter_name;
     """
     try:
         conn = get_connection()
@@ -682,22 +920,89 @@ def get_financial_summary(project_id: int, start_date: str, end_date: str):
             conn,
             params={
                 "project_id": project_id,
+                "store_names": get_store_project_mapping().store_names(int(project_id)),
                 "start_date": start_date,
                 "end_date": end_date,
             },
         )
-        logging.info(
-            f"Berhasil mengambil {len(df)} baris data summary keuangan (dengan scaffold)."
-        )
+        logging.info(f"Berhasil mengambil {len(df)} baris data summary keuangan.")
         return df
     except psycopg2.Error as e:
-        logging.error(f"Gagal mengambil financial summary (dengan scaffold): {e}")
+        logging.error(f"Gagal mengambil financial summary: {e}")
         return pd.DataFrame()
     finally:
         if conn:
             conn.close()
 
 
+def _regenerate_budget_daily(cur, project_months: list):
+    """
+    Membangun ulang alokasi finance_budget_daily untuk pasangan (project, bulan) tertentu.
+
+    Budget bulanan setiap bidang dibagi rata ke jumlah hari dalam bulan, lalu
+    dibagi rata lagi ke semua tipe_beban dalam bidang tersebut.
+    Dijalankan di dalam transaksi pemanggil (tidak melakukan commit).
+
+    Args:
+        cur: Cursor psycopg2 yang aktif.
+        project_months (list): List tuple (project_id, tahun, bulan).
+    """
+    if not project_months:
+        return
+
+    delete_query = """
+        WITH affected (project_id, tahun, bulan) AS (VALUES %s)
+        DELETE FROM finance_budget_daily fbd
+        USING affected a
+        WHERE fbd.project_id = a.project_id
+            AND fbd.month_start = to_date(a.tahun::text || '-' || a.bulan || '-01', 'YYYY-Month-DD');
+    """
+    insert_query = """
+        WITH affected (project_id, tahun, bulan) AS (VALUES %s),
+        budget_with_categories AS (
+            SELECT
+                fbp.project_id,
+                fbp.parameter_name,
+                dec.id AS category_id,
+                dec.tipe_beban,
+                fbp.target_bulanan_rp,
+                fbp.month_start,
+                COUNT(*) OVER (
+                    PARTITION BY fbp.project_id, fbp.tahun, fbp.bulan, fbp.parameter_name
+                ) AS jumlah_kategori
+            FROM finance_budget_plan fbp
+            JOIN affected a
+                ON fbp.project_id = a.project_id
+                AND fbp.tahun::text = a.tahun::text
+                AND fbp.bulan = a.bulan
+            JOIN dim_expense_categories dec ON fbp.parameter_name = dec.bidang
+            WHERE fbp.parameter_name != 'Target Omset'
+        )
+        INSERT INTO finance_budget_daily (
+            project_id, month_start, tanggal, category_id,
+            parameter_name, tipe_beban, budget_harian_rp
+        )
+        SELECT
+            bwc.project_id,
+            bwc.month_start,
+            d.tanggal::date,
+            bwc.category_id,
+            bwc.parameter_name,
+            bwc.tipe_beban,
+            (bwc.target_bulanan_rp / EXTRACT(DAY FROM (bwc.month_start + interval '1 month - 1 day'))::integer)
+                / bwc.jumlah_kategori
+        FROM budget_with_categories bwc
+        CROSS JOIN LATERAL generate_series(
+            bwc.month_start, bwc.month_start + interval '1 month - 1 day', '1 day'::interval
+        ) AS d(tanggal);
+    """
+    extras.execute_values(cur, delete_query, project_months)
+    extras.execute_values(cur, insert_query, project_months)
+    logging.info(
+        f"Alokasi budget harian dibangun ulang untuk {len(project_months)} project-bulan."
+    )
+
+
 def insert_budget_plan(df_long: pd.DataFrame):
     """
     Memasukkan atau memperbarui data budget plan dari DataFrame.
@@ -771,6 +1076,14 @@ def insert_budget_plan(df_long: pd.DataFrame):
         """
 
         extras.execute_values(cur, query, data_tuples)
+
+        # Langkah 5: Bangun ulang alokasi harian hanya untuk project-bulan yang berubah
+        project_months = list(
+            df_to_insert[["project_id", "tahun", "bulan"]]
+            .drop_duplicates()
+            .itertuples(index=False, name=None)
+        )
+        _regenerate_budget_daily(cur, project_months)
         conn.commit()
 
         logging.info(
@@ -920,6 +1233,7 @@ def insert_advertiser_marketplace_data(data: pd.DataFrame):
         logging.info(
             f"Berhasil menyimpan/memperbarui {len(records)} records advertiser_marketplace ke database."
         )
+        sync_ads_performance_mart(data["Tanggal"])
         return {
             "status": "success",
             "message": f"{len(records)} records advertiser_marketplace berhasil disimpan atau diperbarui.",
@@ -937,6 +1251,7 @@ def insert_advertiser_marketplace_data(data: pd.DataFrame):
             logging.info("Koneksi database ditutup.")
 
 
+@track_query()
 def get_advertiser_marketplace_data():
     """
     Mengambil semua data dari tabel advertiser_marketplace.
@@ -1012,6 +1327,7 @@ def insert_advertiser_cpas_data(data: pd.DataFrame):
         logging.info(
             f"Berhasil menyimpan/memperbarui {len(records)} records advertiser_cpas ke database."
         )
+        sync_ads_performance_mart(data["Tanggal"])
         return {
             "status": "success",
             "message": f"{len(records)} records advertiser_cpas berhasil disimpan atau diperbarui.",
@@ -1027,6 +1343,7 @@ def insert_advertiser_cpas_data(data: pd.DataFrame):
             conn.close()
 
 
+@track_query()
 def get_advertiser_cpas_data():
     """
     engambil semua data dari tabel advertiser_cpas.
@@ -1283,6 +1600,7 @@ def insert_omset_data(data: pd.DataFrame):
         logging.info(
             f"Berhasil menyimpan/memperbarui {len(records)} records finance_omset ke database."
         )
+        sync_ads_performance_mart(data["Tanggal"])
         return {
             "status": "success",
             "message": f"{len(records)} records finance_omset berhasil disimpan atau diperbarui.",
@@ -1710,6 +2028,7 @@ def insert_returns_data(tanggal, order_id):
         conn.close()
 
 
+@track_query()
 def get_returns_data():
     """Mengambil semua data retur dari database."""
     conn = get_connection()
@@ -1754,45 +2073,94 @@ def insert_returns_data_batch(tanggal, order_ids):
 
 
 # --- ORDER KHUSUS ---
-def insert_order_flags_batch(tanggal_input, kategori, order_ids) -> bool:
+def insert_order_flags_batch(
+    tanggal_input, kategori, order_ids, allow_unknown: bool = False
+) -> dict:
     """
-    Menyisipkan beberapa baris data ke tabel order_flags secara efisien (batch).
+    Menyimpan banyak order_id ke tabel order_flags dalam satu round trip.
+
+    Order ID di-dedupe di sisi klien, dicocokkan ke tabel orders, lalu
+    di-insert dengan ON CONFLICT (order_id, kategori) DO NOTHING sehingga
+    input ulang tidak membuat duplikat (lihat
+    database/migrations/006_order_flags_unique.sql).
 
     Args:
         tanggal_input (date): Tanggal yang dipilih dari form.
         kategori (str): Kategori yang dipilih dari form.
         order_ids (List[str]): Daftar order_id yang akan diinput.
+        allow_unknown (bool): Jika True, order_id yang belum ada di tabel
+            orders tetap disimpan.
 
     Returns:
-        bool: True jika berhasil, False jika terjadi error.
+        dict: {"status", "message", "inserted", "duplicates", "unknown",
+               "unknown_ids"}. duplicates = duplikat di input + yang sudah
+               tersimpan sebelumnya.
     """
-    conn = get_connection()
+    unique_ids = list(dict.fromkeys(oid for oid in order_ids if oid))
+    input_duplicates = len(order_ids) - len(unique_ids)
+    if not unique_ids:
+        return {"status": "error", "message": "Tidak ada Order ID yang valid."}
 
-    # SQL Query dengan placeholder untuk keamanan
     query = """
-        INSERT INTO order_flags (order_id, kategori, tanggal_input)
-        VALUES (%s, %s, %s);
-    """
-
-    # Mempersiapkan data dalam format yang dibutuhkan (list of tuples)
-    data_to_insert = [(oid, kategori, tanggal_input) for oid in order_ids]
-
+        WITH input AS (
+            SELECT UNNEST(%(order_ids)s::text[]) AS order_id
+        ),
+        known AS (
+            SELECT i.order_id
+            FROM input i
+            WHERE EXISTS (SELECT 1 FROM orders o WHERE o.order_id = i.order_id)
+        ),
+        inserted AS (
+            INSERT INTO order_flags (order_id, kategori, tanggal_input)
+            SELECT i.order_id, %(kategori)s, %(tanggal_input)s
+            FROM input i
+            WHERE %(allow_unknown)s OR i.order_id IN (SELECT order_id FROM known)
+            ON CONFLICT (order_id, kategori) DO NOTHING
+            RETURNING order_id
+        )
+        SELECT
+            (SELECT COUNT(*) FROM inserted),
+            ARRAY(SELECT order_id FROM input EXCEPT SELECT order_id FROM known);
+    """
+    params = {
+        "order_ids": unique_ids,
+        "kategori": kategori,
+        "tanggal_input": tanggal_input,
+        "allow_unknown": allow_unknown,
+    }
+    conn = None
     try:
-        # Menggunakan koneksi yang sudah ada
+        conn = get_connection()
         with conn.cursor() as cur:
-            # Eksekusi query untuk semua data sekaligus
-            cur.executemany(query, data_to_insert)
-
-        # Commit transaksi untuk menyimpan perubahan
+            cur.execute(query, params)
+            inserted, unknown_ids = cur.fetchone()
         conn.commit()
-        print(f"Successfully inserted {len(data_to_insert)} rows into order_flags.")
-        return True
+    except (Exception, psycopg2.DatabaseError) as error:
+        if conn:
+            conn.rollback()
+        logging.error(f"Gagal menyimpan order_flags: {error}")
+        return {"status": "error", "message": str(error)}
+    finally:
+        if conn:
+            conn.close()
 
-    except psycopg2.Error as e:
-        # Jika terjadi error, batalkan semua perubahan (rollback)
-        print(f"Database error, rolling back: {e}")
-        conn.rollback()
-        return False
+    # Kandidat insert yang tidak tersimpan berarti sudah ada di order_flags
+    candidates = (
+        len(unique_ids) if allow_unknown else len(unique_ids) - len(unknown_ids)
+    )
+    duplicates = input_duplicates + (candidates - inserted)
+    logging.info(
+        f"order_flags: {inserted} disimpan, {duplicates} duplikat, "
+        f"{len(unknown_ids)} tidak dikenal."
+    )
+    return {
+        "status": "success",
+        "message": f"{inserted} Order ID disimpan.",
+        "inserted": inserted,
+        "duplicates": duplicates,
+        "unknown": len(unknown_ids),
+        "unknown_ids": unknown_ids,
+    }
 
 
 def update_table(table_name, data_list, pk_cols):
@@ -1834,7 +2202,7 @@ def update_table(table_name, data_list, pk_cols):
     conn.close()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
 def get_budget_ads_summary_by_project(project_name, start_date=None, end_date=None):
     """
     Mengambil data summary budget ads dari view vw_budget_ads_summary.
@@ -1906,52 +2274,28 @@ def process_flag_changes_reg(conn, original_df, changes):
     Memproses semua perubahan (tambah, edit, hapus) dari data editor
     dan menerapkannya ke database.
     """
-    cursor = conn.cursor()
-
-    # 1. Proses Penghapusan Data
-    if "deleted_rows" in changes and changes["deleted_rows"]:
-        indices_to_delete = changes["deleted_rows"]
-        ids_to_delete = original_df.iloc[indices_to_delete]["id_flag"].tolist()
-        for flag_id in ids_to_delete:
-            # PERBAIKAN: Ubah numpy.int64 menjadi int standar Python
-            cursor.execute(
-                "DELETE FROM order_flag_reg WHERE id_flag = %s", (int(flag_id),)
-            )
-
-    # 2. Proses Penambahan Data
-    if "added_rows" in changes and changes["added_rows"]:
-        for new_row in changes["added_rows"]:
-            cursor.execute(
-                """
-                INSERT INTO order_flag_reg (tanggal_input, nominal_adjustment, kategori, keterangan)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (
-                    new_row.get("tanggal_input", date.today()),
-                    new_row.get("nominal_adjustment", 0.0),
-                    new_row.get("kategori", "RETURN"),
-                    new_row.get("keterangan", None),
-                ),
-            )
-
-    # 3. Proses Pengeditan Data
-    if "edited_rows" in changes and changes["edited_rows"]:
-        for index, updates in changes["edited_rows"].items():
-            flag_id = original_df.iloc[int(index)]["id_flag"]
-
-            set_clauses = [f"{key} = %s" for key in updates.keys()]
-            query = (
-                f"UPDATE order_flag_reg SET {', '.join(set_clauses)} WHERE id_flag = %s"
-            )
-
-            # PERBAIKAN: Ubah numpy.int64 menjadi int standar Python untuk ID
-            values = list(updates.values()) + [int(flag_id)]
-            cursor.execute(query, tuple(values))
-
+    # Baris baru selalu mengisi empat kolom ini dengan nilai default aplikasi
+    added_rows = [
+        {
+            "tanggal_input": new_row.get("tanggal_input", date.today()),
+            "nominal_adjustment": new_row.get("nominal_adjustment", 0.0),
+            "kategori": new_row.get("kategori", "RETURN"),
+            "keterangan": new_row.get("keterangan", None),
+        }
+        for new_row in changes.get("added_rows", [])
+    ]
+    with conn.cursor() as cur:
+        apply_editor_changes(
+            cur,
+            "order_flag_reg",
+            ["id_flag"],
+            original_df,
+            {**changes, "added_rows": added_rows},
+        )
     conn.commit()
-    cursor.close()
 
 
+@track_query()
 def get_budget_regular_summary_by_project(
     start_date=None, end_date=None
 ) -> pd.DataFrame:
@@ -2010,6 +2354,7 @@ def get_budget_regular_summary_by_project(
             print("Database connection closed.")
 
 
+@track_query()
 def get_vw_ragular_performance_summary(
     start_date: date, end_date: date
 ) -> pd.DataFrame:
@@ -0,0 +1,193 @@
+"""
+Penerapan perubahan st.data_editor secara set-based.
+
+apply_editor_changes mengubah dict perubahan data editor (deleted_rows,
+added_rows, edited_rows) menjadi paling banyak tiga statement per tabel:
+
+    DELETE  semua baris terhapus, dicocokkan via key
+    UPDATE  semua baris yang diedit (dan baris tambahan yang key-nya sudah
+            ada, jika upsert=True); hanya kolom yang diubah per baris
+    INSERT  semua baris tambahan; sel yang tidak diisi memakai DEFAULT kolom
+
+Baris dikirim sebagai jsonb dan diketik ulang dengan
+jsonb_populate_record(NULL::<tabel>, ...) sehingga tipe kolom mengikuti
+definisi tabel tanpa cast manual.
+"""
+
+import json
+import math
+
+from psycopg2 import sql
+from psycopg2.extras import Json
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _native(value):
+    """Nilai yang aman untuk jsonb (NaN menjadi None)."""
+    if hasattr(value, "item") and not hasattr(value, "isoformat"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _to_json(payload) -> Json:
+    return Json(payload, dumps=lambda obj: json.dumps(obj, default=_json_default))
+
+
+def _row_key(row, key_columns: list) -> dict:
+    return {col: _native(row[col]) for col in key_columns}
+
+
+def _delete(cur, table: str, key_columns: list, keys: list) -> int:
+    query = sql.SQL("""
+        DELETE FROM {table} AS t
+        USING jsonb_populate_recordset(NULL::{table}, %s::jsonb) AS d
+        WHERE {match};
+    """).format(
+        table=sql.Identifier(table),
+        match=sql.SQL(" AND ").join(
+            sql.SQL("t.{col} = d.{col}").format(col=sql.Identifier(col))
+            for col in key_columns
+        ),
+    )
+    cur.execute(query, (_to_json(keys),))
+    return cur.rowcount
+
+
+def _update(cur, table: str, key_columns: list, patches: list) -> int:
+    columns = sorted({col for patch in patches for col in patch["set"]})
+    if not columns:
+        return 0
+    query = sql.SQL("""
+        WITH changes AS (
+            SELECT
+                jsonb_populate_record(NULL::{table}, e -> 'key') AS k,
+                jsonb_populate_record(NULL::{table}, e -> 'set') AS v,
+                e -> 'set' AS patch
+            FROM jsonb_array_elements(%s::jsonb) AS e
+        )
+        UPDATE {table} AS t
+        SET {assignments}
+        FROM changes AS c
+        WHERE {match};
+    """).format(
+        table=sql.Identifier(table),
+        assignments=sql.SQL(", ").join(
+            sql.SQL(
+                "{col} = CASE WHEN c.patch ? {name} THEN (c.v).{col} ELSE t.{col} END"
+            ).format(col=sql.Identifier(col), name=sql.Literal(col))
+            for col in columns
+        ),
+        match=sql.SQL(" AND ").join(
+            sql.SQL("t.{col} = (c.k).{col}").format(col=sql.Identifier(col))
+            for col in key_columns
+        ),
+    )
+    cur.execute(query, (_to_json(patches),))
+    return cur.rowcount
+
+
+def _insert(cur, table: str, key_columns: list, rows: list, upsert: bool) -> int:
+    columns = sorted({col for row in rows for col in row})
+    if not columns:
+        return 0
+    values = []
+    params = []
+    for row in rows:
+        cells = []
+        for col in columns:
+            if row.get(col) is None:
+                cells.append(sql.SQL("DEFAULT"))
+            else:
+                cells.append(sql.Placeholder())
+                params.append(row[col])
+        values.append(sql.SQL("({})").format(sql.SQL(", ").join(cells)))
+
+    conflict = sql.SQL("")
+    if upsert:
+        conflict = sql.SQL("ON CONFLICT ({keys}) DO NOTHING").format(
+            keys=sql.SQL(", ").join(map(sql.Identifier, key_columns))
+        )
+    query = sql.SQL("INSERT INTO {table} ({cols}) VALUES {values} {conflict};").format(
+        table=sql.Identifier(table),
+        cols=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        values=sql.SQL(", ").join(values),
+        conflict=conflict,
+    )
+    cur.execute(query, params)
+    return cur.rowcount
+
+
+def apply_editor_changes(
+    cur, table: str, key_columns: list, original_df, changes: dict, upsert=False
+) -> dict:
+    """
+    Menerapkan perubahan st.data_editor ke satu tabel dalam maksimal tiga
+    statement. Commit/rollback tetap tanggung jawab pemanggil.
+
+    Args:
+        cur: Cursor psycopg2.
+        table (str): Nama tabel tujuan.
+        key_columns (list): Kolom key (boleh komposit) untuk DELETE/UPDATE.
+        original_df (pd.DataFrame): DataFrame yang ditampilkan di editor.
+        changes (dict): Dict perubahan dari st.data_editor.
+        upsert (bool): Jika True, baris tambahan yang key-nya sudah ada
+            memperbarui kolom yang diisi (semantik ON CONFLICT DO UPDATE),
+            bukan gagal; baris tambahan tanpa key lengkap dilewati.
+
+    Returns:
+        dict: {"deleted": int, "updated": int, "inserted": int}
+    """
+    deleted_keys = [
+        _row_key(original_df.iloc[int(index)], key_columns)
+        for index in changes.get("deleted_rows", [])
+    ]
+
+    added_rows = []
+    for new_row in changes.get("added_rows", []):
+        row = {
+            col: _native(value)
+            for col, value in new_row.items()
+            if col != "_index" and value is not None
+        }
+        if row:
+            added_rows.append(row)
+
+    patches = []
+    for index, updates in changes.get("edited_rows", {}).items():
+        updates = {
+            col: _native(value) for col, value in updates.items() if col != "_index"
+        }
+        if updates:
+            key = _row_key(original_df.iloc[int(index)], key_columns)
+            patches.append({"key": key, "set": updates})
+
+    if upsert:
+        # Baris tambahan tanpa key lengkap tidak bisa di-upsert. Yang key-nya
+        # sudah ada diperlakukan sebagai edit; sisanya di-insert
+        # (ON CONFLICT DO NOTHING)
+        added_rows = [
+            row for row in added_rows if all(row.get(col) for col in key_columns)
+        ]
+        for row in added_rows:
+            updates = {col: v for col, v in row.items() if col not in key_columns}
+            if updates:
+                key = {col: row[col] for col in key_columns}
+                patches.append({"key": key, "set": updates})
+
+    result = {"deleted": 0, "updated": 0, "inserted": 0}
+    if deleted_keys:
+        result["deleted"] = _delete(cur, table, key_columns, deleted_keys)
+    if patches:
+        result["updated"] = _update(cur, table, key_columns, patches)
+    if added_rows:
+        result["inserted"] = _insert(cur, table, key_columns, added_rows, upsert)
+    return result
@@ -0,0 +1,54 @@
+"""
+Peta dtype kolom dimensi per view/tabel untuk DataFrame dashboard.
+
+Kolom teks yang nilainya berulang (toko, brand, SKU, sesi, marketplace,
+project) dikembalikan sebagai string[pyarrow], bukan object: memori cache
+jauh lebih kecil dan groupby/nunique memakai hashing Arrow, bukan hashing
+objek Python satu per satu.
+
+Categorical sengaja tidak dipakai: groupby pada kolom categorical ikut
+menampilkan kategori yang sudah tersaring (observed=False), dan mengisi nilai
+di luar kategori akan gagal. Keduanya mengubah perilaku dashboard yang ada.
+"""
+
+import pandas as pd
+
+DIMENSION_DTYPE = pd.StringDtype("pyarrow")
+
+_SHIPMENT_COLUMNS = (
+    "project",
+    "nama_toko",
+    "nama_brand",
+    "nama_marketplace",
+    "sku",
+    "sesi",
+    "no_resi",
+)
+
+VIEW_DIMENSION_COLUMNS = {
+    "vw_shipments_delivery": _SHIPMENT_COLUMNS,
+    "vw_admin_shipments_delivery": _SHIPMENT_COLUMNS,
+    "vw_admin_shipments": _SHIPMENT_COLUMNS,
+    "mart_ads_performance_summary": ("project_name", "nama_toko", "marketplace"),
+    "mart_budget_ads_summary": ("project_name", "nama_toko"),
+    "mart_monitoring_cashflow": ("Project", "Bulan", "Parameter Budget"),
+    "advertiser_marketplace": ("project", "marketplace", "nama_toko"),
+    "advertiser_cpas": ("project", "nama_toko", "akun"),
+    "advertiser_cs_regular": ("product_name", "channel"),
+}
+
+
+def apply_view_dtypes(df: pd.DataFrame, view_name: str) -> pd.DataFrame:
+    """
+    Mengubah kolom dimensi milik view_name menjadi DIMENSION_DTYPE (di tempat).
+    Kolom yang tidak ada di df atau bukan kolom teks dilewati; view yang tidak
+    terdaftar tidak diubah.
+    """
+    columns = [
+        col
+        for col in VIEW_DIMENSION_COLUMNS.get(view_name, ())
+        if col in df.columns and pd.api.types.is_string_dtype(df[col].dtype)
+    ]
+    if columns:
+        df[columns] = df[columns].astype(DIMENSION_DTYPE)
+    return df
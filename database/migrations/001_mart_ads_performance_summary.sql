@@ -0,0 +1,45 @@
+-- =============================================================================
+-- Mart: mart_ads_performance_summary
+-- Versi materialisasi dari vw_ads_performance_summary. Diisi ulang secara
+-- inkremental (per rentang tanggal) oleh database.db_manager setiap kali data
+-- advertiser_marketplace, advertiser_cpas, atau finance_omset disimpan.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS mart_ads_performance_summary AS
+SELECT * FROM vw_ads_performance_summary
+WITH NO DATA;
+
+CREATE INDEX IF NOT EXISTS idx_mart_ads_perf_project_tanggal
+    ON mart_ads_performance_summary (project_name, tanggal);
+
+CREATE INDEX IF NOT EXISTS idx_mart_ads_perf_tanggal
+    ON mart_ads_performance_summary (tanggal);
+
+-- Catatan status refresh per mart (dipakai untuk indikator staleness).
+CREATE TABLE IF NOT EXISTS mart_refresh_log (
+    mart_name          TEXT PRIMARY KEY,
+    last_refreshed_at  TIMESTAMPTZ,
+    refreshed_start    DATE,
+    refreshed_end      DATE,
+    is_stale           BOOLEAN NOT NULL DEFAULT TRUE,
+    last_error         TEXT
+);
+
+INSERT INTO mart_refresh_log (mart_name, is_stale)
+VALUES ('mart_ads_performance_summary', TRUE)
+ON CONFLICT (mart_name) DO NOTHING;
+
+-- Isi awal (full refresh). Setelah ini, pembaruan berjalan inkremental.
+BEGIN;
+DELETE FROM mart_ads_performance_summary;
+INSERT INTO mart_ads_performance_summary
+SELECT * FROM vw_ads_performance_summary;
+UPDATE mart_refresh_log
+SET last_refreshed_at = NOW(),
+    refreshed_start = NULL,
+    refreshed_end = NULL,
+    is_stale = FALSE,
+    last_error = NULL
+WHERE mart_name = 'mart_ads_performance_summary';
+COMMIT;
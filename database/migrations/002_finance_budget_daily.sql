@@ -0,0 +1,58 @@
+-- =============================================================================
+-- Tabel: finance_budget_daily
+-- Alokasi budget harian per project, tanggal, dan kategori pengeluaran.
+-- Diturunkan dari finance_budget_plan x dim_expense_categories dan dibangun
+-- ulang per (project, bulan) oleh database.db_manager.insert_budget_plan.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS finance_budget_daily (
+    project_id        INTEGER NOT NULL,
+    month_start       DATE NOT NULL,
+    tanggal           DATE NOT NULL,
+    category_id       INTEGER NOT NULL,
+    parameter_name    TEXT NOT NULL,
+    tipe_beban        TEXT,
+    budget_harian_rp  NUMERIC,
+    PRIMARY KEY (project_id, tanggal, category_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_finance_budget_daily_project_month
+    ON finance_budget_daily (project_id, month_start);
+
+-- Isi awal dari seluruh finance_budget_plan yang sudah ada.
+BEGIN;
+DELETE FROM finance_budget_daily;
+WITH budget_with_categories AS (
+    SELECT
+        fbp.project_id,
+        fbp.parameter_name,
+        dec.id AS category_id,
+        dec.tipe_beban,
+        fbp.target_bulanan_rp,
+        to_date(fbp.tahun || '-' || fbp.bulan || '-01', 'YYYY-Month-DD') AS month_start,
+        COUNT(*) OVER (
+            PARTITION BY fbp.project_id, fbp.tahun, fbp.bulan, fbp.parameter_name
+        ) AS jumlah_kategori
+    FROM finance_budget_plan fbp
+    JOIN dim_expense_categories dec ON fbp.parameter_name = dec.bidang
+    WHERE fbp.parameter_name != 'Target Omset'
+)
+INSERT INTO finance_budget_daily (
+    project_id, month_start, tanggal, category_id,
+    parameter_name, tipe_beban, budget_harian_rp
+)
+SELECT
+    bwc.project_id,
+    bwc.month_start,
+    d.tanggal::date,
+    bwc.category_id,
+    bwc.parameter_name,
+    bwc.tipe_beban,
+    (bwc.target_bulanan_rp / EXTRACT(DAY FROM (bwc.month_start + interval '1 month - 1 day'))::integer)
+        / bwc.jumlah_kategori
+FROM budget_with_categories bwc
+CROSS JOIN LATERAL generate_series(
+    bwc.month_start, bwc.month_start + interval '1 month - 1 day', '1 day'::interval
+) AS d(tanggal);
+COMMIT;
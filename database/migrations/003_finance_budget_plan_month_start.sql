@@ -0,0 +1,38 @@
+-- =============================================================================
+-- Kolom month_start pada finance_budget_plan
+-- Tanggal awal bulan yang disimpan (generated) dari kolom tahun + bulan
+-- (nama bulan Inggris, mis. 'January'), agar filter rentang tanggal bisa
+-- memakai index alih-alih TO_DATE(...) per baris.
+-- to_date() tidak IMMUTABLE sehingga tidak bisa dipakai di generated column;
+-- nomor bulan diturunkan lewat CASE + make_date().
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+ALTER TABLE finance_budget_plan
+    ADD COLUMN IF NOT EXISTS month_start DATE
+    GENERATED ALWAYS AS (
+        make_date(
+            tahun::int,
+            CASE lower(trim(bulan))
+                WHEN 'january' THEN 1
+                WHEN 'february' THEN 2
+                WHEN 'march' THEN 3
+                WHEN 'april' THEN 4
+                WHEN 'may' THEN 5
+                WHEN 'june' THEN 6
+                WHEN 'july' THEN 7
+                WHEN 'august' THEN 8
+                WHEN 'september' THEN 9
+                WHEN 'october' THEN 10
+                WHEN 'november' THEN 11
+                WHEN 'december' THEN 12
+            END,
+            1
+        )
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_finance_budget_plan_project_param_month
+    ON finance_budget_plan (project_id, parameter_name, month_start);
+
+CREATE INDEX IF NOT EXISTS idx_finance_budget_plan_month_start
+    ON finance_budget_plan (month_start);
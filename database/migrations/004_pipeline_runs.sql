@@ -0,0 +1,23 @@
+-- =============================================================================
+-- Tabel: pipeline_runs
+-- Catatan setiap run ETL (upload marketplace -> Silver -> Gold) beserta
+-- breakdown per tahap (durasi, jumlah baris, bytes COPY, peak memori) dalam
+-- kolom JSONB "stages". Ditulis oleh pipeline.utils.instrumentation.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id         BIGSERIAL PRIMARY KEY,
+    pipeline_name  TEXT NOT NULL,
+    started_at     TIMESTAMPTZ NOT NULL,
+    finished_at    TIMESTAMPTZ,
+    status         TEXT NOT NULL,
+    duration_s     NUMERIC(12, 3),
+    rows_in        INTEGER,
+    peak_mem_mb    NUMERIC(12, 1),
+    error          TEXT,
+    stages         JSONB NOT NULL DEFAULT '[]'::jsonb
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_name_started
+    ON pipeline_runs (pipeline_name, started_at DESC);
@@ -0,0 +1,24 @@
+-- =============================================================================
+-- Tabel: query_telemetry
+-- Catatan latensi helper baca (database.query_telemetry.track_query) yang
+-- di-flush secara batch jika env QUERY_TELEMETRY_PERSIST=1.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS query_telemetry (
+    id             BIGSERIAL PRIMARY KEY,
+    called_at      TIMESTAMP NOT NULL,
+    function_name  TEXT NOT NULL,
+    params_hash    TEXT NOT NULL,
+    params         TEXT,
+    duration_ms    NUMERIC(12, 2) NOT NULL,
+    row_count      INTEGER,
+    cache_hit      BOOLEAN NOT NULL,
+    error          TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_query_telemetry_called_at
+    ON query_telemetry (called_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_query_telemetry_function
+    ON query_telemetry (function_name, called_at DESC);
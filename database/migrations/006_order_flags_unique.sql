@@ -0,0 +1,16 @@
+-- =============================================================================
+-- Unique key: order_flags (order_id, kategori)
+-- Dibutuhkan oleh insert_order_flags_batch (ON CONFLICT DO NOTHING) agar input
+-- ulang Order ID yang sama dari form "Pesanan Khusus" tidak menjadi duplikat.
+-- Duplikat yang sudah ada dibersihkan lebih dulu (satu baris per pasangan).
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+DELETE FROM order_flags a
+USING order_flags b
+WHERE a.order_id = b.order_id
+  AND a.kategori = b.kategori
+  AND a.ctid > b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_order_flags_order_kategori
+    ON order_flags (order_id, kategori);
@@ -0,0 +1,43 @@
+-- =============================================================================
+-- Tabel: cache_versions
+-- Nomor versi per cache in-memory aplikasi. Trigger menaikkan versi setiap ada
+-- perubahan pada tabel sumber, sehingga proses Streamlit cukup membaca satu
+-- angka untuk tahu apakah cache-nya masih valid (lihat database/cache_versions.py).
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name        TEXT PRIMARY KEY,
+    version     BIGINT NOT NULL DEFAULT 1,
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION bump_cache_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO cache_versions (name, version, updated_at)
+    VALUES (TG_ARGV[0], 1, NOW())
+    ON CONFLICT (name) DO UPDATE
+    SET version = cache_versions.version + 1,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Mapping toko → project (database/store_mapping.py)
+INSERT INTO cache_versions (name) VALUES ('store_project_mapping')
+ON CONFLICT (name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS trg_dim_stores_cache_version ON dim_stores;
+CREATE TRIGGER trg_dim_stores_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dim_stores
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('store_project_mapping');
+
+DROP TRIGGER IF EXISTS trg_map_project_stores_cache_version ON map_project_stores;
+CREATE TRIGGER trg_map_project_stores_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON map_project_stores
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('store_project_mapping');
+
+DROP TRIGGER IF EXISTS trg_dim_projects_cache_version ON dim_projects;
+CREATE TRIGGER trg_dim_projects_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dim_projects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('store_project_mapping');
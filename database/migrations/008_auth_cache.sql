@@ -0,0 +1,69 @@
+-- =============================================================================
+-- Cache autentikasi (database/auth_cache.py)
+-- users.updated_at menjadi watermark refresh inkremental: setiap perubahan
+-- pada users atau user_projects menyentuh updated_at user yang bersangkutan.
+-- Perubahan yang tidak bisa dideteksi lewat updated_at (user dihapus, role
+-- atau nama project berubah) menaikkan versi 'auth_users' di cache_versions
+-- sehingga cache dimuat ulang penuh. Membutuhkan 007_cache_versions.sql.
+-- updated_at memakai clock_timestamp() (waktu saat baris ditulis), bukan NOW()
+-- (awal transaksi); auth_cache.py tetap mengambil ulang dengan margin karena
+-- transaksi yang commit belakangan bisa membawa updated_at di bawah watermark.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users (updated_at);
+
+CREATE OR REPLACE FUNCTION set_users_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_updated_at ON users;
+CREATE TRIGGER trg_users_updated_at
+    BEFORE INSERT OR UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION set_users_updated_at();
+
+CREATE OR REPLACE FUNCTION touch_user_from_user_projects() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE users SET updated_at = clock_timestamp() WHERE id = OLD.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE users SET updated_at = clock_timestamp() WHERE id = NEW.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_projects_touch_user ON user_projects;
+CREATE TRIGGER trg_user_projects_touch_user
+    AFTER INSERT OR UPDATE OR DELETE ON user_projects
+    FOR EACH ROW EXECUTE FUNCTION touch_user_from_user_projects();
+
+INSERT INTO cache_versions (name) VALUES ('auth_users')
+ON CONFLICT (name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS trg_users_delete_cache_version ON users;
+CREATE TRIGGER trg_users_delete_cache_version
+    AFTER DELETE OR TRUNCATE ON users
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('auth_users');
+
+DROP TRIGGER IF EXISTS trg_user_projects_truncate_cache_version ON user_projects;
+CREATE TRIGGER trg_user_projects_truncate_cache_version
+    AFTER TRUNCATE ON user_projects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('auth_users');
+
+DROP TRIGGER IF EXISTS trg_roles_cache_version ON roles;
+CREATE TRIGGER trg_roles_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON roles
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('auth_users');
+
+DROP TRIGGER IF EXISTS trg_dim_projects_auth_cache_version ON dim_projects;
+CREATE TRIGGER trg_dim_projects_auth_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON dim_projects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('auth_users');
@@ -0,0 +1,99 @@
+-- =============================================================================
+-- Tag versi untuk result cache di disk (database/result_cache.py)
+-- Setiap reader mart yang di-cache di disk memakai versi tabel sumbernya
+-- sebagai bagian dari key. Tabel biasa menaikkan versi lewat trigger.
+-- Materialized view tidak bisa diberi trigger biasa, jadi sebuah event trigger
+-- menaikkan versi setiap REFRESH MATERIALIZED VIEW atas view yang terdaftar,
+-- siapa pun yang menjalankannya (ETL, pg_cron, manual).
+--
+-- Membuat event trigger butuh hak superuser/pemilik database. Jika tidak ada,
+-- migrasi hanya mencatat NOTICE dan ETL wajib memanggil
+-- bump_cache_versions(...) setelah REFRESH:
+--
+--     REFRESH MATERIALIZED VIEW mart_monitoring_cashflow;
+--     SELECT bump_cache_versions('mart_monitoring_cashflow');
+--
+-- Membutuhkan 007_cache_versions.sql. Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION bump_cache_versions(VARIADIC names TEXT[])
+RETURNS VOID AS $$
+    INSERT INTO cache_versions (name, version, updated_at)
+    SELECT name, 1, NOW() FROM UNNEST(names) AS name
+    ON CONFLICT (name) DO UPDATE
+    SET version = cache_versions.version + 1,
+        updated_at = NOW();
+$$ LANGUAGE sql;
+
+INSERT INTO cache_versions (name) VALUES
+    ('mart_ads_performance_summary'),
+    ('mart_finance_budget_plan'),
+    ('mart_monitoring_cashflow'),
+    ('mart_budget_ads_summary')
+ON CONFLICT (name) DO NOTHING;
+
+-- mart_ads_performance_summary adalah tabel biasa (001), diisi ulang oleh
+-- refresh_ads_performance_summary()
+DROP TRIGGER IF EXISTS trg_mart_ads_perf_cache_version ON mart_ads_performance_summary;
+CREATE TRIGGER trg_mart_ads_perf_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON mart_ads_performance_summary
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('mart_ads_performance_summary');
+
+-- Perubahan budget plan juga menaikkan versi mart_finance_budget_plan, agar
+-- tetap benar jika mart tersebut berupa view biasa, bukan materialized view
+DROP TRIGGER IF EXISTS trg_finance_budget_plan_cache_version ON finance_budget_plan;
+CREATE TRIGGER trg_finance_budget_plan_cache_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON finance_budget_plan
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version('mart_finance_budget_plan');
+
+-- Mart lain yang berupa tabel biasa (bukan materialized view) mendapat trigger
+DO $$
+DECLARE
+    mart TEXT;
+BEGIN
+    FOREACH mart IN ARRAY ARRAY['mart_monitoring_cashflow', 'mart_budget_ads_summary']
+    LOOP
+        IF EXISTS (
+            SELECT 1 FROM pg_class
+            WHERE oid = to_regclass(mart) AND relkind IN ('r', 'p')
+        ) THEN
+            EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', 'trg_' || mart || '_cache_version', mart);
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+                'FOR EACH STATEMENT EXECUTE FUNCTION bump_cache_version(%L)',
+                'trg_' || mart || '_cache_version', mart, mart
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- Naikkan versi setiap REFRESH MATERIALIZED VIEW atas view yang terdaftar
+CREATE OR REPLACE FUNCTION bump_cache_version_on_refresh() RETURNS event_trigger AS $$
+DECLARE
+    cmd RECORD;
+BEGIN
+    FOR cmd IN
+        SELECT objid FROM pg_event_trigger_ddl_commands()
+        WHERE command_tag = 'REFRESH MATERIALIZED VIEW'
+    LOOP
+        UPDATE cache_versions cv
+        SET version = cv.version + 1,
+            updated_at = NOW()
+        FROM pg_class c
+        WHERE c.oid = cmd.objid AND cv.name = c.relname;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    DROP EVENT TRIGGER IF EXISTS trg_refresh_matview_cache_version;
+    CREATE EVENT TRIGGER trg_refresh_matview_cache_version
+        ON ddl_command_end
+        WHEN TAG IN ('REFRESH MATERIALIZED VIEW')
+        EXECUTE FUNCTION bump_cache_version_on_refresh();
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE NOTICE 'Event trigger REFRESH tidak dibuat (butuh superuser); ETL harus memanggil bump_cache_versions() setelah REFRESH.';
+END;
+$$;
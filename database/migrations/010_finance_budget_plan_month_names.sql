@@ -0,0 +1,25 @@
+-- =============================================================================
+-- Nama bulan kanonis pada finance_budget_plan
+-- get_vw_monitoring_cashflow memfilter report_year + report_month_name dengan
+-- kesamaan langsung (tanpa fungsi pada kolom) agar tetap sargable. Karena itu
+-- bulan dinormalkan saat ditulis ('  january ' -> 'January'), bukan saat dibaca.
+-- Trigger BEFORE berjalan sebelum month_start (generated, 003) dihitung.
+-- Membutuhkan 003_finance_budget_plan_month_start.sql.
+-- Aman dijalankan berulang kali (idempotent).
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION normalize_finance_budget_plan_bulan() RETURNS trigger AS $$
+BEGIN
+    NEW.bulan = initcap(trim(NEW.bulan));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_finance_budget_plan_normalize_bulan ON finance_budget_plan;
+CREATE TRIGGER trg_finance_budget_plan_normalize_bulan
+    BEFORE INSERT OR UPDATE OF bulan ON finance_budget_plan
+    FOR EACH ROW EXECUTE FUNCTION normalize_finance_budget_plan_bulan();
+
+UPDATE finance_budget_plan
+SET bulan = initcap(trim(bulan))
+WHERE bulan IS DISTINCT FROM initcap(trim(bulan));
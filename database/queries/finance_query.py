@@ -7,8 +7,13 @@ import streamlit as st
 from sqlalchemy import Engine, text
 from sqlalchemy.exc import SQLAlchemyError
 
+from database.frame_dtypes import apply_view_dtypes
+from database.query_telemetry import track_query
+from database.result_cache import result_cache
 
-@st.cache_data(ttl=3600, show_spinner=False)
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+@result_cache(tables=("mart_finance_budget_plan",))
 def get_mart_budget_plan(
     _engine: Engine, project_names: list[str], start_date: date, end_date: date
 ) -> pd.DataFrame:
@@ -55,7 +60,8 @@ def get_mart_budget_plan(
 
 
 # --- FUNGSI MART UNTUK CASHFLOW MONITORING ---
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+@result_cache(tables=("mart_monitoring_cashflow",))
 def get_mart_monitoring_cashflow(
     _engine: Engine, project_names: list[str], start_date: date, end_date: date
 ) -> pd.DataFrame:
@@ -95,7 +101,7 @@ def get_mart_monitoring_cashflow(
         }
         with _engine.connect() as conn:
             df = pd.read_sql_query(text(query), conn, params=params)
-        return df
+        return apply_view_dtypes(df, "mart_monitoring_cashflow")
 
     except SQLAlchemyError as e:
         logging.error(f"Gagal mengambil data monitoring report dari MART: {e}")
@@ -104,7 +110,8 @@ def get_mart_monitoring_cashflow(
 
 
 # --- FUNGSI MART UNTUK ADS SUMMARY ---
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+@result_cache(tables=("mart_budget_ads_summary",))
 def get_mart_budget_ads_summary(
     _engine: Engine,
     project_names: list[str],
@@ -136,7 +143,7 @@ def get_mart_budget_ads_summary(
 
         with _engine.connect() as conn:
             df = pd.read_sql(text(sql_query), conn, params=params)
-        return df
+        return apply_view_dtypes(df, "mart_budget_ads_summary")
 
     except SQLAlchemyError as error:
         logging.error(f"Error fetching ads summary from MART: {error}")
@@ -145,7 +152,8 @@ def get_mart_budget_ads_summary(
 
 
 # --- FUNGSI MART UNTUK ADS RATIO ---
-@st.cache_data(ttl=3600, show_spinner=False)
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+@result_cache(tables=("mart_monitoring_cashflow",))
 def get_mart_marketing_ads_ratio(
     _engine: Engine, project_names: List[str], start_date: date, end_date: date
 ) -> pd.DataFrame:
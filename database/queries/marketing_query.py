@@ -0,0 +1,99 @@
+import logging
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.frame_dtypes import apply_view_dtypes
+from database.query_telemetry import track_query
+
+# Tabel advertiser yang boleh di-query (nama tabel tidak bisa di-bind sebagai parameter)
+ADVERTISER_TABLES = {
+    "marketplace": "advertiser_marketplace",
+    "cpas": "advertiser_cpas",
+}
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def get_advertiser_date_bounds(
+    _engine: Engine, source: str, store_names: tuple[str, ...]
+) -> dict:
+    """
+    Rentang tanggal data advertiser (marketplace/cpas) untuk toko-toko satu
+    project, untuk mengisi batas widget tanggal tanpa memuat datanya.
+
+    Args:
+        store_names: Toko milik project, dari database.store_mapping.
+
+    Returns:
+        dict: {"min_date": date | None, "max_date": date | None}
+    """
+    if not store_names:
+        return {"min_date": None, "max_date": None}
+
+    query = f"""
+        SELECT MIN(a.tanggal) AS min_date, MAX(a.tanggal) AS max_date
+        FROM {ADVERTISER_TABLES[source]} a
+        WHERE a.nama_toko IN :store_names;
+    """
+    try:
+        with _engine.connect() as conn:
+            row = (
+                conn.execute(text(query), {"store_names": tuple(store_names)})
+                .mappings()
+                .one()
+            )
+        return {"min_date": row["min_date"], "max_date": row["max_date"]}
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal mengambil rentang tanggal advertiser {source}: {e}")
+        st.error(f"Database error (Rentang Advertiser): {e}")
+        return {"min_date": None, "max_date": None}
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def get_advertiser_data_by_project(
+    _engine: Engine,
+    source: str,
+    project_name: str,
+    store_names: tuple[str, ...],
+    start_date: date,
+    end_date: date,
+) -> pd.DataFrame:
+    """
+    Mengambil data advertiser (marketplace/cpas) untuk satu project dan rentang
+    tanggal. Daftar toko ikut menjadi key cache, sehingga hasil otomatis
+    diperbarui jika mapping toko → project berubah.
+    """
+    if not store_names:
+        return pd.DataFrame()
+
+    query = f"""
+        SELECT a.*, :project_name AS project
+        FROM {ADVERTISER_TABLES[source]} a
+        WHERE a.tanggal BETWEEN :start_date AND :end_date
+            AND a.nama_toko IN :store_names
+        ORDER BY a.tanggal DESC, a.nama_toko ASC;
+    """
+    params = {
+        "project_name": project_name,
+        "store_names": tuple(store_names),
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    try:
+        with _engine.connect() as conn:
+            df = pd.read_sql_query(text(query), conn, params=params)
+        df["tanggal"] = pd.to_datetime(df["tanggal"]).dt.date
+        return apply_view_dtypes(df, ADVERTISER_TABLES[source])
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal mengambil data advertiser {source}: {e}")
+        st.error(f"Database error (Data Advertiser): {e}")
+        return pd.DataFrame()
+
+
+def clear_advertiser_cache():
+    """Menghapus cache query advertiser (setelah data iklan baru disimpan)."""
+    get_advertiser_date_bounds.clear()
+    get_advertiser_data_by_project.clear()
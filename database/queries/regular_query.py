@@ -0,0 +1,216 @@
+import logging
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.frame_dtypes import apply_view_dtypes
+from database.query_telemetry import track_query
+
+# Filter range memakai kolom pertama primary key
+# (performance_date, product_name, channel), jadi tidak perlu index tambahan.
+
+
+def _product_filter(product_names: Optional[list[str]], params: dict) -> str:
+    """Klausa filter produk; None berarti semua produk."""
+    if product_names is None:
+        return ""
+    params["product_names"] = tuple(product_names)
+    return "AND product_name IN :product_names"
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def get_regular_filter_bounds(
+    _engine: Engine, product_names: Optional[list[str]] = None
+) -> dict:
+    """
+    Rentang tanggal, daftar produk, dan jumlah baris advertiser_cs_regular
+    untuk mengisi widget filter tanpa menarik seluruh tabel.
+
+    Returns:
+        dict: {"min_date": date | None, "max_date": date | None,
+               "products": list[str], "total_rows": int}
+    """
+    empty = {"min_date": None, "max_date": None, "products": [], "total_rows": 0}
+    if product_names is not None and not product_names:
+        return empty
+
+    params = {}
+    query = f"""
+        SELECT
+            MIN(performance_date) AS min_date,
+            MAX(performance_date) AS max_date,
+            ARRAY_AGG(DISTINCT product_name) AS products,
+            COUNT(*) AS total_rows
+        FROM advertiser_cs_regular
+        WHERE TRUE {_product_filter(product_names, params)};
+    """
+    try:
+        with _engine.connect() as conn:
+            row = conn.execute(text(query), params).mappings().one()
+        return {
+            "min_date": row["min_date"],
+            "max_date": row["max_date"],
+            "products": sorted(p for p in (row["products"] or []) if p is not None),
+            "total_rows": row["total_rows"],
+        }
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal mengambil rentang data advertiser_cs_regular: {e}")
+        st.error(f"Database error (Rentang Data Regular): {e}")
+        return empty
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def get_regular_performance(
+    _engine: Engine,
+    start_date: date,
+    end_date: date,
+    product_names: Optional[list[str]] = None,
+    channel: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Mengambil data advertiser_cs_regular untuk rentang tanggal dan filter
+    produk/channel tertentu. Setiap kombinasi filter di-cache terpisah.
+
+    Args:
+        product_names: Daftar produk; None berarti semua produk.
+        channel: Nama channel; None berarti semua channel.
+    """
+    if product_names is not None and not product_names:
+        return pd.DataFrame()
+
+    params = {"start_date": start_date, "end_date": end_date}
+    channel_filter = ""
+    if channel is not None:
+        params["channel"] = channel
+        channel_filter = "AND channel = :channel"
+
+    query = f"""
+        SELECT *
+        FROM advertiser_cs_regular
+        WHERE performance_date BETWEEN :start_date AND :end_date
+            {_product_filter(product_names, params)}
+            {channel_filter}
+        ORDER BY performance_date DESC, product_name, channel;
+    """
+    try:
+        with _engine.connect() as conn:
+            df = pd.read_sql_query(text(query), conn, params=params)
+        df["performance_date"] = pd.to_datetime(df["performance_date"]).dt.date
+        return apply_view_dtypes(df, "advertiser_cs_regular")
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal mengambil data advertiser_cs_regular: {e}")
+        st.error(f"Database error (Data Regular): {e}")
+        return pd.DataFrame()
+
+
+def clear_regular_cache():
+    """Menghapus cache query advertiser_cs_regular saja (setelah data berubah)."""
+    get_regular_filter_bounds.clear()
+    get_regular_performance.clear()
+
+
+@track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+def get_budgeting_regular_bundle(
+    _engine: Engine, project_id: int, start_date: date, end_date: date
+) -> dict:
+    """
+    Semua data dashboard budgeting regular untuk satu project dan periode
+    dalam satu query (satu koneksi, satu entri cache): total target omset,
+    total omset akrual, target rasio ads kuartal tanggal akhir, dan detail
+    performa iklan harian beserta status terhadap target rasio.
+
+    Returns:
+        dict: {"target_omset": float, "omset_akrual": float,
+               "target_rasio": float | None, "ads": pd.DataFrame,
+               "ads_daily": pd.DataFrame}
+    """
+    query = """
+        WITH target AS (
+            SELECT COALESCE(SUM(target_bulanan_rp), 0) AS target_omset
+            FROM finance_budget_plan
+            WHERE project_id = :project_id
+                AND parameter_name = 'Target Omset'
+                AND month_start BETWEEN :start_date AND :end_date
+        ),
+        akrual AS (
+            SELECT COALESCE(SUM(akrual_basis), 0) AS omset_akrual
+            FROM vw_budget_regular_summary
+            WHERE tanggal BETWEEN :start_date AND :end_date
+        ),
+        ads AS (
+            SELECT COALESCE(json_agg(v ORDER BY v.tanggal DESC), '[]'::json) AS rows
+            FROM vw_regular_performance_summary v
+            WHERE v.tanggal BETWEEN :start_date AND :end_date
+        )
+        SELECT
+            target.target_omset,
+            akrual.omset_akrual,
+            (
+                SELECT target_rasio_persen
+                FROM finance_budget_plan
+                WHERE project_id = :project_id
+                    AND parameter_name = 'Biaya Marketing (Ads)'
+                    AND tahun = :year
+                    AND kuartal = :quarter
+                LIMIT 1
+            ) AS target_rasio,
+            ads.rows AS ads
+        FROM target, akrual, ads;
+    """
+    params = {
+        "project_id": project_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "year": end_date.year,
+        "quarter": (end_date.month - 1) // 3 + 1,
+    }
+    empty = {
+        "target_omset": 0.0,
+        "omset_akrual": 0.0,
+        "target_rasio": None,
+        "ads": pd.DataFrame(),
+        "ads_daily": pd.DataFrame(),
+    }
+    try:
+        with _engine.connect() as conn:
+            row = conn.execute(text(query), params).mappings().one()
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal mengambil data dashboard budgeting regular: {e}")
+        st.error(f"Database error (Budgeting Regular): {e}")
+        return empty
+
+    target_rasio = row["target_rasio"]
+    if target_rasio is not None:
+        target_rasio = float(target_rasio)
+
+    df_ads = pd.DataFrame(row["ads"])
+    df_ads_daily = pd.DataFrame()
+    if not df_ads.empty:
+        df_ads["tanggal"] = pd.to_datetime(df_ads["tanggal"]).dt.date
+        if target_rasio is not None:
+            safe_zone_start = target_rasio - 5
+            ratio = df_ads["ads_spend_percentage_net"]
+            df_ads["target_rasio"] = target_rasio
+            df_ads["status"] = np.select(
+                [ratio < safe_zone_start, ratio <= target_rasio],
+                ["Under", "Normal"],
+                default="Over",
+            )
+        df_ads_daily = (
+            df_ads.groupby("tanggal")[["total_omset", "total_spending"]]
+            .sum()
+            .reset_index()
+        )
+
+    return {
+        "target_omset": float(row["target_omset"]),
+        "omset_akrual": float(row["omset_akrual"]),
+        "target_rasio": target_rasio,
+        "ads": df_ads,
+        "ads_daily": df_ads_daily,
+    }
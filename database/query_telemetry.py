@@ -0,0 +1,245 @@
+"""
+Telemetri latensi query untuk helper baca di database/.
+
+Dekorator track_query mencatat setiap panggilan (fungsi, hash parameter,
+durasi, jumlah baris, cache hit/miss) ke ring buffer in-memory per proses.
+Jika QUERY_TELEMETRY_PERSIST=1, catatan juga di-flush secara batch ke tabel
+query_telemetry (lihat database/migrations/005_query_telemetry.sql).
+
+Pemakaian pada fungsi ber-cache, st.cache_data dibungkus oleh track_query
+agar cache hit dan miss bisa dibedakan:
+
+    @track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+    def get_mart_budget_plan(_engine, project_names, start_date, end_date):
+        ...
+
+Pada fungsi tanpa cache cukup @track_query().
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+
+import pandas as pd
+import psycopg2
+from psycopg2 import extras
+
+from database.db_connection import get_connection
+
+QUERY_LOG_SIZE = int(os.getenv("QUERY_TELEMETRY_LOG_SIZE", "2000"))
+PERSIST_TELEMETRY = os.getenv("QUERY_TELEMETRY_PERSIST", "0") == "1"
+PERSIST_BATCH_SIZE = 50
+
+_query_log = deque(maxlen=QUERY_LOG_SIZE)
+_pending_persist = []
+_lock = threading.Lock()
+
+# Penanda per panggilan: diset True jika body fungsi benar-benar dieksekusi
+_cache_miss = ContextVar("query_telemetry_cache_miss", default=None)
+
+
+def _describe_value(value) -> str:
+    if isinstance(value, pd.DataFrame):
+        return f"DataFrame{value.shape}"
+    return repr(value)
+
+
+def _describe_params(signature: inspect.Signature, args, kwargs) -> str:
+    """Parameter panggilan sebagai string, tanpa argumen berawalan "_" (engine)."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return ""
+    return ", ".join(
+        f"{name}={_describe_value(value)}"
+        for name, value in bound.arguments.items()
+        if not name.startswith("_")
+    )
+
+
+def _count_rows(result):
+    if isinstance(result, (pd.DataFrame, pd.Series, list, tuple)):
+        return len(result)
+    return None
+
+
+def _record(entry: dict):
+    with _lock:
+        _query_log.append(entry)
+        if PERSIST_TELEMETRY:
+            _pending_persist.append(entry)
+            should_flush = len(_pending_persist) >= PERSIST_BATCH_SIZE
+        else:
+            should_flush = False
+    if should_flush:
+        flush_query_telemetry()
+
+
+def track_query(cache=None):
+    """
+    Dekorator telemetri query.
+
+    Args:
+        cache (callable, optional): Dekorator cache (mis. st.cache_data(...)).
+            Jika diberikan, cache dipasang di dalam telemetri sehingga hit/miss
+            tercatat; atribut .clear() dari fungsi ber-cache tetap tersedia.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def _execute(*args, **kwargs):
+            miss = _cache_miss.get()
+            if miss is not None:
+                miss[0] = True
+            return func(*args, **kwargs)
+
+        inner = cache(_execute) if cache is not None else _execute
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            miss = [False]
+            token = _cache_miss.set(miss)
+            start = time.perf_counter()
+            result = None
+            error = None
+            try:
+                result = inner(*args, **kwargs)
+                return result
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                _cache_miss.reset(token)
+                params = _describe_params(signature, args, kwargs)
+                _record(
+                    {
+                        "called_at": datetime.now(),
+                        "function": f"{func.__module__}.{func.__name__}",
+                        "params_hash": hashlib.md5(params.encode()).hexdigest()[:12],
+                        "params": params[:300],
+                        "duration_ms": round(duration_ms, 2),
+                        "rows": _count_rows(result),
+                        "cache_hit": cache is not None and not miss[0],
+                        "error": error,
+                    }
+                )
+
+        if hasattr(inner, "clear"):
+            wrapper.clear = inner.clear
+        return wrapper
+
+    return decorator
+
+
+def get_query_log() -> pd.DataFrame:
+    """Snapshot ring buffer sebagai DataFrame (terbaru di atas)."""
+    with _lock:
+        entries = list(_query_log)
+    columns = [
+        "called_at",
+        "function",
+        "params_hash",
+        "params",
+        "duration_ms",
+        "rows",
+        "cache_hit",
+        "error",
+    ]
+    df = pd.DataFrame(entries, columns=columns)
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def get_query_stats(include_cache_hits: bool = False) -> pd.DataFrame:
+    """
+    Ringkasan per (fungsi, params_hash): jumlah panggilan, hit rate, p50/p95/max
+    durasi, dan rata-rata baris. Diurutkan dari p95 terlambat.
+    """
+    df = get_query_log()
+    if df.empty:
+        return df
+
+    hit_rate = df.groupby(["function", "params_hash"])["cache_hit"].mean()
+    if not include_cache_hits:
+        df = df[~df["cache_hit"]]
+        if df.empty:
+            return pd.DataFrame()
+
+    stats = (
+        df.groupby(["function", "params_hash"])
+        .agg(
+            params=("params", "first"),
+            calls=("duration_ms", "size"),
+            p50_ms=("duration_ms", "median"),
+            p95_ms=("duration_ms", lambda s: s.quantile(0.95)),
+            max_ms=("duration_ms", "max"),
+            avg_rows=("rows", "mean"),
+            errors=("error", "count"),
+        )
+        .join(hit_rate.rename("cache_hit_rate"))
+        .reset_index()
+    )
+    return stats.sort_values("p95_ms", ascending=False).reset_index(drop=True)
+
+
+def clear_query_log():
+    """Mengosongkan ring buffer (catatan yang menunggu persist tetap disimpan)."""
+    with _lock:
+        _query_log.clear()
+
+
+def flush_query_telemetry() -> dict:
+    """Menyimpan catatan yang tertunda ke tabel query_telemetry secara batch."""
+    with _lock:
+        entries = list(_pending_persist)
+        _pending_persist.clear()
+    if not entries:
+        return {"status": "success", "message": "Tidak ada catatan yang tertunda."}
+
+    query = """
+        INSERT INTO query_telemetry (
+            called_at, function_name, params_hash, params,
+            duration_ms, row_count, cache_hit, error
+        )
+        VALUES %s;
+    """
+    values = [
+        (
+            e["called_at"],
+            e["function"],
+            e["params_hash"],
+            e["params"],
+            e["duration_ms"],
+            e["rows"],
+            e["cache_hit"],
+            e["error"],
+        )
+        for e in entries
+    ]
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            extras.execute_values(cur, query, values)
+        conn.commit()
+        return {
+            "status": "success",
+            "message": f"{len(values)} catatan telemetri tersimpan.",
+        }
+    except (Exception, psycopg2.DatabaseError) as error:
+        if conn:
+            conn.rollback()
+        logging.error(f"Gagal menyimpan telemetri query: {error}")
+        return {"status": "error", "message": str(error)}
+    finally:
+        if conn:
+            conn.close()
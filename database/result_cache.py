@@ -0,0 +1,261 @@
+"""
+Cache hasil query di disk, dipakai bersama oleh semua proses di satu host.
+
+st.cache_data hanya hidup di memori satu proses: setiap restart atau worker
+tambahan mulai dari cache kosong. Dekorator result_cache dipasang di bawah
+st.cache_data sehingga cache miss di memori dicari dulu di disk:
+
+    @track_query(cache=st.cache_data(ttl=3600, show_spinner=False))
+    @result_cache(tables=("mart_budget_ads_summary",))
+    def get_mart_budget_ads_summary(_engine, project_names, start_date, end_date):
+        ...
+
+Key = nama fungsi + parameter (argumen berawalan "_" diabaikan, sama seperti
+st.cache_data) + versi tabel sumber dari cache_versions. Versi tabel dinaikkan
+oleh trigger (tabel biasa) atau oleh event trigger pada REFRESH MATERIALIZED
+VIEW (lihat database/migrations/009_result_cache_versions.sql), sehingga data
+yang berubah otomatis memakai key baru. Tombol Refresh di halaman memanggil
+clear_result_cache() agar query benar-benar dijalankan ulang.
+
+DataFrame disimpan sebagai file Arrow IPC, hasil lain sebagai pickle. File
+ditulis atomik (tulis ke file sementara lalu os.replace) sehingga aman dibaca
+proses lain. mtime file = waktu tulis (untuk TTL), atime = akses terakhir
+(untuk LRU); total ukuran dibatasi RESULT_CACHE_MAX_MB.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from database.cache_versions import get_cache_versions
+
+CACHE_DIR = Path(
+    os.getenv(
+        "RESULT_CACHE_DIR",
+        Path(__file__).resolve().parent.parent / ".query_cache",
+    )
+)
+MAX_BYTES = int(float(os.getenv("RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+DEFAULT_TTL_S = int(os.getenv("RESULT_CACHE_TTL", str(12 * 3600)))
+VERSION_CHECK_INTERVAL_S = float(os.getenv("RESULT_CACHE_VERSION_INTERVAL", "30"))
+ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+
+_STRING_COLUMNS_KEY = b"result_cache.string_columns"
+
+_lock = threading.Lock()
+_versions = {}  # nama tabel -> (versi, waktu cek)
+
+
+def _table_versions(tables: tuple) -> dict | None:
+    """
+    Versi tabel sumber, dibaca dari cache_versions paling sering setiap
+    VERSION_CHECK_INTERVAL_S detik. None jika ada versi yang tidak diketahui
+    (tabel belum terdaftar atau database tidak bisa dibaca).
+    """
+    now = time.monotonic()
+    with _lock:
+        stale = [
+            name
+            for name in tables
+            if name not in _versions
+            or now - _versions[name][1] >= VERSION_CHECK_INTERVAL_S
+        ]
+    if stale:
+        fetched = get_cache_versions(stale)
+        with _lock:
+            for name in stale:
+                if name in fetched:
+                    _versions[name] = (fetched[name], now)
+                else:
+                    _versions.pop(name, None)
+    with _lock:
+        if any(name not in _versions for name in tables):
+            return None
+        return {name: _versions[name][0] for name in tables}
+
+
+def expire_table_versions(tables: tuple = None):
+    """
+    Memaksa versi tabel dibaca ulang dari cache_versions pada akses berikutnya
+    (tables=None berarti semua). Dipanggil setelah proses ini sendiri mengubah
+    tabel sumber, agar tidak menunggu VERSION_CHECK_INTERVAL_S.
+    """
+    with _lock:
+        if tables is None:
+            _versions.clear()
+        else:
+            for name in tables:
+                _versions.pop(name, None)
+
+
+def _cache_key(function_name: str, bound_args: dict, versions: dict) -> str:
+    params = ", ".join(
+        f"{name}={value!r}"
+        for name, value in bound_args.items()
+        if not name.startswith("_")
+    )
+    raw = f"{function_name}|{params}|{sorted(versions.items())}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _write_frame(path: Path, df: pd.DataFrame):
+    table = pa.Table.from_pandas(df)
+    # string[pyarrow] kembali sebagai string[python] tanpa petunjuk ini
+    string_columns = [
+        str(col)
+        for col, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.StringDtype)
+    ]
+    metadata = dict(table.schema.metadata or {})
+    metadata[_STRING_COLUMNS_KEY] = json.dumps(string_columns).encode()
+    table = table.replace_schema_metadata(metadata)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    metadata = table.schema.metadata or {}
+    string_columns = json.loads(metadata.get(_STRING_COLUMNS_KEY, b"[]"))
+    df = table.to_pandas()
+    if string_columns:
+        df[string_columns] = df[string_columns].astype(pd.StringDtype("pyarrow"))
+    return df
+
+
+def _load(key: str, ttl_s: int):
+    """(True, hasil) jika ada entri yang belum kedaluwarsa, selain itu (False, None)."""
+    for suffix, reader in ((".arrow", _read_frame), (".pkl", _read_pickle)):
+        path = CACHE_DIR / f"{key}{suffix}"
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > ttl_s:
+                path.unlink(missing_ok=True)
+                return False, None
+            result = reader(path)
+            # atime = akses terakhir untuk LRU; mtime (waktu tulis) tetap
+            os.utime(path, (time.time(), stat.st_mtime))
+            return True, result
+        except FileNotFoundError:
+            continue
+        except Exception as error:
+            logging.warning(f"Entri result cache {path.name} rusak, dihapus: {error}")
+            path.unlink(missing_ok=True)
+            return False, None
+    return False, None
+
+
+def _read_pickle(path: Path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _store(key: str, result):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    is_frame = isinstance(result, pd.DataFrame)
+    path = CACHE_DIR / f"{key}{'.arrow' if is_frame else '.pkl'}"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if is_frame:
+            _write_frame(tmp, result)
+        else:
+            with open(tmp, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception as error:
+        logging.warning(f"Gagal menyimpan result cache {path.name}: {error}")
+        tmp.unlink(missing_ok=True)
+        return
+    _evict()
+
+
+def _evict():
+    """Menghapus entri paling lama tidak diakses sampai total ukuran <= MAX_BYTES."""
+    entries = []
+    total = 0
+    for path in CACHE_DIR.iterdir():
+        if path.suffix not in (".arrow", ".pkl"):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_atime, stat.st_size, path))
+        total += stat.st_size
+    if total <= MAX_BYTES:
+        return
+    for _, size, path in sorted(entries):
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= MAX_BYTES:
+            break
+
+
+def _is_empty(result) -> bool:
+    # Hasil kosong/None juga dipakai readers sebagai nilai saat error;
+    # tidak disimpan agar error sesaat tidak bertahan melewati restart
+    return result is None or (isinstance(result, pd.DataFrame) and result.empty)
+
+
+def result_cache(tables: tuple, ttl: int = None):
+    """
+    Dekorator cache hasil di disk dengan TTL dan tag versi tabel.
+
+    Args:
+        tables (tuple): Nama tabel/view sumber yang versinya terdaftar di
+            cache_versions. Jika salah satu versinya tidak diketahui, cache
+            dilewati dan query dijalankan langsung.
+        ttl (int, optional): Umur maksimal entri dalam detik
+            (default RESULT_CACHE_TTL, 12 jam).
+    """
+    ttl_s = DEFAULT_TTL_S if ttl is None else ttl
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        function_name = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            versions = _table_versions(tuple(tables))
+            if versions is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = _cache_key(function_name, bound.arguments, versions)
+            found, result = _load(key, ttl_s)
+            if found:
+                logging.debug(f"Result cache hit: {function_name} ({key}).")
+                return result
+
+            result = func(*args, **kwargs)
+            if not _is_empty(result):
+                _store(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def clear_result_cache():
+    """Menghapus semua entri result cache di disk (untuk semua proses)."""
+    if not CACHE_DIR.exists():
+        return
+    for path in CACHE_DIR.iterdir():
+        if path.suffix in (".arrow", ".pkl", ".tmp"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,134 @@
+"""
+Mapping toko → project bersama untuk satu proses Streamlit.
+
+Join map_project_stores × dim_stores × dim_projects dimuat sekali ke memori
+dan dipakai ulang oleh semua konsumen (dashboard advertiser, opsi dropdown,
+ringkasan keuangan). Versi mapping dibaca dari cache_versions paling sering
+setiap STORE_MAPPING_CHECK_INTERVAL detik; data hanya dimuat ulang jika
+versinya berubah (trigger pada ketiga tabel menaikkan versi).
+"""
+
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+import psycopg2
+
+from database.cache_versions import get_cache_versions
+from database.db_connection import get_connection
+from database.query_telemetry import track_query
+
+MAPPING_VERSION_NAME = "store_project_mapping"
+CHECK_INTERVAL_S = float(os.getenv("STORE_MAPPING_CHECK_INTERVAL", "30"))
+
+_lock = threading.Lock()
+_mapping = None
+_checked_at = 0.0
+
+
+class StoreProjectMapping:
+    """
+    Snapshot mapping toko → project.
+
+    Atribut:
+        version: Versi cache_versions saat dimuat (None jika tidak diketahui).
+        frame: Satu baris per pasangan (toko, project); kolom dim_stores
+            ditambah project_id dan project_name (nama_toko & project_name
+            bertipe category).
+        store_to_project: dict nama_toko → project_name.
+        project_by_store: Series project_name (category) ber-index nama_toko,
+            untuk df["nama_toko"].map(mapping.project_by_store).
+    """
+
+    def __init__(self, frame: pd.DataFrame, version=None):
+        self.version = version
+        self.frame = frame
+        # Toko yang dipetakan ke beberapa project memakai baris terakhir,
+        # sama seperti pemetaan dict sebelumnya
+        unique_stores = frame.drop_duplicates("nama_toko", keep="last")
+        self.store_to_project = dict(
+            zip(unique_stores["nama_toko"], unique_stores["project_name"])
+        )
+        self.project_by_store = pd.Series(
+            unique_stores["project_name"].to_numpy(),
+            index=pd.CategoricalIndex(unique_stores["nama_toko"]),
+            dtype=frame["project_name"].dtype,
+        )
+
+    def stores_for_project(self, project) -> pd.DataFrame:
+        """Baris toko untuk satu project (nama project atau project_id)."""
+        column = "project_name" if isinstance(project, str) else "project_id"
+        return self.frame[self.frame[column] == project]
+
+    def store_names(self, project) -> list:
+        return sorted(self.stores_for_project(project)["nama_toko"].unique().tolist())
+
+    def store_ids(self, project) -> list:
+        return sorted(int(i) for i in self.stores_for_project(project)["store_id"])
+
+
+@track_query()
+def _fetch_mapping_frame() -> pd.DataFrame:
+    query = """
+        SELECT ds.*, dp.project_id, dp.project_name
+        FROM map_project_stores mps
+        JOIN dim_stores ds ON ds.store_id = mps.store_id
+        JOIN dim_projects dp ON dp.project_id = mps.project_id
+        ORDER BY dp.project_id, ds.store_id;
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        return pd.read_sql(query, conn)
+    finally:
+        if conn:
+            conn.close()
+
+
+def _load_mapping(version) -> StoreProjectMapping:
+    df = _fetch_mapping_frame()
+    df["nama_toko"] = df["nama_toko"].astype("category")
+    df["project_name"] = df["project_name"].astype("category")
+    logging.info(f"Mapping toko-project dimuat: {len(df)} baris (versi {version}).")
+    return StoreProjectMapping(df, version)
+
+
+def get_store_project_mapping() -> StoreProjectMapping:
+    """
+    Mengembalikan mapping yang sedang di-cache, memuat ulang hanya jika versi
+    di cache_versions berubah. Jika pemuatan gagal, snapshot lama tetap
+    dipakai (atau mapping kosong bila belum pernah berhasil dimuat).
+    """
+    global _mapping, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _mapping is not None and now - _checked_at < CHECK_INTERVAL_S:
+            return _mapping
+
+        version = get_cache_versions([MAPPING_VERSION_NAME]).get(MAPPING_VERSION_NAME)
+        if _mapping is None or version is None or version != _mapping.version:
+            try:
+                _mapping = _load_mapping(version)
+            except (Exception, psycopg2.DatabaseError) as error:
+                logging.error(f"Gagal memuat mapping toko-project: {error}")
+                if _mapping is None:
+                    empty = pd.DataFrame(
+                        {
+                            "store_id": pd.Series(dtype="int64"),
+                            "nama_toko": pd.Series(dtype="category"),
+                            "project_id": pd.Series(dtype="int64"),
+                            "project_name": pd.Series(dtype="category"),
+                        }
+                    )
+                    return StoreProjectMapping(empty)
+        _checked_at = now
+        return _mapping
+
+
+def invalidate_store_mapping():
+    """Memaksa mapping dimuat ulang pada akses berikutnya di proses ini."""
+    global _mapping
+    with _lock:
+        _mapping = None
@@ -1,7 +1,13 @@
+import os
 from datetime import datetime, timedelta
 
 import pytz
 
+# Mode validasi pandera di jalur ETL: "full" atau "sampled"
+# (lihat pipeline/schemas/validation.py)
+VALIDATION_MODE = os.getenv("PIPELINE_VALIDATION_MODE", "sampled")
+VALIDATION_SAMPLE_SIZE = int(os.getenv("PIPELINE_VALIDATION_SAMPLE_SIZE", "5000"))
+
 
 def get_yesterday_in_jakarta():
     tz = pytz.timezone("Asia/Jakarta")
@@ -0,0 +1,209 @@
+"""
+Validasi skema pandera dengan dua mode:
+
+- "full"    : schema.validate() penuh (coerce + semua check) pada seluruh baris.
+- "sampled" : coerce tipe + filter kolom pada seluruh baris, invariant murah
+              yang tervektorisasi (nullable, unique, check bawaan seperti ge/gt)
+              pada seluruh baris, lalu validate() penuh hanya pada sampel.
+
+Kedua mode mengumpulkan semua error (lazy) dan melempar pa.errors.SchemaErrors.
+Mode default diatur lewat PIPELINE_VALIDATION_MODE di pipeline.config.variables.
+"""
+
+import pandas as pd
+import pandera.pandas as pa
+from pandera.backends.pandas.error_formatters import reshape_failure_cases
+from pandera.engines import pandas_engine
+from pandera.errors import ParserError, SchemaError, SchemaErrorReason, SchemaErrors
+
+from pipeline.config.variables import VALIDATION_MODE, VALIDATION_SAMPLE_SIZE
+
+VALIDATION_MODES = ("full", "sampled")
+
+
+def _is_already_typed(column, series: pd.Series) -> bool:
+    """True jika series sudah ber-dtype target sehingga coerce bisa dilewati."""
+    if not column.dtype.check(pandas_engine.Engine.dtype(series.dtype)):
+        return False
+    if series.dtype == object:
+        # Kolom object baru dianggap str jika seluruh nilai non-null adalah str
+        return pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+    return True
+
+
+def _coerce_columns(schema, df: pd.DataFrame) -> list:
+    """
+    Coerce in-place hanya kolom yang belum ber-dtype target (tipe yang sudah
+    dipaksa di tahap sebelumnya tidak diproses ulang). Mengembalikan list error.
+    """
+    errors = []
+    for name, column in schema.columns.items():
+        if name not in df.columns or not (schema.coerce or column.coerce):
+            continue
+        if _is_already_typed(column, df[name]):
+            continue
+        try:
+            df[name] = column.dtype.try_coerce(df[name])
+        except ParserError as e:
+            errors.append(
+                SchemaError(
+                    column,
+                    df,
+                    f"Error while coercing '{name}' to type {column.dtype}: {e}",
+                    failure_cases=e.failure_cases,
+                    check=f"coerce_dtype('{column.dtype}')",
+                    reason_code=SchemaErrorReason.DATATYPE_COERCION,
+                    column_name=name,
+                )
+            )
+    return errors
+
+
+def _column_errors(df: pd.DataFrame, name: str, column) -> list:
+    """Invariant murah satu kolom pada seluruh baris (tanpa coerce ulang)."""
+    errors = []
+    series = df[name]
+
+    def _error(message, failure_cases, check, reason_code, ignore_na=True):
+        return SchemaError(
+            column,
+            df,
+            message,
+            failure_cases=reshape_failure_cases(failure_cases, ignore_na),
+            check=check,
+            reason_code=reason_code,
+            column_name=name,
+        )
+
+    if not column.nullable:
+        null_mask = series.isna()
+        if null_mask.any():
+            errors.append(
+                _error(
+                    f"non-nullable series '{name}' contains null values",
+                    series[null_mask],
+                    "not_nullable",
+                    SchemaErrorReason.SERIES_CONTAINS_NULLS,
+                    ignore_na=False,
+                )
+            )
+
+    if column.unique:
+        dup_mask = series.duplicated(keep=False) & series.notna()
+        if dup_mask.any():
+            errors.append(
+                _error(
+                    f"series '{name}' contains duplicate values",
+                    series[dup_mask],
+                    "field_uniqueness",
+                    SchemaErrorReason.SERIES_CONTAINS_DUPLICATES,
+                )
+            )
+
+    for check in column.checks:
+        # Check bawaan (ge, gt, isin, ...) sudah tervektorisasi; nilai null
+        # diabaikan oleh pandera sesuai ignore_na=True.
+        result = check(series)
+        if not bool(result.check_passed):
+            errors.append(
+                _error(
+                    f"Column '{name}' failed {check.error}",
+                    result.failure_cases,
+                    check,
+                    SchemaErrorReason.DATAFRAME_CHECK,
+                )
+            )
+    return errors
+
+
+def _validate_sampled(
+    schema: pa.DataFrameSchema, df: pd.DataFrame, sample_size: int
+) -> pd.DataFrame:
+    errors = []
+
+    # Backend Check untuk pd.Series baru terdaftar saat validate() pertama kali;
+    # daftarkan lebih dulu karena mode ini memanggil Check secara langsung.
+    schema.register_default_backends(type(df))
+
+    missing = [
+        name
+        for name, column in schema.columns.items()
+        if column.required and name not in df.columns
+    ]
+    if missing:
+        errors.append(
+            SchemaError(
+                schema,
+                df,
+                f"column(s) {missing} not in dataframe",
+                failure_cases=reshape_failure_cases(pd.Series(missing)),
+                check="column_in_dataframe",
+                reason_code=SchemaErrorReason.COLUMN_NOT_IN_DATAFRAME,
+            )
+        )
+        raise SchemaErrors(schema, errors, df)
+
+    # strict="filter": buang kolom di luar skema, urutan kolom input dipertahankan
+    if schema.strict == "filter":
+        df = df.reindex(columns=[c for c in df.columns if c in schema.columns])
+    else:
+        df = df.copy()
+
+    # Coerce tetap pada seluruh baris karena tahap berikutnya bergantung pada dtype
+    errors.extend(_coerce_columns(schema, df))
+    if errors:
+        raise SchemaErrors(schema, errors, df)
+
+    for name, column in schema.columns.items():
+        if name in df.columns:
+            errors.extend(_column_errors(df, name, column))
+
+    if len(df) > sample_size:
+        sample = df.sample(n=sample_size, random_state=0)
+    else:
+        sample = df
+    try:
+        schema.validate(sample, lazy=True)
+    except SchemaErrors as e:
+        # Lewati error sampel yang sudah tertangkap oleh invariant seluruh baris
+        reported = {(err.column_name, err.reason_code) for err in errors}
+        errors.extend(
+            err
+            for err in e.schema_errors
+            if (err.column_name, err.reason_code) not in reported
+        )
+
+    if errors:
+        raise SchemaErrors(schema, errors, df)
+    return df
+
+
+def validate_frame(
+    schema: pa.DataFrameSchema,
+    df: pd.DataFrame,
+    mode: str = None,
+    sample_size: int = None,
+) -> pd.DataFrame:
+    """
+    Pengganti schema.validate(df) untuk jalur ETL.
+
+    Args:
+        schema (pa.DataFrameSchema): Skema pandera (bigseller/gold).
+        df (pd.DataFrame): Data yang divalidasi.
+        mode (str, optional): "full" atau "sampled". Default VALIDATION_MODE.
+        sample_size (int, optional): Jumlah baris sampel untuk mode "sampled".
+
+    Returns:
+        pd.DataFrame: Data hasil coerce + filter kolom sesuai skema.
+
+    Raises:
+        pa.errors.SchemaErrors: Berisi seluruh error yang ditemukan.
+    """
+    mode = mode or VALIDATION_MODE
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Mode validasi {mode} tidak didukung.")
+
+    if mode == "full":
+        return schema.validate(df, lazy=True)
+
+    return _validate_sampled(schema, df, sample_size or VALIDATION_SAMPLE_SIZE)
@@ -5,6 +5,7 @@ import pandera as pa
 from pipeline.config.column_mappings import SHOPEE_MAP, TIKTOK_MAP  # , TOKOPEDIA_MAP
 from pipeline.config.value_mappings import PAYMENT_METHOD_MAP, SHIPPING_PROVIDER_MAP
 from pipeline.schemas.bigseller_schema import bigseller_schema
+from pipeline.schemas.validation import validate_frame
 from pipeline.utils.helpers import (
     clean_currency_columns,
     clean_datetime_columns,
@@ -195,9 +196,9 @@ def transform_to_bigseller_format(file, source):
         # Skema akan otomatis:
         # 1. (coerce=True) Memaksa tipe data (str ke int/float/datetime)
         # 2. (strict="filter") Menghapus kolom ekstra yg tidak ada di skema
-        validated_df = bigseller_schema.validate(df_transformed)
+        validated_df = validate_frame(bigseller_schema, df_transformed)
 
-    except pa.errors.SchemaError as e:
+    except (pa.errors.SchemaError, pa.errors.SchemaErrors) as e:
         print("--- Gagal Validasi Skema ---")
         print(e.failure_cases)  # Menampilkan data yang gagal
         print("------------------------------")
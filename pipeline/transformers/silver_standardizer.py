@@ -10,6 +10,7 @@ from pipeline.config.value_mappings import (
     SHIPPING_PROVIDER_MAP,
 )
 from pipeline.schemas.bigseller_schema import bigseller_schema
+from pipeline.schemas.validation import validate_frame
 from pipeline.utils.helpers import (
     clean_currency_columns,
     clean_datetime_columns,
@@ -105,11 +106,11 @@ def standardize_silver_data(df):
     # Validasi terhadap skema Silver
     try:
         logging.info("Memvalidasi skema data silver...")
-        validated_df = bigseller_schema.validate(df)
+        validated_df = validate_frame(bigseller_schema, df)
         logging.info("Validasi Silver sukses.")
         return validated_df
 
-    except pa.errors.SchemaError as e:
+    except (pa.errors.SchemaError, pa.errors.SchemaErrors) as e:
         logging.error("--- GAGAL VALIDASI SILVER STANDARDIZATION ---")
         logging.error(e.failure_cases)
         raise Exception(f"Data campuran tidak lolos standardisasi: \n{e}")
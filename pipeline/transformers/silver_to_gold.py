@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 import streamlit as st  # Kita gunakan untuk st.info di orkestrator
 
@@ -8,7 +9,6 @@ import pipeline.utils.db_utils as db
 
 # Impor semua mapping dan skema
 from pipeline.config import column_mappings as maps
-from pipeline.config import value_mappings as val_maps
 from pipeline.config.column_mappings import (
     CUSTOMERS_MAP,
     MARKETPLACES_MAP,
@@ -23,6 +23,8 @@ from pipeline.config.column_mappings import (
 )
 from pipeline.config.value_mappings import BRAND_MAP, MARKETPLACE_MAP
 from pipeline.schemas import gold_schema as schemas
+from pipeline.schemas.validation import validate_frame
+from pipeline.utils.instrumentation import PipelineRun, save_pipeline_run
 
 
 # Independent Dimmension Table Builders
@@ -128,8 +130,8 @@ def _build_dim_stores(df_silver, marketplace_key_map: dict):
     df_dim = df_dim.rename(columns=STORES_MAP)
 
     # Enrichment
-    df_dim["nama_toko"] = (
-        df_dim["nama_marketplace"].map(MARKETPLACE_MAP) + " " + df_dim["nama_toko_raw"]
+    df_dim["nama_toko"] = _build_nama_toko(
+        df_dim["nama_marketplace"], df_dim["nama_toko_raw"]
     )
 
     df_dim["marketplace_id"] = df_dim["nama_marketplace"].map(marketplace_key_map)
@@ -138,7 +140,7 @@ def _build_dim_stores(df_silver, marketplace_key_map: dict):
         logging.warning("Marketplace ID tidak ditemukan, diisi dengan 9999 (Unknown).")
         df_dim["marketplace_id"] = df_dim["marketplace_id"].fillna(9999).astype(int)
 
-    return schemas.dim_stores_schema.validate(df_dim)
+    return validate_frame(schemas.dim_stores_schema, df_dim)
 
 
 def _build_dim_products(df_silver, brand_key_map: dict):
@@ -162,45 +164,160 @@ def _build_dim_products(df_silver, brand_key_map: dict):
         logging.warning("Brand ID tidak ditemukan, diisi dengan 9999 (Unknown).")
         df_dim["brand_id"] = df_dim["brand_id"].fillna(9999).astype(int)
 
-    return schemas.dim_products_schema.validate(df_dim)
+    return validate_frame(schemas.dim_products_schema, df_dim)
 
 
-# Fact Table Builder with Linking and Aggregation
-def _build_fact_orders(df_clean_silver: pd.DataFrame, key_maps: dict) -> pd.DataFrame:
+# Linked Silver Frame (surrogate key resolution)
+def _build_nama_toko(
+    nama_marketplace: pd.Series, nama_toko_raw: pd.Series
+) -> pd.Series:
     """
-    Menyiapkan DataFrame fact_orders yang tertaut dengan Foreign Keys.
-    Menerima 'key_maps' (dict berisi DataFrame kecil) dari orkestrator.
+    Membentuk natural key 'nama_toko' (mis. 'SP zhi yang yao') dari marketplace + nama toko.
+    Dipakai bersama oleh dim_stores, key step toko, dan linked silver frame.
     """
+    return nama_marketplace.map(MARKETPLACE_MAP) + " " + nama_toko_raw
 
-    natural_key_cols_silver = ["Nama Pembeli", "Nomor Telepon", "Alamat Lengkap"]
-    natural_key_cols_gold = ["nama_pembeli", "no_telepon", "alamat_lengkap"]
-    timestamp_source_col = "Tanggal Gudang"
 
-    # 1. Validasi Key Map
-    customer_id_map_df = key_maps.get("customers")
-    if customer_id_map_df is None:
-        raise ValueError("Customer key map (DataFrame) tidak ditemukan di key_maps.")
+def _lookup_ids(
+    keys, key_map_df: pd.DataFrame, key_cols: list, id_col: str
+) -> pd.Series:
+    """
+    Mencari surrogate key untuk setiap baris silver tanpa pd.merge.
+
+    Natural key di-factorize dulu sehingga pencarian ke key map (Index/MultiIndex
+    get_indexer) hanya dilakukan sekali per nilai unik, lalu hasilnya disebar
+    kembali ke setiap baris lewat kode kategorinya.
+
+    Args:
+        keys (pd.Series | pd.DataFrame): Natural key per baris silver.
+        key_map_df (pd.DataFrame): Key map dari database (natural key + id).
+        key_cols (list): Nama kolom natural key di key_map_df (urutan sama dengan keys).
+        id_col (str): Nama kolom surrogate key di key_map_df.
+
+    Returns:
+        pd.Series: Surrogate key (float, NaN jika tidak ditemukan) ber-index sama dengan keys.
+    """
+    if isinstance(keys, pd.DataFrame):
+        # ngroup(sort=False) menomori grup sesuai urutan kemunculan pertama,
+        # sama dengan urutan baris hasil drop_duplicates()
+        key_list = list(keys.columns)
+        codes = keys.groupby(key_list, sort=False, dropna=False).ngroup().to_numpy()
+        uniques = pd.MultiIndex.from_frame(keys.drop_duplicates())
+        map_index = pd.MultiIndex.from_frame(key_map_df[key_cols])
+    else:
+        codes, uniques = pd.factorize(keys)
+        map_index = pd.Index(key_map_df[key_cols[0]])
+
+    # get_indexer butuh index unik; ambil id pertama jika key map berisi duplikat
+    is_first = ~map_index.duplicated()
+    map_index = map_index[is_first]
+    map_ids = key_map_df[id_col].to_numpy(dtype=float)[is_first]
+
+    ids = np.full(len(codes), np.nan)
+    if len(uniques) and len(map_ids):
+        positions = map_index.get_indexer(uniques)
+        unique_ids = np.where(positions >= 0, map_ids[positions], np.nan)
+        has_key = codes >= 0
+        ids[has_key] = unique_ids[codes[has_key]]
+
+    return pd.Series(ids, index=keys.index, name=id_col)
+
+
+def _build_linked_silver(
+    df_clean_silver: pd.DataFrame, key_maps: dict, nama_toko: pd.Series
+) -> pd.DataFrame:
+    """
+    Menyelesaikan semua surrogate key untuk df_clean_silver dalam satu tahap.
+
+    Output hanya berisi kolom id (customer_id, product_id, store_id, service_id,
+    method_id) dengan index yang sama seperti df_clean_silver, sehingga builder
+    fakta cukup memproyeksikan kolom yang dibutuhkan tanpa merge ulang.
+    """
+    required_maps = [
+        "customers",
+        "products",
+        "stores",
+        "shipping_services",
+        "payment_methods",
+    ]
+    missing_maps = [name for name in required_maps if key_maps.get(name) is None]
+    if missing_maps:
+        raise ValueError(
+            f"Key map (DataFrame) tidak ditemukan di key_maps: {', '.join(missing_maps)}"
+        )
+
+    customer_key_cols_silver = ["Nama Pembeli", "Nomor Telepon", "Alamat Lengkap"]
+    customer_key_cols_gold = [CUSTOMERS_MAP[col] for col in customer_key_cols_silver]
+
+    return pd.DataFrame(
+        {
+            "customer_id": _lookup_ids(
+                df_clean_silver[customer_key_cols_silver],
+                key_maps["customers"],
+                customer_key_cols_gold,
+                "customer_id",
+            ),
+            "product_id": _lookup_ids(
+                df_clean_silver["SKU"], key_maps["products"], ["sku"], "product_id"
+            ),
+            "store_id": _lookup_ids(
+                nama_toko, key_maps["stores"], ["nama_toko"], "store_id"
+            ),
+            "service_id": _lookup_ids(
+                df_clean_silver["Jasa Kirim yang Dipilih Pembeli"],
+                key_maps["shipping_services"],
+                ["jasa_kirim"],
+                "service_id",
+            ),
+            "method_id": _lookup_ids(
+                df_clean_silver["Metode Pembayaran"],
+                key_maps["payment_methods"],
+                ["metode_pembayaran"],
+                "method_id",
+            ),
+        },
+        index=df_clean_silver.index,
+    )
+
+
+def _project(
+    df_clean_silver: pd.DataFrame,
+    column_map: dict,
+    linked: pd.DataFrame,
+    id_cols: list,
+) -> pd.DataFrame:
+    """
+    Memproyeksikan kolom silver (langsung dengan nama gold) + kolom id dari linked frame
+    tanpa menyalin data kolom (copy=False), menggantikan pola slice + .copy() + rename.
+    """
+    columns = {gold: df_clean_silver[silver] for silver, gold in column_map.items()}
+    columns.update({col: linked[col] for col in id_cols})
+    return pd.DataFrame(columns, copy=False)
+
 
-    # 2. Siapkan Data Fakta
-    fact_cols_silver = list(ORDERS_MAP.keys())
+# Fact Table Builder with Linking and Aggregation
+def _build_fact_orders(
+    df_clean_silver: pd.DataFrame, linked: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Menyiapkan DataFrame fact_orders yang tertaut dengan Foreign Keys.
+    Menerima linked silver frame (hasil _build_linked_silver) dari orkestrator.
+    """
+    timestamp_source_col = "Tanggal Gudang"
 
-    # Strict Check 1
+    # 1. Strict Check 1
     if timestamp_source_col not in df_clean_silver.columns:
         raise ValueError(
             f"CRITICAL ERROR: Kolom wajib '{timestamp_source_col}' tidak ditemukan di file input! "
             "Mohon pastikan tim gudang menggunakan template terbaru."
         )
 
-    #    Copy data
-    df_fact = df_clean_silver[fact_cols_silver + natural_key_cols_silver].copy()
-
-    # 3. Validasi Data Kosong (Strict Check 2)
-    if df_fact[timestamp_source_col].isnull().any():
-        missing_count = df_fact[timestamp_source_col].isnull().sum()
+    # 2. Validasi Data Kosong (Strict Check 2)
+    missing_timestamp = df_clean_silver[timestamp_source_col].isnull()
+    if missing_timestamp.any():
+        missing_count = missing_timestamp.sum()
         sample_missing = (
-            df_fact[df_fact[timestamp_source_col].isnull()]["Nomor Pesanan"]
-            .head(3)
-            .tolist()
+            df_clean_silver.loc[missing_timestamp, "Nomor Pesanan"].head(3).tolist()
         )
 
         raise ValueError(
@@ -208,91 +325,41 @@ def _build_fact_orders(df_clean_silver: pd.DataFrame, key_maps: dict) -> pd.Data
             f"Kolom ini wajib diisi. Contoh Pesanan: {sample_missing}"
         )
 
+    # 3. Proyeksi kolom + customer_id, lalu deduplikasi per pesanan
+    df_fact = _project(df_clean_silver, ORDERS_MAP, linked, ["customer_id"])
+    df_fact = df_fact.drop_duplicates(subset=["order_id"])
+
     # 4. Konversi Date -> Timestamp (PostgreSQL Compatible)
+    timestamp_col = ORDERS_MAP[timestamp_source_col]
     try:
-        df_fact[timestamp_source_col] = pd.to_datetime(df_fact[timestamp_source_col])
+        df_fact[timestamp_col] = pd.to_datetime(df_fact[timestamp_col])
     except Exception as e:
         raise ValueError(
             f"Gagal mengonversi '{timestamp_source_col}' ke format Timestamp: {e}"
         )
 
-    # 5. Deduplikasi & Rename
-    df_fact = df_fact.drop_duplicates(subset=["Nomor Pesanan"])
-
-    df_fact = df_fact.rename(columns=ORDERS_MAP)
-    df_fact = df_fact.rename(columns=CUSTOMERS_MAP)
-
-    # 6. Linking (Merge dengan Customer Map)
-    df_fact_linked = pd.merge(
-        df_fact,
-        customer_id_map_df,
-        on=natural_key_cols_gold,
-        how="left",
-    )
-
-    # 7. Handle Missing Customer IDs
-    if df_fact_linked["customer_id"].isnull().any():
-        missing_count = df_fact_linked["customer_id"].isnull().sum()
+    # 5. Handle Missing Customer IDs
+    if df_fact["customer_id"].isnull().any():
+        missing_count = df_fact["customer_id"].isnull().sum()
         logging.warning(
             f"{missing_count} baris customer_id tidak ditemukan di fact_orders, "
             f"diisi dengan 9999 (Unknown)."
         )
-        df_fact_linked["customer_id"] = (
-            df_fact_linked["customer_id"].fillna(9999).astype(int)
-        )
+        df_fact["customer_id"] = df_fact["customer_id"].fillna(9999).astype(int)
 
-    # 8. Validasi Skema
-    return schemas.orders_schema.validate(df_fact_linked)
+    # 6. Validasi Skema
+    return validate_frame(schemas.orders_schema, df_fact)
 
 
 def _build_fact_order_items(
-    df_clean_silver: pd.DataFrame, key_maps: dict
+    df_clean_silver: pd.DataFrame, linked: pd.DataFrame
 ) -> pd.DataFrame:
     """
     Menyiapkan DataFrame fact_order_items, tertaut, dan teragregasi.
-    Menerima 'key_maps' (dict berisi DataFrame kecil) dari orkestrator.
+    Menerima linked silver frame (hasil _build_linked_silver) dari orkestrator.
     """
-
-    product_natural_key_gold = "sku"
-    store_link_keys_silver = ["Toko Marketplace", "Marketplace"]
-
-    product_id_map_df = key_maps.get("products")
-    store_id_map_df = key_maps.get("stores")
-
-    if product_id_map_df is None or store_id_map_df is None:
-        raise ValueError(
-            "Product atau Store ID map (DataFrame) tidak ditemukan di key_maps."
-        )
-
-    fact_cols_silver = list(ORDER_ITEMS_MAP.keys())
-
-    df_fact = df_clean_silver[fact_cols_silver + store_link_keys_silver].copy()
-
-    df_fact = df_fact.rename(columns=ORDER_ITEMS_MAP)
-    df_fact = df_fact.rename(columns=PRODUCTS_MAP)
-    df_fact = df_fact.rename(columns=STORES_MAP)
-    df_fact = df_fact.rename(columns=MARKETPLACES_MAP)
-
-    # ENRICHMENT: Buat 'nama_toko' untuk linking
-    df_fact["nama_toko"] = (
-        df_fact["nama_marketplace"].map(MARKETPLACE_MAP)
-        + " "
-        + df_fact["nama_toko_raw"]
-    )
-
-    # LINKING (Tautkan Foreign Keys)
-    df_linked = pd.merge(
-        df_fact,
-        product_id_map_df,
-        on=product_natural_key_gold,
-        how="left",
-    )
-
-    df_linked = pd.merge(
-        df_linked,
-        store_id_map_df,
-        on="nama_toko",
-        how="left",
+    df_linked = _project(
+        df_clean_silver, ORDER_ITEMS_MAP, linked, ["product_id", "store_id"]
     )
 
     if df_linked[["product_id", "store_id"]].isnull().any().any():
@@ -301,7 +368,7 @@ def _build_fact_order_items(
             f"{missing_count} baris di order_items gagal di-mapping "
             f"(product_id atau store_id tidak ditemukan). Baris ini akan DIHAPUS."
         )
-        df_linked.dropna(subset=["product_id", "store_id"], inplace=True)
+        df_linked = df_linked.dropna(subset=["product_id", "store_id"])
 
     grouping_keys = ["order_id", "product_id", "store_id"]
 
@@ -321,39 +388,17 @@ def _build_fact_order_items(
     df_fact_agg["product_id"] = df_fact_agg["product_id"].astype(int)
     df_fact_agg["store_id"] = df_fact_agg["store_id"].astype(int)
 
-    return schemas.order_items_schema.validate(df_fact_agg)
+    return validate_frame(schemas.order_items_schema, df_fact_agg)
 
 
 def _build_fact_shipments(
-    df_clean_silver: pd.DataFrame, key_maps: dict
+    df_clean_silver: pd.DataFrame, linked: pd.DataFrame
 ) -> pd.DataFrame:
     """
     Menyiapkan DataFrame fact_shipments, tertaut, dan teragregasi per no_resi.
-    Menerima 'key_maps' (dict berisi DataFrame kecil) dari orkestrator.
+    Menerima linked silver frame (hasil _build_linked_silver) dari orkestrator.
     """
-
-    shipping_natural_key_silver = "Jasa Kirim yang Dipilih Pembeli"
-    shipping_natural_key_gold = "jasa_kirim"
-
-    shipping_id_map_df = key_maps.get("shipping_services")
-    if shipping_id_map_df is None:
-        raise ValueError(
-            "Shipping services ID map (DataFrame) tidak ditemukan di key_maps."
-        )
-
-    fact_cols_silver = list(SHIPMENTS_MAP.keys())
-
-    df_fact = df_clean_silver[fact_cols_silver + [shipping_natural_key_silver]].copy()
-
-    df_fact = df_fact.rename(columns=SHIPMENTS_MAP)
-    df_fact = df_fact.rename(columns=SHIPPING_SERVICES_MAP)  # Me-rename natural key
-
-    df_linked = pd.merge(
-        df_fact,
-        shipping_id_map_df,
-        on=shipping_natural_key_gold,
-        how="left",
-    )
+    df_linked = _project(df_clean_silver, SHIPMENTS_MAP, linked, ["service_id"])
 
     if df_linked["service_id"].isnull().any():
         missing_count = df_linked["service_id"].isnull().sum()
@@ -361,11 +406,10 @@ def _build_fact_shipments(
             f"{missing_count} baris di fact_shipments gagal di-mapping "
             f"(service_id tidak ditemukan). Diisi dengan 9999 (Unknown)."
         )
-        df_linked["service_id"].fillna(9999, inplace=True)
 
-    df_linked["service_id"] = df_linked["service_id"].astype(int)
+    df_linked["service_id"] = df_linked["service_id"].fillna(9999).astype(int)
 
-    df_linked.dropna(subset=["no_resi"], inplace=True)
+    df_linked = df_linked.dropna(subset=["no_resi"])
 
     cols_in_df = set(df_linked.columns)
 
@@ -387,34 +431,23 @@ def _build_fact_shipments(
 
     df_fact_agg = df_linked.groupby("no_resi").agg(**valid_agg_spec).reset_index()
 
-    return schemas.shipments_schema.validate(df_fact_agg)
+    return validate_frame(schemas.shipments_schema, df_fact_agg)
 
 
-def _build_fact_payments(df_clean_silver: pd.DataFrame, key_maps: dict) -> pd.DataFrame:
+def _build_fact_payments(
+    df_clean_silver: pd.DataFrame, linked: pd.DataFrame
+) -> pd.DataFrame:
     """
     Menyiapkan DataFrame fact_payments, tertaut, dan teragregasi per order_id.
-    Menerima 'key_maps' (dict berisi DataFrame kecil) dari orkestrator.
+    Menerima linked silver frame (hasil _build_linked_silver) dari orkestrator.
     """
-
-    payment_natural_key_gold = "metode_pembayaran"
-
-    payment_id_map_df = key_maps.get("payment_methods")
-    if payment_id_map_df is None:
-        raise ValueError(
-            "Payment methods ID map (DataFrame) tidak ditemukan di key_maps."
-        )
-
-    fact_cols_silver = list(PAYMENTS_MAP.keys())
-    df_fact = df_clean_silver[fact_cols_silver].copy()
-
-    df_fact = df_fact.rename(columns=PAYMENTS_MAP)
-
-    df_linked = pd.merge(
-        df_fact,
-        payment_id_map_df,
-        on=payment_natural_key_gold,  # 'metode_pembayaran'
-        how="left",
-    )
+    # Natural key 'metode_pembayaran' sudah diselesaikan menjadi method_id di linked frame
+    payment_cols = {
+        silver: gold
+        for silver, gold in PAYMENTS_MAP.items()
+        if gold != "metode_pembayaran"
+    }
+    df_linked = _project(df_clean_silver, payment_cols, linked, ["method_id"])
 
     if df_linked["method_id"].isnull().any():
         missing_count = df_linked["method_id"].isnull().sum()
@@ -422,9 +455,8 @@ def _build_fact_payments(df_clean_silver: pd.DataFrame, key_maps: dict) -> pd.Da
             f"{missing_count} baris di fact_payments gagal di-mapping "
             f"(method_id tidak ditemukan). Diisi dengan 9999 (Unknown)."
         )
-        df_linked["method_id"].fillna(9999, inplace=True)
 
-    df_linked["method_id"] = df_linked["method_id"].astype(int)
+    df_linked["method_id"] = df_linked["method_id"].fillna(9999).astype(int)
 
     agg_columns = [
         "order_id",
@@ -451,17 +483,26 @@ def _build_fact_payments(df_clean_silver: pd.DataFrame, key_maps: dict) -> pd.Da
         .reset_index()
     )
 
-    return schemas.payments_schema.validate(df_fact_agg)
+    return validate_frame(schemas.payments_schema, df_fact_agg)
 
 
 # ORCHESTRATOR UTILITIES
-def process_silver_to_gold(df_clean_silver: pd.DataFrame):
+def process_silver_to_gold(df_clean_silver: pd.DataFrame, run: PipelineRun = None):
     """
     Orkestrator pipeline Silver -> Gold (Metode Serial yang Dioptimalkan).
 
+    Setiap _build_*, bulk_upsert, dan get_keys_for_batch dicatat sebagai satu
+    tahap di PipelineRun (durasi, baris, bytes COPY, peak memori).
+
     Args:
         df_clean_silver: DataFrame bersih dari silver_standardizer.
+        run: PipelineRun milik pemanggil. Jika None, run baru dibuat dan
+             langsung disimpan ke pipeline_runs di akhir proses.
     """
+    owns_run = run is None
+    if owns_run:
+        run = PipelineRun("silver_to_gold")
+        run.rows_in = len(df_clean_silver)
 
     st.info("Memulai pipeline Silver-to-Gold...")
 
@@ -470,22 +511,56 @@ def process_silver_to_gold(df_clean_silver: pd.DataFrame):
         st.info("1/5: Memproses dimensi independen (Customers, Brands, etc.)...")
 
         # 1A. Siapkan DataFrame (T1 - Transform)
-        df_dim_brands = _build_dim_brands(df_clean_silver)
-        df_dim_marketplaces = _build_dim_marketplaces(df_clean_silver)
-        df_dim_shipping_services = _build_dim_shipping_services(df_clean_silver)
-        df_dim_payment_methods = _build_dim_payment_methods(df_clean_silver)
-        df_dim_customers = _build_dim_customers(df_clean_silver)
+        df_dim_brands = run.timed(
+            "build dim_brands", _build_dim_brands, df_clean_silver
+        )
+        df_dim_marketplaces = run.timed(
+            "build dim_marketplaces", _build_dim_marketplaces, df_clean_silver
+        )
+        df_dim_shipping_services = run.timed(
+            "build dim_shipping_services",
+            _build_dim_shipping_services,
+            df_clean_silver,
+        )
+        df_dim_payment_methods = run.timed(
+            "build dim_payment_methods", _build_dim_payment_methods, df_clean_silver
+        )
+        df_dim_customers = run.timed(
+            "build customers", _build_dim_customers, df_clean_silver
+        )
 
         # 1B. Load ke Database (L1 - Load)
-        db.bulk_upsert(df_dim_brands, "dim_brands", ["nama_brand"])
-        db.bulk_upsert(df_dim_marketplaces, "dim_marketplaces", ["nama_marketplace"])
-        db.bulk_upsert(
-            df_dim_shipping_services, "dim_shipping_services", ["jasa_kirim"]
+        run.timed(
+            "upsert dim_brands",
+            db.bulk_upsert,
+            df_dim_brands,
+            "dim_brands",
+            ["nama_brand"],
         )
-        db.bulk_upsert(
-            df_dim_payment_methods, "dim_payment_methods", ["metode_pembayaran"]
+        run.timed(
+            "upsert dim_marketplaces",
+            db.bulk_upsert,
+            df_dim_marketplaces,
+            "dim_marketplaces",
+            ["nama_marketplace"],
+        )
+        run.timed(
+            "upsert dim_shipping_services",
+            db.bulk_upsert,
+            df_dim_shipping_services,
+            "dim_shipping_services",
+            ["jasa_kirim"],
         )
-        db.bulk_upsert(
+        run.timed(
+            "upsert dim_payment_methods",
+            db.bulk_upsert,
+            df_dim_payment_methods,
+            "dim_payment_methods",
+            ["metode_pembayaran"],
+        )
+        run.timed(
+            "upsert customers",
+            db.bulk_upsert,
             df_dim_customers,
             "customers",
             ["nama_pembeli", "no_telepon", "alamat_lengkap"],
@@ -499,10 +574,16 @@ def process_silver_to_gold(df_clean_silver: pd.DataFrame):
         marketplace_keys_df = df_dim_marketplaces[["nama_marketplace"]]
 
         # 2B. Ambil key maps dari DB (T2 - Transform)
-        brand_key_map_df = db.get_keys_for_batch(
-            "dim_brands", ["brand_id", "nama_brand"], brand_keys_df
+        brand_key_map_df = run.timed(
+            "keys dim_brands",
+            db.get_keys_for_batch,
+            "dim_brands",
+            ["brand_id", "nama_brand"],
+            brand_keys_df,
         )
-        marketplace_key_map_df = db.get_keys_for_batch(
+        marketplace_key_map_df = run.timed(
+            "keys dim_marketplaces",
+            db.get_keys_for_batch,
             "dim_marketplaces",
             ["marketplace_id", "nama_marketplace"],
             marketplace_keys_df,
@@ -523,103 +604,174 @@ def process_silver_to_gold(df_clean_silver: pd.DataFrame):
         st.info("3/5: Memproses dimensi dependen (Products, Stores)...")
 
         # 3A. Siapkan DataFrame (T3 - Transform)
-        df_dim_products = _build_dim_products(df_clean_silver, brand_key_map_dict)
-        df_dim_stores = _build_dim_stores(df_clean_silver, marketplace_key_map_dict)
+        df_dim_products = run.timed(
+            "build products",
+            _build_dim_products,
+            df_clean_silver,
+            brand_key_map_dict,
+        )
+        df_dim_stores = run.timed(
+            "build dim_stores",
+            _build_dim_stores,
+            df_clean_silver,
+            marketplace_key_map_dict,
+        )
 
         # 3B. Load ke Database (L2 - Load)
-        db.bulk_upsert(df_dim_products, "products", ["sku"])
-        db.bulk_upsert(df_dim_stores, "dim_stores", ["nama_toko"])
+        run.timed(
+            "upsert products", db.bulk_upsert, df_dim_products, "products", ["sku"]
+        )
+        run.timed(
+            "upsert dim_stores",
+            db.bulk_upsert,
+            df_dim_stores,
+            "dim_stores",
+            ["nama_toko"],
+        )
 
         # === TAHAP 4: AMBIL SEMUA KEY MAPS UNTUK FAKTA ===
         st.info("4/5: Mengambil semua key maps untuk tabel fakta...")
 
         # 4A. Siapkan DataFrame batch keys (dari df_clean_silver)
+        with run.stage("prepare batch keys") as stage:
+            # Customer (Key Gabungan)
+            cust_keys_df = df_clean_silver[
+                list(maps.CUSTOMERS_MAP.keys())
+            ].drop_duplicates()
+            cust_keys_df = cust_keys_df.rename(columns=maps.CUSTOMERS_MAP)
+
+            # Product (Key Tunggal)
+            prod_keys_df = (
+                df_clean_silver[["SKU"]]
+                .drop_duplicates()
+                .rename(columns=maps.PRODUCTS_MAP)
+            )
 
-        # Customer (Key Gabungan)
-        cust_keys_df = df_clean_silver[
-            list(maps.CUSTOMERS_MAP.keys())
-        ].drop_duplicates()
-        cust_keys_df = cust_keys_df.rename(columns=maps.CUSTOMERS_MAP)
-
-        # Product (Key Tunggal)
-        prod_keys_df = (
-            df_clean_silver[["SKU"]].drop_duplicates().rename(columns=maps.PRODUCTS_MAP)
-        )
-
-        # Store (Key Tunggal, tapi perlu di-build)
-        store_keys_df = df_clean_silver[
-            ["Toko Marketplace", "Marketplace"]
-        ].drop_duplicates()
-        store_keys_df = store_keys_df.rename(columns=maps.STORES_MAP)
-        store_keys_df = store_keys_df.rename(columns=maps.MARKETPLACES_MAP)
-        store_keys_df["nama_toko"] = (
-            store_keys_df["nama_marketplace"].map(val_maps.MARKETPLACE_MAP)
-            + " "
-            + store_keys_df["nama_toko_raw"]
-        )
+            # Store (Key Tunggal, di-build sekali per baris dan dipakai ulang saat linking)
+            nama_toko = _build_nama_toko(
+                df_clean_silver["Marketplace"], df_clean_silver["Toko Marketplace"]
+            )
+            store_keys_df = pd.DataFrame({"nama_toko": nama_toko.dropna().unique()})
 
-        # Shipping (Key Tunggal)
-        ship_keys_df = (
-            df_clean_silver[["Jasa Kirim yang Dipilih Pembeli"]]
-            .drop_duplicates()
-            .rename(columns=maps.SHIPPING_SERVICES_MAP)
-        )
+            # Shipping (Key Tunggal)
+            ship_keys_df = (
+                df_clean_silver[["Jasa Kirim yang Dipilih Pembeli"]]
+                .drop_duplicates()
+                .rename(columns=maps.SHIPPING_SERVICES_MAP)
+            )
 
-        # Payment (Key Tunggal)
-        pay_keys_df = (
-            df_clean_silver[["Metode Pembayaran"]]
-            .drop_duplicates()
-            .rename(columns=maps.PAYMENT_METHODS_MAP)
-        )
+            # Payment (Key Tunggal)
+            pay_keys_df = (
+                df_clean_silver[["Metode Pembayaran"]]
+                .drop_duplicates()
+                .rename(columns=maps.PAYMENT_METHODS_MAP)
+            )
+            stage["rows_out"] = len(cust_keys_df)
 
         # 4B. Ambil semua key maps dari DB (T4 - Transform)
         key_maps = {
-            "customers": db.get_keys_for_batch(
+            "customers": run.timed(
+                "keys customers",
+                db.get_keys_for_batch,
                 "customers",
                 ["customer_id", "nama_pembeli", "no_telepon", "alamat_lengkap"],
                 cust_keys_df,
             ),
-            "products": db.get_keys_for_batch(
-                "products", ["product_id", "sku"], prod_keys_df
+            "products": run.timed(
+                "keys products",
+                db.get_keys_for_batch,
+                "products",
+                ["product_id", "sku"],
+                prod_keys_df,
             ),
-            "stores": db.get_keys_for_batch(
-                "dim_stores", ["store_id", "nama_toko"], store_keys_df[["nama_toko"]]
+            "stores": run.timed(
+                "keys dim_stores",
+                db.get_keys_for_batch,
+                "dim_stores",
+                ["store_id", "nama_toko"],
+                store_keys_df,
             ),
-            "shipping_services": db.get_keys_for_batch(
-                "dim_shipping_services", ["service_id", "jasa_kirim"], ship_keys_df
+            "shipping_services": run.timed(
+                "keys dim_shipping_services",
+                db.get_keys_for_batch,
+                "dim_shipping_services",
+                ["service_id", "jasa_kirim"],
+                ship_keys_df,
             ),
-            "payment_methods": db.get_keys_for_batch(
-                "dim_payment_methods", ["method_id", "metode_pembayaran"], pay_keys_df
+            "payment_methods": run.timed(
+                "keys dim_payment_methods",
+                db.get_keys_for_batch,
+                "dim_payment_methods",
+                ["method_id", "metode_pembayaran"],
+                pay_keys_df,
             ),
         }
 
         # === TAHAP 5: BANGUN TABEL FAKTA ===
         st.info("5/5: Membangun tabel fakta (linking)...")
 
-        # 5A. Bangun DataFrame (T5 - Transform)
-        fact_orders = _build_fact_orders(df_clean_silver, key_maps)
+        # 5A. Selesaikan semua surrogate key sekali (linked silver frame)
+        linked = run.timed(
+            "link surrogate keys",
+            _build_linked_silver,
+            df_clean_silver,
+            key_maps,
+            nama_toko,
+        )
 
-        fact_order_items = _build_fact_order_items(df_clean_silver, key_maps)
-        fact_shipments = _build_fact_shipments(df_clean_silver, key_maps)
-        fact_payments = _build_fact_payments(df_clean_silver, key_maps)
+        # 5B. Bangun DataFrame (T5 - Transform)
+        fact_orders = run.timed(
+            "build orders", _build_fact_orders, df_clean_silver, linked
+        )
+
+        fact_order_items = run.timed(
+            "build order_items", _build_fact_order_items, df_clean_silver, linked
+        )
+        fact_shipments = run.timed(
+            "build shipments", _build_fact_shipments, df_clean_silver, linked
+        )
+        fact_payments = run.timed(
+            "build payments", _build_fact_payments, df_clean_silver, linked
+        )
 
         # === TAHAP 6: LOAD TABEL FAKTA ===
         st.info("6/6: Me-load tabel fakta ke database...")
 
         # 6A. Load ke Database (L3 - Load)
-        db.bulk_upsert(fact_orders, "orders", ["order_id"])
-
-        db.bulk_upsert(
-            fact_order_items, "order_items", ["order_id", "product_id", "store_id"]
+        run.timed("upsert orders", db.bulk_upsert, fact_orders, "orders", ["order_id"])
+
+        run.timed(
+            "upsert order_items",
+            db.bulk_upsert,
+            fact_order_items,
+            "order_items",
+            ["order_id", "product_id", "store_id"],
         )
 
-        db.bulk_upsert(fact_shipments, "shipments", ["no_resi"])
-        db.bulk_upsert(fact_payments, "payments", ["order_id"])
+        run.timed(
+            "upsert shipments",
+            db.bulk_upsert,
+            fact_shipments,
+            "shipments",
+            ["no_resi"],
+        )
+        run.timed(
+            "upsert payments", db.bulk_upsert, fact_payments, "payments", ["order_id"]
+        )
 
         st.success("🎉 Pipeline Silver-to-Gold Selesai!")
+        if owns_run:
+            run.finish()
+            save_pipeline_run(run)
         return True
 
     except Exception as e:
         logging.exception("Gagal total di pipeline Silver-to-Gold.")
         st.error(f"Gagal total di pipeline Silver-to-Gold: {e}")
+        if owns_run:
+            run.finish("error", str(e))
+            save_pipeline_run(run)
         raise e
+    finally:
+        if owns_run:
+            run.stop_memory_tracking()
@@ -8,6 +8,7 @@ import pandas.io.sql as pd_sql
 from psycopg2 import sql
 
 from database.db_connection import get_connection
+from pipeline.utils.instrumentation import record_copy
 
 
 def bulk_upsert(df: pd.DataFrame, table_name: str, conflict_cols: list):
@@ -49,6 +50,7 @@ def bulk_upsert(df: pd.DataFrame, table_name: str, conflict_cols: list):
                 # 2. COPY data dari DataFrame ke temporary table
                 s_buf = io.StringIO()
                 df.to_csv(s_buf, index=False, header=False, sep="\t")
+                record_copy(len(df), len(s_buf.getvalue().encode()))
                 s_buf.seek(0)
 
                 cursor.copy_expert(
@@ -121,6 +123,7 @@ def get_keys_for_batch(
                 # 2. Bulk Load natural keys ke Tabel Temporer
                 s_buf = io.StringIO()
                 batch_keys_df.to_csv(s_buf, index=False, header=False, sep="\t")
+                record_copy(len(batch_keys_df), len(s_buf.getvalue().encode()))
                 s_buf.seek(0)
                 cursor.copy_expert(
                     f"COPY {temp_table} FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t')",
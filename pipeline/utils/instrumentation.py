@@ -0,0 +1,206 @@
+"""
+Instrumentasi per tahap untuk pipeline ETL.
+
+PipelineRun mencatat setiap tahap (durasi, baris, bytes COPY, memori) lewat
+context manager stage(). Memori default diukur dari RSS proses saat ini di awal
+dan akhir tahap (nyaris tanpa biaya): peak_mem_mb = yang lebih besar dari
+keduanya, rss_delta_mb = selisihnya. ru_maxrss tidak dipakai karena merupakan
+puncak sejak proses Streamlit dimulai, sama untuk semua tahap. track_memory=True
+memakai tracemalloc untuk puncak alokasi sebenarnya per tahap, tetapi
+memperlambat seluruh proses (termasuk sesi Streamlit lain) sehingga hanya untuk
+benchmark. Fungsi load di db_utils melaporkan jumlah
+baris & bytes yang di-COPY ke tahap yang sedang aktif via record_copy(),
+sehingga orkestrator tidak perlu meneruskan statistik secara manual.
+Hasil run disimpan ke tabel pipeline_runs (lihat
+database/migrations/004_pipeline_runs.sql).
+"""
+
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+import psutil
+import psycopg2
+from psycopg2.extras import Json
+
+from database.db_connection import get_connection
+from pipeline.config.variables import get_now_in_jakarta
+
+_current_stage = ContextVar("pipeline_current_stage", default=None)
+
+_MB = 1024 * 1024
+_process = psutil.Process()
+
+
+def _current_rss_bytes() -> int:
+    return _process.memory_info().rss
+
+
+def record_copy(rows: int, nbytes: int):
+    """Menambahkan statistik COPY ke tahap yang sedang aktif (jika ada)."""
+    stage = _current_stage.get()
+    if stage is not None:
+        stage["copy_rows"] += rows
+        stage["copy_bytes"] += nbytes
+
+
+class PipelineRun:
+    """
+    Satu run pipeline ETL beserta catatan per tahapnya.
+
+    Contoh:
+        run = PipelineRun("marketplace_upload")
+        try:
+            with run.stage("standardize_silver") as stage:
+                df = standardize_silver_data(df_dirty)
+                stage["rows_out"] = len(df)
+            run.finish()
+        finally:
+            run.stop_memory_tracking()
+        save_pipeline_run(run)
+    """
+
+    def __init__(self, pipeline_name: str, track_memory: bool = False):
+        self.pipeline_name = pipeline_name
+        self.started_at = get_now_in_jakarta()
+        self.finished_at = None
+        self.status = "running"
+        self.error = None
+        self.rows_in = None
+        self.stages = []
+        self._start = time.perf_counter()
+        self.duration_s = None
+
+        # tracemalloc hanya dihentikan oleh run yang menyalakannya
+        self._owns_tracemalloc = track_memory and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        self.track_memory = track_memory
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int = None):
+        """
+        Context manager untuk satu tahap. Yield dict record tahap yang boleh
+        dilengkapi pemanggil (mis. record["rows_out"] = len(df)).
+        """
+        record = {
+            "stage": name,
+            "rows_in": rows_in,
+            "rows_out": None,
+            "copy_rows": 0,
+            "copy_bytes": 0,
+            "duration_s": None,
+            "peak_mem_mb": None,
+            "rss_delta_mb": None,
+            "status": "success",
+        }
+        token = _current_stage.set(record)
+        if self.track_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        rss_start = _current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception:
+            record["status"] = "error"
+            raise
+        finally:
+            record["duration_s"] = round(time.perf_counter() - start, 3)
+            rss_end = _current_rss_bytes()
+            record["rss_delta_mb"] = round((rss_end - rss_start) / _MB, 1)
+            if self.track_memory and tracemalloc.is_tracing():
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+            else:
+                peak_bytes = max(rss_start, rss_end)
+            record["peak_mem_mb"] = round(peak_bytes / _MB, 1)
+            _current_stage.reset(token)
+            self.stages.append(record)
+
+    def timed(self, name: str, func, *args, **kwargs):
+        """
+        Menjalankan func(*args, **kwargs) sebagai satu tahap. Jika hasilnya
+        DataFrame, jumlah barisnya dicatat sebagai rows_out.
+        """
+        with self.stage(name) as record:
+            result = func(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                record["rows_out"] = len(result)
+        return result
+
+    def finish(self, status: str = "success", error: str = None):
+        """Menutup run (status "success" atau "error")."""
+        self.finished_at = get_now_in_jakarta()
+        self.duration_s = round(time.perf_counter() - self._start, 3)
+        self.status = status
+        self.error = error
+        self.stop_memory_tracking()
+
+    def stop_memory_tracking(self):
+        """
+        Menghentikan tracemalloc jika run ini yang menyalakannya. Panggil di
+        finally: st.rerun()/st.stop() adalah BaseException dan melewati finish().
+        """
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    @property
+    def peak_mem_mb(self):
+        peaks = [s["peak_mem_mb"] for s in self.stages if s["peak_mem_mb"] is not None]
+        return max(peaks) if peaks else None
+
+    def breakdown(self) -> pd.DataFrame:
+        """Breakdown per tahap sebagai DataFrame (urut sesuai eksekusi)."""
+        df = pd.DataFrame(self.stages)
+        if df.empty:
+            return df
+        total = df["duration_s"].sum()
+        df["share_pct"] = (df["duration_s"] / total * 100).round(1) if total else 0.0
+        return df
+
+
+def save_pipeline_run(run: PipelineRun) -> dict:
+    """
+    Menyimpan satu run ke tabel pipeline_runs. Kegagalan menyimpan hanya
+    di-log agar tidak menggagalkan proses ETL yang sudah selesai.
+    """
+    query = """
+        INSERT INTO pipeline_runs (
+            pipeline_name, started_at, finished_at, status, duration_s,
+            rows_in, peak_mem_mb, error, stages
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING run_id;
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(
+                query,
+                (
+                    run.pipeline_name,
+                    run.started_at,
+                    run.finished_at,
+                    run.status,
+                    run.duration_s,
+                    run.rows_in,
+                    run.peak_mem_mb,
+                    run.error,
+                    Json(run.stages),
+                ),
+            )
+            run_id = cur.fetchone()[0]
+        conn.commit()
+        return {"status": "success", "message": f"Run {run_id} tersimpan."}
+    except (Exception, psycopg2.DatabaseError) as error:
+        if conn:
+            conn.rollback()
+        logging.error(f"Gagal menyimpan pipeline run: {error}")
+        return {"status": "error", "message": str(error)}
+    finally:
+        if conn:
+            conn.close()
@@ -0,0 +1,121 @@
+"""
+Pemeriksaan regresi rencana query (EXPLAIN) untuk query budget & cashflow.
+
+Memastikan filter tanggal pada query di database.db_manager tetap sargable,
+yaitu bisa memakai index finance_budget_plan (lihat migrasi 003).
+Sequential scan dimatikan selama pemeriksaan sehingga query yang predikatnya
+tidak bisa memakai index tetap akan terlihat sebagai "Seq Scan".
+
+Tidak adanya Seq Scan saja belum cukup: index
+(project_id, parameter_name, month_start) tetap bisa dipakai lewat project_id
+walaupun filter tanggalnya berupa to_date(...) per baris. Karena itu query
+yang memfilter finance_budget_plan langsung juga wajib memuat month_start di
+Index Cond.
+
+Jalankan dari root project:
+    python -m scripts.check_query_plans
+
+Pemeriksaan yang sama juga dijalankan oleh tests/test_query_plans.py (dilewati
+jika database dari .streamlit/secrets.toml tidak tersedia).
+"""
+
+import json
+import sys
+from datetime import date
+
+from database.db_connection import get_connection
+from database.db_manager import (
+    MARKETING_ADS_RATIO_QUERY,
+    MONTH_NAMES,
+    MONITORING_CASHFLOW_QUERY,
+    TOTAL_SALES_TARGET_QUERY,
+    get_month_keys,
+)
+
+START_DATE = date(2025, 1, 1)
+END_DATE = date(2025, 12, 31)
+
+# (nama, query, params, wajib memakai month_start di Index Cond)
+CHECKS = [
+    (
+        "get_total_sales_target",
+        TOTAL_SALES_TARGET_QUERY,
+        {"project_id": 1, "start_date": START_DATE, "end_date": END_DATE},
+        True,
+    ),
+    (
+        "get_marketing_ads_ratio",
+        MARKETING_ADS_RATIO_QUERY,
+        {"project_name": "", "start_date": START_DATE, "end_date": END_DATE},
+        True,
+    ),
+    (
+        # Definisi vw_monitoring_cashflow tidak ada di repo ini; yang bisa
+        # dijamin hanya tidak ada Seq Scan pada finance_budget_plan
+        "get_vw_monitoring_cashflow",
+        MONITORING_CASHFLOW_QUERY,
+        {
+            "project_name": "",
+            "month_keys": get_month_keys(START_DATE, END_DATE),
+            "month_names": MONTH_NAMES,
+        },
+        False,
+    ),
+]
+
+
+def _iter_plan_nodes(node):
+    """Menelusuri seluruh node pada plan EXPLAIN (format JSON)."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _iter_plan_nodes(child)
+
+
+def plan_problems(cur, query: str, params: dict, require_month_start: bool) -> list:
+    """Mengembalikan daftar masalah rencana query terhadap finance_budget_plan."""
+    cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    raw_plan = cur.fetchone()[0]
+    plan = raw_plan if isinstance(raw_plan, list) else json.loads(raw_plan)
+    nodes = list(_iter_plan_nodes(plan[0]["Plan"]))
+
+    problems = []
+    if any(
+        node["Node Type"] == "Seq Scan"
+        and node.get("Relation Name") == "finance_budget_plan"
+        for node in nodes
+    ):
+        problems.append("Seq Scan finance_budget_plan")
+    if require_month_start and not any(
+        node.get("Index Name", "").startswith("idx_finance_budget_plan")
+        and "month_start" in node.get("Index Cond", "")
+        for node in nodes
+    ):
+        problems.append("month_start tidak ada di Index Cond")
+    return problems
+
+
+def main() -> int:
+    conn = get_connection()
+    failed = []
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET enable_seqscan = off;")
+            for name, query, params, require_month_start in CHECKS:
+                problems = plan_problems(cur, query, params, require_month_start)
+                status = "OK" if not problems else "GAGAL"
+                detail = f" ({'; '.join(problems)})" if problems else ""
+                print(f"[{status}] {name}{detail}")
+                if problems:
+                    failed.append(name)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    if failed:
+        print(f"Query tidak sargable: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
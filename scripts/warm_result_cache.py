@@ -0,0 +1,152 @@
+"""
+Mengisi result cache di disk (database/result_cache.py) setelah ETL harian.
+
+Pengunjung pertama dashboard setiap pagi tidak lagi menanggung query mart
+yang dingin: script ini menjalankan query mart yang paling sering dibuka
+dengan parameter yang sama persis dengan default dashboard, sehingga key
+cache-nya cocok:
+
+    - Dashboard Finance (bulan berjalan s/d hari ini): get_mart_budget_plan,
+      get_mart_monitoring_cashflow, get_mart_budget_ads_summary, dan
+      get_mart_marketing_ads_ratio untuk semua project sekaligus dan untuk
+      setiap project.
+    - Dashboard Marketing (MTD s/d kemarin WIB, plus periode yang sama bulan
+      lalu): get_vw_ads_performance_summary per project.
+
+Sebelum mengisi cache, versi mart berupa materialized view dinaikkan lewat
+bump_cache_versions() agar entri lama (sebelum REFRESH) tidak terpakai.
+Event trigger di migrasi 009 sudah melakukannya pada setiap REFRESH; langkah
+ini untuk database tanpa event trigger. Lewati dengan --skip-bump jika tidak
+perlu.
+Koneksi diambil dari .streamlit/secrets.toml.
+
+Jalankan dari root project (mis. lewat cron setelah ETL selesai):
+    python -m scripts.warm_result_cache
+    python -m scripts.warm_result_cache --skip-bump --project "Zhi Yang Yao"
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import date
+
+import pandas as pd
+
+from database.cache_versions import bump_cache_versions
+from database.db_connection import get_engine
+from database.db_manager import get_vw_ads_performance_summary
+from database.queries.dimmension_query import get_nama_project
+from database.queries.finance_query import (
+    get_mart_budget_ads_summary,
+    get_mart_budget_plan,
+    get_mart_marketing_ads_ratio,
+    get_mart_monitoring_cashflow,
+)
+from database.result_cache import ENABLED
+from views.config import get_yesterday_in_jakarta
+
+# Mart berupa materialized view: versinya tidak dinaikkan oleh trigger
+MATERIALIZED_MARTS = [
+    "mart_finance_budget_plan",
+    "mart_monitoring_cashflow",
+    "mart_budget_ads_summary",
+]
+
+FINANCE_READERS = [
+    get_mart_budget_plan,
+    get_mart_monitoring_cashflow,
+    get_mart_budget_ads_summary,
+    get_mart_marketing_ads_ratio,
+]
+
+
+def _warm(label: str, func, *args) -> bool:
+    """Menjalankan satu reader dan mencetak hasilnya; False jika hasilnya kosong."""
+    start = time.perf_counter()
+    df = func(*args)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    status = "OK" if not df.empty else "KOSONG"
+    print(f"[{status}] {func.__name__} {label}: {len(df)} baris, {elapsed_ms:.0f} ms")
+    return not df.empty
+
+
+def warm_finance(engine, project_groups: list, today: date) -> int:
+    """Periode default Dashboard Finance: tanggal 1 bulan ini s/d hari ini."""
+    start_date = today.replace(day=1)
+    empty = 0
+    for label, project_names in project_groups:
+        for func in FINANCE_READERS:
+            if not _warm(label, func, engine, project_names, start_date, today):
+                empty += 1
+    return empty
+
+
+def warm_ads_performance(project_names: list, yesterday: date) -> int:
+    """MTD s/d kemarin dan periode pembanding bulan lalu (Dashboard Marketing)."""
+    start_curr = yesterday.replace(day=1)
+    cutoff_prev = (pd.Timestamp(yesterday) - pd.DateOffset(months=1)).date()
+    start_prev = cutoff_prev.replace(day=1)
+    empty = 0
+    for project_name in project_names:
+        for start_date, end_date in (
+            (start_curr, yesterday),
+            (start_prev, cutoff_prev),
+        ):
+            label = f"{project_name} {start_date}..{end_date}"
+            if not _warm(
+                label,
+                get_vw_ads_performance_summary,
+                project_name,
+                start_date,
+                end_date,
+            ):
+                empty += 1
+    return empty
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--project",
+        action="append",
+        help="hanya project ini (boleh diulang); default semua project",
+    )
+    parser.add_argument(
+        "--skip-bump",
+        action="store_true",
+        help="jangan naikkan versi materialized view (ETL sudah melakukannya)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if not ENABLED:
+        print("RESULT_CACHE_ENABLED=0, tidak ada yang dihangatkan.")
+        return 0
+
+    if not args.skip_bump:
+        result = bump_cache_versions(MATERIALIZED_MARTS)
+        print(f"[{result['status'].upper()}] {result['message']}")
+        if result["status"] != "success":
+            return 1
+
+    engine = get_engine()
+    # Urutan sama dengan pilihan "Semua Project" di Dashboard Finance
+    all_projects = sorted(get_nama_project())
+    project_names = sorted(args.project) if args.project else all_projects
+    project_groups = [(name, [name]) for name in project_names]
+    if not args.project:
+        project_groups.insert(0, ("Semua Project", all_projects))
+
+    start = time.perf_counter()
+    empty = warm_finance(engine, project_groups, date.today())
+    empty += warm_ads_performance(project_names, get_yesterday_in_jakarta())
+    print(
+        f"Selesai dalam {time.perf_counter() - start:.1f} detik "
+        f"({empty} hasil kosong, tidak disimpan ke cache)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
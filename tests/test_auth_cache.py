@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from database import auth_cache
+
+
+def test_refresh_after_empty_first_load_fetches_all_users():
+    row = (
+        "admin",
+        "Admin",
+        "hash",
+        "Superuser",
+        ["Zhi Yang Yao"],
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    with mock.patch.object(
+        auth_cache, "get_cache_versions", return_value={"auth_users": 1}
+    ), mock.patch.object(auth_cache, "_fetch_users", side_effect=[[], [row]]) as fetch:
+        auth_cache.invalidate_auth_cache()
+        auth_cache._refresh()
+        assert auth_cache._users == {}
+
+        # Belum ada watermark: refresh berikutnya memuat semua user
+        auth_cache._refresh()
+
+    assert fetch.call_args_list[1] == mock.call(since=None)
+    assert auth_cache._users["admin"]["role"] == "superuser"
+    auth_cache.invalidate_auth_cache()
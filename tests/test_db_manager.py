@@ -0,0 +1,23 @@
+from unittest import mock
+
+import pandas as pd
+
+from database import db_manager
+
+
+def test_process_flag_changes_reg_applies_and_commits():
+    conn = mock.MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.rowcount = 1
+    original_df = pd.DataFrame({"id_flag": [1, 2], "kategori": ["RETURN", "RETURN"]})
+    changes = {
+        "deleted_rows": [0],
+        "edited_rows": {1: {"kategori": "ADJUSTMENT"}},
+        "added_rows": [{"nominal_adjustment": 5000.0}],
+    }
+
+    db_manager.process_flag_changes_reg(conn, original_df, changes)
+
+    # DELETE, UPDATE, INSERT masing-masing satu statement ke order_flag_reg
+    assert cur.execute.call_count == 3
+    conn.commit.assert_called_once()
@@ -0,0 +1,39 @@
+from unittest import mock
+
+import pandas as pd
+
+from pipeline.utils import db_utils, instrumentation
+from pipeline.utils.instrumentation import PipelineRun
+
+MB = 1024 * 1024
+
+
+def test_stage_records_memory_of_that_stage_only():
+    run = PipelineRun("test")
+    with mock.patch.object(
+        instrumentation,
+        "_current_rss_bytes",
+        side_effect=[400 * MB, 450 * MB, 450 * MB, 300 * MB],
+    ):
+        with run.stage("load"):
+            pass
+        with run.stage("transform"):
+            pass
+
+    load, transform = run.stages
+    assert (load["peak_mem_mb"], load["rss_delta_mb"]) == (450.0, 50.0)
+    assert (transform["peak_mem_mb"], transform["rss_delta_mb"]) == (450.0, -150.0)
+
+
+def test_bulk_upsert_records_copy_size_in_bytes():
+    df = pd.DataFrame({"sku": ["ZYY-001"], "nama_produk": ["Teh Hijau – 250ml"]})
+    run = PipelineRun("test")
+    with mock.patch.object(db_utils, "get_connection"), mock.patch.object(
+        db_utils.pd_sql, "get_schema", return_value="CREATE TABLE t ()"
+    ):
+        with run.stage("upsert") as stage:
+            db_utils.bulk_upsert(df, "dim_produk", "sku")
+
+    # "–" (en dash) 3 byte dalam UTF-8
+    assert stage["copy_rows"] == 1
+    assert stage["copy_bytes"] == len("ZYY-001\tTeh Hijau – 250ml\n".encode())
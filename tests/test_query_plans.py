@@ -0,0 +1,64 @@
+import json
+from unittest import mock
+
+import pytest
+
+from database.db_connection import get_connection
+from scripts.check_query_plans import CHECKS, plan_problems
+
+
+def _cursor_with_plan(plan: dict):
+    cur = mock.MagicMock()
+    cur.fetchone.return_value = (json.dumps([{"Plan": plan}]),)
+    return cur
+
+
+def test_plan_problems_flags_index_scan_without_month_start():
+    # Index dipakai lewat project_id saja, filter tanggal tetap per baris
+    cur = _cursor_with_plan(
+        {
+            "Node Type": "Index Scan",
+            "Relation Name": "finance_budget_plan",
+            "Index Name": "idx_finance_budget_plan_project_param_month",
+            "Index Cond": "(project_id = 1)",
+        }
+    )
+    assert plan_problems(cur, "SELECT 1", {}, True) == [
+        "month_start tidak ada di Index Cond"
+    ]
+
+
+def test_plan_problems_flags_seq_scan():
+    cur = _cursor_with_plan(
+        {
+            "Node Type": "Aggregate",
+            "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "finance_budget_plan"}
+            ],
+        }
+    )
+    assert plan_problems(cur, "SELECT 1", {}, False) == ["Seq Scan finance_budget_plan"]
+
+
+@pytest.fixture(scope="module")
+def plan_cursor():
+    try:
+        conn = get_connection()
+    except Exception as error:
+        pytest.skip(f"Database tidak tersedia: {error}")
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET enable_seqscan = off;")
+            yield cur
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "name, query, params, require_month_start",
+    CHECKS,
+    ids=[check[0] for check in CHECKS],
+)
+def test_query_plan_is_sargable(plan_cursor, name, query, params, require_month_start):
+    assert plan_problems(plan_cursor, query, params, require_month_start) == []
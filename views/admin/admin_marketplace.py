@@ -9,12 +9,61 @@ from pipeline.config.variables import get_now_in_jakarta
 from pipeline.transformers.silver_standardizer import standardize_silver_data
 from pipeline.transformers.silver_to_gold import process_silver_to_gold
 from pipeline.utils.helpers import load_dataframe
+from pipeline.utils.instrumentation import PipelineRun, save_pipeline_run
 from views.style import load_css
 
 warnings.filterwarnings("ignore")
 
 load_css()
 
+
+def display_pipeline_breakdown(run: PipelineRun):
+    """Menampilkan breakdown durasi, baris, bytes COPY, dan memori per tahap."""
+    breakdown = run.breakdown()
+    if breakdown.empty:
+        return
+
+    st.markdown("#### Breakdown Waktu per Tahap")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Durasi", f"{run.duration_s:,.1f} s")
+    col2.metric("Baris Input", f"{run.rows_in or 0:,}")
+    col3.metric("Peak Memori", f"{run.peak_mem_mb or 0:,.1f} MB")
+
+    breakdown["copy_mb"] = (breakdown["copy_bytes"] / (1024 * 1024)).round(2)
+    st.bar_chart(
+        breakdown.set_index("stage")["duration_s"], horizontal=True, height=500
+    )
+    st.dataframe(
+        breakdown[
+            [
+                "stage",
+                "status",
+                "duration_s",
+                "share_pct",
+                "rows_out",
+                "copy_rows",
+                "copy_mb",
+                "peak_mem_mb",
+                "rss_delta_mb",
+            ]
+        ],
+        width="stretch",
+        hide_index=True,
+        column_config={
+            "stage": "Tahap",
+            "duration_s": st.column_config.NumberColumn("Durasi (s)", format="%.3f"),
+            "share_pct": st.column_config.ProgressColumn(
+                "Porsi (%)", format="%.1f", min_value=0, max_value=100
+            ),
+            "rows_out": "Baris Output",
+            "copy_rows": "Baris COPY",
+            "copy_mb": "COPY (MB)",
+            "peak_mem_mb": "Peak Memori (MB)",
+            "rss_delta_mb": st.column_config.NumberColumn("Δ RSS (MB)", format="%+.1f"),
+        },
+    )
+
+
 st.header("Data Entry Harian Admin Marketplace")
 
 (
@@ -39,14 +88,18 @@ with admin_marketplace_tab:
         if uploaded_file is None:
             st.warning("Mohon upload file terlebih dahulu sebelum memproses.")
         else:
+            run = PipelineRun("marketplace_upload")
             try:
                 # --- Standardisasi (Silver) ---
                 df_clean_silver = None
                 with st.spinner("Langkah 1/2: Menstandardisasi data (Cleaning)..."):
                     # 1. Load file
-                    df_dirty = load_dataframe(uploaded_file)
+                    df_dirty = run.timed("load file", load_dataframe, uploaded_file)
+                    run.rows_in = len(df_dirty)
                     # 2. Panggil Standardizer
-                    df_clean_silver = standardize_silver_data(df_dirty)
+                    df_clean_silver = run.timed(
+                        "standardize silver", standardize_silver_data, df_dirty
+                    )
 
                 st.success("Langkah 1/2: Standardisasi Selesai.")
                 st.dataframe(df_clean_silver.head(), width="stretch")
@@ -58,18 +111,33 @@ with admin_marketplace_tab:
                         "Langkah 2/2: Memproses & memuat data ke Database Gold... (Ini mungkin butuh waktu)"
                     ):
                         # Orchestrator untuk proses Silver ke Gold
-                        success = process_silver_to_gold(df_clean_silver)
+                        success = process_silver_to_gold(df_clean_silver, run=run)
 
                     if success:
+                        run.finish()
                         st.success("SEMUA PROSES SELESAI! Database telah diperbarui.")
                         st.balloons()
                     else:
+                        run.finish("error", "Proses Gold gagal tanpa error.")
                         st.error("Proses Gold gagal tanpa error, silakan cek log.")
 
             except Exception as e:
+                run.finish("error", str(e))
                 st.error("PROSES GAGAL")
                 st.exception(e)
                 logging.exception("Error terjadi selama proses ETL di Streamlit:")
+            finally:
+                run.stop_memory_tracking()
+
+            save_pipeline_run(run)
+            display_pipeline_breakdown(run)
+
+    with st.expander("Riwayat Run ETL"):
+        df_runs = db_manager.get_recent_pipeline_runs("marketplace_upload")
+        if df_runs.empty:
+            st.caption("Belum ada run yang tercatat.")
+        else:
+            st.dataframe(df_runs, width="stretch", hide_index=True)
 
 
 with pesanan_khusus_marketplace_page:
@@ -82,6 +150,10 @@ with pesanan_khusus_marketplace_page:
             ("RETURN", "CANCEL"),
         )
         order_ids_input = st.text_area("Order ID", height=150)
+        allow_unknown = st.checkbox(
+            "Simpan juga Order ID yang belum ada di data pesanan",
+            help="Gunakan jika file pesanan untuk Order ID tersebut belum diunggah.",
+        )
         submit_button = st.form_submit_button("Simpan Data")
 
         if submit_button:
@@ -92,19 +164,28 @@ with pesanan_khusus_marketplace_page:
                     if oid.strip()
                 ]
 
-                try:
-                    if db_manager.insert_order_flags_batch(
-                        tanggal_input, kategori_pesanan, order_ids
-                    ):
-                        st.success(
-                            f"Data untuk kategori '{kategori_pesanan}' berhasil disimpan!"
-                        )
-                    else:
-                        st.error(
-                            "Gagal menyimpan data. Cek log server untuk detail error."
+                result = db_manager.insert_order_flags_batch(
+                    tanggal_input,
+                    kategori_pesanan,
+                    order_ids,
+                    allow_unknown=allow_unknown,
+                )
+                if result["status"] == "success":
+                    st.success(
+                        f"Kategori '{kategori_pesanan}': {result['inserted']} disimpan, "
+                        f"{result['duplicates']} duplikat dilewati, "
+                        f"{result['unknown']} tidak ditemukan di data pesanan."
+                    )
+                    if result["unknown_ids"]:
+                        label = (
+                            "Order ID tidak dikenal (tetap disimpan)"
+                            if allow_unknown
+                            else "Order ID tidak dikenal (tidak disimpan)"
                         )
-                except Exception as e:
-                    st.error(f"Terjadi kesalahan: {e}")
+                        with st.expander(f"{label}: {result['unknown']}"):
+                            st.code("\n".join(result["unknown_ids"]))
+                else:
+                    st.error(f"Gagal menyimpan data: {result['message']}")
 
             else:
                 st.warning("Input Order ID tidak boleh kosong.")
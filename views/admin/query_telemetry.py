@@ -0,0 +1,75 @@
+import streamlit as st
+
+from database.query_telemetry import (
+    PERSIST_TELEMETRY,
+    clear_query_log,
+    flush_query_telemetry,
+    get_query_log,
+    get_query_stats,
+)
+from views.style import load_css
+
+load_css()
+
+if st.session_state.get("role") not in ("owner", "superuser"):
+    st.error("Halaman ini hanya untuk owner/superuser.")
+    st.stop()
+
+st.header("Query Telemetry")
+st.caption(
+    "Latensi helper baca database di proses server ini (ring buffer in-memory). "
+    "Cache hit tidak menyentuh database; fokuskan index/materialisasi pada query "
+    "dengan p95 tinggi dan hit rate rendah."
+)
+
+col1, col2, col3 = st.columns([2, 1, 1])
+with col1:
+    include_hits = st.toggle("Sertakan cache hit", value=False)
+with col2:
+    if st.button("Kosongkan Log", width="stretch"):
+        clear_query_log()
+        st.rerun()
+with col3:
+    if st.button("Simpan ke Tabel", width="stretch", disabled=not PERSIST_TELEMETRY):
+        result = flush_query_telemetry()
+        if result["status"] == "success":
+            st.success(result["message"])
+        else:
+            st.error(result["message"])
+
+df_log = get_query_log()
+if df_log.empty:
+    st.info("Belum ada query yang tercatat sejak server berjalan.")
+    st.stop()
+
+m1, m2, m3 = st.columns(3)
+m1.metric("Total Panggilan", f"{len(df_log):,}", border=True)
+m2.metric("Cache Hit Rate", f"{df_log['cache_hit'].mean():.0%}", border=True)
+m3.metric(
+    "p95 Query DB (ms)",
+    f"{df_log.loc[~df_log['cache_hit'], 'duration_ms'].quantile(0.95):,.0f}",
+    border=True,
+)
+
+st.subheader("Query Paling Lambat (per fungsi & parameter)")
+df_stats = get_query_stats(include_cache_hits=include_hits)
+st.dataframe(
+    df_stats,
+    width="stretch",
+    hide_index=True,
+    column_config={
+        "function": "Fungsi",
+        "params": "Parameter",
+        "calls": "Panggilan",
+        "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+        "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+        "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.1f"),
+        "avg_rows": st.column_config.NumberColumn("Rata-rata Baris", format="%.0f"),
+        "cache_hit_rate": st.column_config.ProgressColumn(
+            "Cache Hit Rate", format="percent", min_value=0, max_value=1
+        ),
+    },
+)
+
+with st.expander("Log Mentah (terbaru di atas)"):
+    st.dataframe(df_log, width="stretch", hide_index=True)
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytz
+import streamlit as st
 
 from database.db_manager import get_dim_projects
 
@@ -325,6 +326,10 @@ REG_MAP_PROJECT = {
     ],
 }
 
+# Rentang default filter tanggal data regular (hari terakhir yang ada datanya),
+# agar halaman hanya menarik jendela yang dilihat, bukan seluruh histori
+REG_DEFAULT_WINDOW_DAYS = 30
+
 TOKO_BANDUNG = [
     "SP zhi yang yao official",
     "SP erassgo bandung",
@@ -367,4 +372,11 @@ PLATFORM_REGULAR = [
     "Sadewa Citra Mandiri",
 ]
 
-PROJECT_NAME_LIST = get_dim_projects()["project_name"].tolist()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_project_name_list() -> list:
+    """
+    Mengambil daftar nama project dari dim_projects.
+    Dipanggil saat dibutuhkan (bukan saat import) agar import modul tidak memicu query.
+    """
+    return get_dim_projects()["project_name"].tolist()
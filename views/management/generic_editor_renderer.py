@@ -1,15 +1,31 @@
 import copy
-import logging
 import time
 from datetime import date, timedelta
 
 import streamlit as st
 
 from database.db_generic_crud import (
-    fetch_distinct_options,
+    fetch_distinct_options_batch,
     fetch_filtered_data,
     process_generic_changes,
 )
+from database.result_cache import clear_result_cache, expire_table_versions
+
+# Dropdown kolom editor yang opsinya difilter per project:
+# kolom -> (tabel sumber, kolom sumber, label)
+PROJECT_OPTION_COLUMNS = {
+    "nama_toko": ("dim_stores", "nama_toko", "Nama Toko"),
+    "akun": ("dim_cpas_accounts", "nama_akun_cpas", "Pilih Akun"),
+    "product_name": ("dim_reg_products", "nama_produk", "Nama Produk"),
+}
+
+
+def _option_source(f_config: dict):
+    """(tabel, kolom, pakai project_context) untuk filter selectbox, atau None."""
+    src = f_config.get("options_source")
+    if f_config["filter_type"] != "selectbox" or not src:
+        return None
+    return (src["table"], src["column"], bool(src.get("needs_project_context")))
 
 
 def render_generic_editor(engine, config: dict, project_context: str = None):
@@ -42,6 +58,26 @@ def render_generic_editor(engine, config: dict, project_context: str = None):
         else:
             base_filter = {}
             ui_filter_configs = filter_configs
+
+        # column_config bisa berupa callable agar opsi dropdown diambil saat render, bukan saat import
+        column_config = config.get("column_config", {})
+        if callable(column_config):
+            column_config = column_config()
+
+        # Semua opsi filter dan dropdown editor diambil dalam satu round trip
+        option_sources = [
+            source for source in map(_option_source, ui_filter_configs) if source
+        ]
+        if project_context:
+            option_sources += [
+                (table, column, True)
+                for col_name, (table, column, _) in PROJECT_OPTION_COLUMNS.items()
+                if col_name in column_config
+            ]
+        all_options = fetch_distinct_options_batch(
+            engine, option_sources, project_context=project_context
+        )
+
         if ui_filter_configs:
             cols = st.columns(len(ui_filter_configs))
             for i, f_config in enumerate(ui_filter_configs):
@@ -72,17 +108,7 @@ def render_generic_editor(engine, config: dict, project_context: str = None):
                     elif f_type == "selectbox":
                         options = ["Semua Kategori"]
                         if "options_source" in f_config:
-                            src = f_config["options_source"]
-                            context_to_pass = None
-                            if src.get("needs_project_context") and project_context:
-                                context_to_pass = project_context
-                            db_opts = fetch_distinct_options(
-                                engine,
-                                src["table"],
-                                src["column"],
-                                project_context=context_to_pass,
-                            )
-                            options += db_opts
+                            options += all_options[_option_source(f_config)]
 
                         elif "options" in f_config:
                             options += f_config["options"]
@@ -132,68 +158,24 @@ def render_generic_editor(engine, config: dict, project_context: str = None):
             width="stretch",
         ):
             st.cache_data.clear()
+            clear_result_cache()
             st.rerun()
 
     df_to_edit = filtered_df.reset_index(drop=True)
     editor_key = f"editor_{table_key}"
 
-    dynamic_column_config = copy.deepcopy(config.get("column_config", {}))
-
-    if project_context and "nama_toko" in dynamic_column_config:
-        try:
-            toko_list_for_project = fetch_distinct_options(
-                _engine=engine,
-                table_name="dim_stores",
-                column_name="nama_toko",
-                project_context=project_context,
-            )
-
-            # 4. Ganti placeholder 'options=[]' dengan daftar yang sudah difilter
-            dynamic_column_config["nama_toko"] = st.column_config.SelectboxColumn(
-                "Nama Toko",
-                options=toko_list_for_project,
-                required=True,
-            )
-        except Exception as e:
-            logging.warning(f"Gagal memuat opsi dinamis 'nama_toko': {e}")
-            pass
-
-    if project_context and "akun" in dynamic_column_config:
-        try:
-            list_for_project = fetch_distinct_options(
-                _engine=engine,
-                table_name="dim_cpas_accounts",
-                column_name="nama_akun_cpas",
-                project_context=project_context,
-            )
-
-            # 4. Ganti placeholder 'options=[]' dengan daftar yang sudah difilter
-            dynamic_column_config["akun"] = st.column_config.SelectboxColumn(
-                "Pilih Akun",
-                options=list_for_project,
-                required=True,
-            )
-        except Exception as e:
-            logging.warning(f"Gagal memuat opsi dinamis 'nama_toko': {e}")
-            pass
-
-    if project_context and "product_name" in dynamic_column_config:
-        try:
-            product_list_for_project = fetch_distinct_options(
-                _engine=engine,
-                table_name="dim_reg_products",  # <-- Dari config
-                column_name="nama_produk",  # <-- Dari config
-                project_context=project_context,  # <-- Teruskan konteks (bisa str/list)
-            )
+    dynamic_column_config = copy.deepcopy(column_config)
 
-            dynamic_column_config["product_name"] = st.column_config.SelectboxColumn(
-                "Nama Produk",
-                options=product_list_for_project,  # <-- SUNTIKKAN OPSI
+    if project_context:
+        for col_name, (table, column, label) in PROJECT_OPTION_COLUMNS.items():
+            if col_name not in dynamic_column_config:
+                continue
+            # Ganti placeholder 'options=[]' dengan daftar yang sudah difilter
+            dynamic_column_config[col_name] = st.column_config.SelectboxColumn(
+                label,
+                options=all_options[(table, column, True)],
                 required=True,
             )
-        except Exception as e:
-            logging.warning(f"Gagal memuat opsi dinamis 'product_name': {e}")
-            pass
 
     edited_df = st.data_editor(
         df_to_edit,
@@ -251,6 +233,9 @@ def render_generic_editor(engine, config: dict, project_context: str = None):
                     )
 
                     st.cache_data.clear()
+                    # Versi tabel di proses ini dibaca ulang agar entri disk
+                    # sebelum edit tidak ikut dipakai lagi
+                    expire_table_versions()
                     time.sleep(3)
                     st.rerun()
 
@@ -75,7 +75,7 @@ FINANCE_TABLE_CONFIGS = {
             "biaya_admin",
             "cash_basis",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -141,7 +141,7 @@ FINANCE_TABLE_CONFIGS = {
             "akrual_basis",
             "cash_basis",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -214,7 +214,7 @@ FINANCE_TABLE_CONFIGS = {
             "nama_toko",
             "nominal_aktual_ads",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -287,7 +287,7 @@ FINANCE_TABLE_CONFIGS = {
             "akun",
             "nominal_aktual_ads",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -340,7 +340,7 @@ FINANCE_TABLE_CONFIGS = {
             "akun",
             "nominal_aktual_ads",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -408,7 +408,7 @@ FINANCE_TABLE_CONFIGS = {
             "nama_toko",
             "nominal_aktual_non_ads",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -463,7 +463,7 @@ FINANCE_TABLE_CONFIGS = {
             "keterangan",
             "nominal_aktual_non_ads",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -535,7 +535,7 @@ FINANCE_TABLE_CONFIGS = {
             "tipe_beban",
             "description",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "transaction_date": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -633,7 +633,7 @@ ADVERTISER_TABLE_CONFIGS = {
             "gross_revenue",
             "ctr",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -727,7 +727,7 @@ ADVERTISER_TABLE_CONFIGS = {
             "konversi",
             "gross_revenue",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -792,7 +792,7 @@ REGULAR_TABLE_CONFIGS = {
             "nominal",
             "keterangan",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "tanggal": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -860,7 +860,7 @@ ADV_CS_REGULAR_TABLE_CONFIGS = {
             "deals_closed",
             "gross_revenue",
         ],
-        "column_config": {
+        "column_config": lambda: {
             "performance_date": st.column_config.DateColumn(
                 "Tanggal",
                 format="YYYY-MM-DD",
@@ -0,0 +1,408 @@
+"""
+Definisi halaman dan navigasi per role.
+
+Struktur navigasi dihitung sekali per (role, daftar project) untuk seluruh
+proses. Objek st.Page dibuat sekali per sesi lalu dipakai ulang di setiap
+rerun; st.Page tidak dibagi antar-sesi karena st.navigation menandai objek
+halaman yang boleh dijalankan (flag per objek).
+"""
+
+import functools
+from typing import NamedTuple
+
+import streamlit as st
+
+
+class PageSpec(NamedTuple):
+    page: str
+    title: str
+    icon: str
+    default: bool = False
+
+
+def _page(page, title, icon, default=False) -> PageSpec:
+    return PageSpec(page, title, icon, default)
+
+
+# DEFINISI SEMUA HALAMAN APLIKASI
+# ==============================================================================
+home_page = _page(
+    "views/home.py", title="Hi There!", icon=":material/home:", default=True
+)
+
+# Halaman Fungsional (Finance, Admin, Stock)
+finance_pages = {
+    "dashboard": _page(
+        "views/dashboard/finance.py",
+        title="Dashboard Finance",
+        icon=":material/dashboard:",
+    ),
+    "budget_plan": _page(
+        "views/finance/budget_plan.py",
+        title="Budget Plan",
+        icon=":material/finance_mode:",
+    ),
+    "cashflow": _page(
+        "views/finance/cashflow.py",
+        title="Cashflow",
+        icon=":material/account_balance_wallet:",
+    ),
+    "finance_data_management": _page(
+        "views/finance/finance_data_management.py",
+        title="Data Management",
+        icon=":material/database:",
+    ),
+}
+admin_pages = {
+    "marketplace": _page(
+        "views/admin/admin_marketplace.py",
+        title="Admin Marketplace",
+        icon=":material/contacts_product:",
+    ),
+}
+
+# Halaman sistem (hanya owner/superuser)
+system_pages = {
+    "query_telemetry": _page(
+        "views/admin/query_telemetry.py",
+        title="Query Telemetry",
+        icon=":material/speed:",
+    ),
+}
+
+# --- HALAMAN BARU UNTUK JALUR REGULAR ---
+regular_pages = {
+    "entry_zyy_juw": _page(
+        "views/regular/zyy_juw_regular.py",
+        title="Entry ZYY x JUW",
+        icon=":material/campaign:",
+    ),
+    "zyy_juw_data_management": _page(
+        "views/regular/zyy_juw_data_management.py",
+        title="Data Management ZYY x JUW",
+        icon=":material/campaign:",
+    ),
+    "entry_enz_kdk": _page(
+        "views/regular/enz_kdk_regular.py",
+        title="Entry ENZ x KDK",
+        icon=":material/campaign:",
+    ),
+    "enz_kdk_data_management": _page(
+        "views/regular/enz_kdk_data_management.py",
+        title="Data Management ENZ x KDK",
+        icon=":material/campaign:",
+    ),
+    "return": _page(
+        "views/regular/order_flag_reg_editor.py",
+        title="Entry Return",
+        icon=":material/assignment_return:",
+    ),
+    "dashboard": _page(
+        "views/regular/dashboard_regular.py",
+        title="Dashboard ADV & CS",
+        icon=":material/dashboard:",
+    ),
+    "dashboard_budget": _page(
+        "views/regular/dashboard_marketing_reg.py",
+        title="Dashboard Marketing",
+        icon=":material/dashboard:",
+    ),
+}
+
+# PETA HALAMAN PER PROYEK (Marketplace)
+PROJECT_PAGE_MAP = {
+    "Zhi Yang Yao": {
+        "entry_adv": _page(
+            "views/advertiser/zyy_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/zyy_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_zyy/dashboard_marketing_zyy.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_zyy/dashboard_advertiser_zyy.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_zyy/dashboard_admin_zyy.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+    "Juwara Herbal": {
+        "entry_adv": _page(
+            "views/advertiser/juw_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/juw_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_juw/dashboard_marketing_juw.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_juw/dashboard_advertiser_juw.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_juw/dashboard_admin_juw.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+    "Enzhico": {
+        "entry_adv": _page(
+            "views/advertiser/enz_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/enz_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_enz/dashboard_marketing_enz.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_enz/dashboard_advertiser_enz.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_enz/dashboard_admin_enz.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+    "Kudaku": {
+        "entry_adv": _page(
+            "views/advertiser/kdk_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/kdk_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_kdk/dashboard_marketing_kdk.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_kdk/dashboard_advertiser_kdk.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_kdk/dashboard_admin_kdk.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+    "Erassgo": {
+        "entry_adv": _page(
+            "views/advertiser/era_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/era_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_era/dashboard_marketing_era.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_era/dashboard_advertiser_era.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_era/dashboard_admin_era.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+    "HPI": {
+        "entry_adv": _page(
+            "views/advertiser/hpi_advertiser.py",
+            title="Entry Advertiser",
+            icon=":material/campaign:",
+        ),
+        "data_management_adv": _page(
+            "views/advertiser/hpi_adv_data_management.py",
+            title="Data Mangement",
+            icon=":material/campaign:",
+        ),
+        "dash_budget": _page(
+            "views/dashboard/project_hpi/dashboard_marketing_hpi.py",
+            title="Dashboard Marketing",
+            icon=":material/money_bag:",
+        ),
+        "dash_adv": _page(
+            "views/dashboard/project_hpi/dashboard_advertiser_hpi.py",
+            title="Dashboard Advertiser",
+            icon=":material/ad_group:",
+        ),
+        "dash_admin": _page(
+            "views/dashboard/project_hpi/dashboard_admin_hpi.py",
+            title="Dashboard Admin",
+            icon=":material/credit_card_heart:",
+        ),
+    },
+}
+
+
+# FUNGSI DINAMIS UNTUK MEMBANGUN NAVIGASI
+@functools.lru_cache(maxsize=256)
+def build_navigation_for_role(role, project_names=()):
+    """
+    Membangun dictionary navigasi berdasarkan peran dan proyek yang diakses.
+    Hasil di-memo per (role, project_names) untuk seluruh proses; isinya
+    PageSpec, bukan st.Page (lihat get_navigation).
+    """
+    pages = {"Home": [home_page]}
+
+    if role == "adv_cs_regular":
+        pages["Menu Regular"] = [
+            regular_pages["entry_zyy_juw"],
+            regular_pages["entry_enz_kdk"],
+            regular_pages["zyy_juw_data_management"],
+            regular_pages["enz_kdk_data_management"],
+            regular_pages["dashboard"],
+        ]
+        return pages
+
+    if role == "project_manager_reg":
+        pages["Menu Regular"] = list(regular_pages.values())
+        return pages
+
+    if role == "finance":
+        pages["Finance"] = list(finance_pages.values())
+        for proj_name, proj_pages in PROJECT_PAGE_MAP.items():
+            pages[f"Budgeting {proj_name}"] = [proj_pages["dash_budget"]]
+        return pages
+
+    if role == "admin_marketplace":
+        pages["Entry Data"] = [admin_pages["marketplace"]]
+        for proj_name in project_names:
+            if proj_name in PROJECT_PAGE_MAP:
+                pages[f"Dashboard {proj_name}"] = [
+                    PROJECT_PAGE_MAP[proj_name]["dash_admin"]
+                ]
+        return pages
+
+    if role == "advertiser_marketplace":
+        for proj_name in project_names:
+            if proj_name in PROJECT_PAGE_MAP:
+                pages[f"Project {proj_name}"] = [
+                    PROJECT_PAGE_MAP[proj_name]["entry_adv"],
+                    PROJECT_PAGE_MAP[proj_name]["data_management_adv"],
+                    PROJECT_PAGE_MAP[proj_name]["dash_adv"],
+                ]
+        return pages
+
+    if role == "project_manager":
+        for proj_name in project_names:
+            if proj_name in PROJECT_PAGE_MAP:
+                pages[f"Project {proj_name}"] = [
+                    PROJECT_PAGE_MAP[proj_name]["entry_adv"],
+                    PROJECT_PAGE_MAP[proj_name]["dash_adv"],
+                    PROJECT_PAGE_MAP[proj_name]["dash_budget"],
+                    PROJECT_PAGE_MAP[proj_name]["dash_admin"],
+                ]
+        return pages
+
+    # Peran dengan akses luas
+    all_project_pages = {
+        f"Project {name}": list(pages.values())
+        for name, pages in PROJECT_PAGE_MAP.items()
+    }
+
+    if role == "total_project_manager_sadewa":
+        pages["Admin"] = list(admin_pages.values())
+        pages["Project Regular"] = list(regular_pages.values())
+
+        project_pages_cabang_1 = {
+            f"Project {name}": list(proj_pages.values())
+            for name, proj_pages in PROJECT_PAGE_MAP.items()
+            if name != "HPI"
+        }
+        pages.update(project_pages_cabang_1)
+        return pages
+
+    if role == "total_project_manager_hpi":
+        pages["Admin"] = list(admin_pages.values())
+
+        if "HPI" in PROJECT_PAGE_MAP:
+            pages["Project HPI"] = list(PROJECT_PAGE_MAP["HPI"].values())
+
+        return pages
+
+    if role == "total_project_manager":
+        pages["Admin"] = list(admin_pages.values())
+        pages["Project Regular"] = list(regular_pages.values())
+        all_project_pages = {
+            f"Project {name}": list(pages.values())
+            for name, pages in PROJECT_PAGE_MAP.items()
+        }
+        pages.update(all_project_pages)
+        return pages
+
+    if role in ["owner", "superuser"]:
+        pages["Finance"] = list(finance_pages.values())
+        pages["Admin"] = list(admin_pages.values())
+        pages["Project Regular"] = list(regular_pages.values())
+        pages.update(all_project_pages)
+        pages["Sistem"] = list(system_pages.values())
+        return pages
+
+    return pages
+
+
+def get_navigation(role, project_names) -> dict:
+    """
+    Dictionary navigasi berisi st.Page untuk st.navigation. Objek st.Page dan
+    dictionary-nya disimpan di session_state, sehingga rerun berikutnya
+    dengan role dan project yang sama tidak membangun apa pun lagi.
+    """
+    key = (role, tuple(project_names))
+    cached = st.session_state.get("_navigation")
+    if cached and cached[0] == key:
+        return cached[1]
+
+    page_objects = st.session_state.setdefault("_page_objects", {})
+    nav_pages = {}
+    for section, specs in build_navigation_for_role(*key).items():
+        for spec in specs:
+            if spec not in page_objects:
+                page_objects[spec] = st.Page(
+                    spec.page, title=spec.title, icon=spec.icon, default=spec.default
+                )
+        nav_pages[section] = [page_objects[spec] for spec in specs]
+
+    st.session_state["_navigation"] = (key, nav_pages)
+    return nav_pages
@@ -1,46 +1,53 @@
+from datetime import timedelta
+
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from data_preprocessor.utils import fetch_data
-from database.db_connection import get_connection
+from database.db_connection import get_engine
+from database.queries.regular_query import (
+    get_regular_filter_bounds,
+    get_regular_performance,
+)
+from views.config import REG_DEFAULT_WINDOW_DAYS
 
 st.set_page_config(layout="wide", page_title="Dashboard Regular")
 st.title("📊 Dashboard Performa Regular")
 st.markdown("Analisis metrik gabungan dari tim Advertiser dan CS.")
 
-conn = get_connection()
-full_df = fetch_data(conn)
+engine = get_engine()
+bounds = get_regular_filter_bounds(engine)
 
-if full_df.empty:
+if bounds["max_date"] is None:
     st.warning(
         "Belum ada data di tabel `advertiser_cs_regular`. Silakan isi data terlebih dahulu.",
         icon="⚠️",
     )
 else:
-    all_products = sorted(full_df["product_name"].unique())
+    min_date, max_date = bounds["min_date"], bounds["max_date"]
+    all_products = bounds["products"]
     options = ["Semua Produk"] + all_products
     selected_products = st.multiselect(
         "Pilih Produk", options=options, key="select_product", default="Semua Produk"
     )
 
-    if "Semua Produk" in selected_products:
-        selected_products = all_products
+    # None = tanpa filter produk, agar cache query "semua produk" dipakai bersama
+    product_filter = None if "Semua Produk" in selected_products else selected_products
 
     col2, col3, col4 = st.columns(3)
     with col2:
         start_date = st.date_input(
             "Dari Tanggal",
-            value=full_df["performance_date"].min(),
-            min_value=full_df["performance_date"].min(),
-            max_value=full_df["performance_date"].max(),
+            value=max(min_date, max_date - timedelta(days=REG_DEFAULT_WINDOW_DAYS - 1)),
+            min_value=min_date,
+            max_value=max_date,
         )
     with col3:
         end_date = st.date_input(
             "Sampai Tanggal",
-            value=full_df["performance_date"].max(),
-            min_value=full_df["performance_date"].min(),
-            max_value=full_df["performance_date"].max(),
+            value=max_date,
+            min_value=min_date,
+            max_value=max_date,
         )
     with col4:
         selected_channel = st.selectbox(
@@ -53,17 +60,13 @@ else:
         st.error("Error: Tanggal mulai tidak boleh melebihi tanggal akhir.")
         st.stop()
 
-    start_date = pd.to_datetime(start_date).date()
-    end_date = pd.to_datetime(end_date).date()
-
-    df_filtered = full_df[
-        (full_df["performance_date"] >= start_date)
-        & (full_df["performance_date"] <= end_date)
-        & (full_df["product_name"].isin(selected_products))
-    ]
-
-    if selected_channel != "Semua Channel":
-        df_filtered = df_filtered[df_filtered["channel"] == selected_channel]
+    df_filtered = get_regular_performance(
+        engine,
+        start_date=pd.to_datetime(start_date).date(),
+        end_date=pd.to_datetime(end_date).date(),
+        product_names=product_filter,
+        channel=None if selected_channel == "Semua Channel" else selected_channel,
+    )
 
     if df_filtered.empty:
         st.warning(
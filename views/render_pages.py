@@ -19,23 +19,33 @@ from data_preprocessor.utils import (
     parse_bundle_pcs,
     process_changes,
 )
+from database.db_connection import get_engine
 from database.db_manager import (
-    get_advertiser_cpas_data,
-    get_advertiser_marketplace_data,
     get_budget_ads_summary_by_project,
-    get_budget_regular_summary_by_project,
-    get_dim_projects,
-    get_dim_stores,
-    get_map_project_stores,
     get_target_ads_ratio,
     get_total_sales_target,
     get_vw_ads_performance_summary,
-    get_vw_ragular_performance_summary,
     get_vw_shipments_delivery,
     insert_advertiser_cpas_data,
     insert_advertiser_marketplace_data,
 )
-from views.config import REG_MAP_PROJECT, get_yesterday_in_jakarta
+from database.queries.marketing_query import (
+    clear_advertiser_cache,
+    get_advertiser_data_by_project,
+    get_advertiser_date_bounds,
+)
+from database.queries.regular_query import (
+    clear_regular_cache,
+    get_budgeting_regular_bundle,
+    get_regular_filter_bounds,
+    get_regular_performance,
+)
+from database.store_mapping import get_store_project_mapping
+from views.config import (
+    REG_DEFAULT_WINDOW_DAYS,
+    REG_MAP_PROJECT,
+    get_yesterday_in_jakarta,
+)
 from views.style import format_rupiah, load_css
 
 
@@ -89,6 +99,7 @@ def render_marketplace_page(project_name: str, project_config: dict):
                 ):
                     result = insert_advertiser_marketplace_data(cleaned_df)
                     if result["status"] == "success":
+                        clear_advertiser_cache()
                         st.success(result["message"])
                         st.session_state[preview_key] = False
                     else:
@@ -158,6 +169,7 @@ def render_cpas_page(project_name: str, project_config: dict):
                 ):
                     result = insert_advertiser_cpas_data(cleaned_df)
                     if result["status"] == "success":
+                        clear_advertiser_cache()
                         st.success(result["message"])
                         st.session_state[preview_key] = False
                     else:
@@ -194,30 +206,10 @@ def display_advertiser_dashboard(project_name: str):
     Template untuk menampilkan dashboard advertiser untuk satu project spesifik,
     dengan filter tanggal di bagian atas.
     """
-    try:
-        df_adv = get_advertiser_marketplace_data()
-
-        df_stores = get_dim_stores()
-        df_map = get_map_project_stores()
-        df_projects = get_dim_projects()
-
-        df_mapping = pd.merge(df_map, df_stores, on="store_id")
-        df_mapping = pd.merge(df_mapping, df_projects, on="project_id")
-        store_to_project_map = pd.Series(
-            df_mapping.project_name.values, index=df_mapping.nama_toko
-        ).to_dict()
-
-        df_adv["project"] = df_adv["nama_toko"].map(store_to_project_map)
-        df_adv["tanggal"] = pd.to_datetime(df_adv["tanggal"]).dt.date
-        df_adv.dropna(subset=["project"], inplace=True)
-
-        df_project = df_adv[df_adv["project"] == project_name].copy()
-
-    except Exception as e:
-        st.error(f"Gagal memuat atau memproses data advertiser: {e}")
-        st.stop()
-
-    if df_project.empty:
+    engine = get_engine()
+    store_names = tuple(get_store_project_mapping().store_names(project_name))
+    bounds = get_advertiser_date_bounds(engine, "marketplace", store_names)
+    if bounds["max_date"] is None:
         st.warning(
             f"Tidak ada data advertiser yang ditemukan untuk project {project_name}."
         )
@@ -228,8 +220,8 @@ def display_advertiser_dashboard(project_name: str):
         st.write(" ")
 
     with col2:
-        min_date = df_project["tanggal"].min()
-        max_date = df_project["tanggal"].max()
+        min_date = bounds["min_date"]
+        max_date = bounds["max_date"]
         date_range = st.date_input(
             "Pilih Periode",
             value=(min_date, max_date),
@@ -243,9 +235,9 @@ def display_advertiser_dashboard(project_name: str):
         st.stop()
 
     start_date, end_date = date_range
-    df_filtered = df_project[
-        (df_project["tanggal"] >= start_date) & (df_project["tanggal"] <= end_date)
-    ]
+    df_filtered = get_advertiser_data_by_project(
+        engine, "marketplace", project_name, store_names, start_date, end_date
+    )
 
     if df_filtered.empty:
         st.warning("Tidak ada data yang ditemukan untuk filter yang dipilih.")
@@ -502,32 +494,10 @@ def display_advertiser_cpas_dashboard(project_name: str):
     Template untuk menampilkan dashboard advertiser CPAS untuk satu project,
     dengan filter tanggal di bagian atas.
     """
-    try:
-        # 1. Ganti fungsi pengambilan data ke data CPAS
-        df_adv = get_advertiser_cpas_data()
-
-        # Bagian mapping project (tetap sama)
-        df_stores = get_dim_stores()
-        df_map = get_map_project_stores()
-        df_projects = get_dim_projects()
-
-        df_mapping = pd.merge(df_map, df_stores, on="store_id")
-        df_mapping = pd.merge(df_mapping, df_projects, on="project_id")
-        store_to_project_map = pd.Series(
-            df_mapping.project_name.values, index=df_mapping.nama_toko
-        ).to_dict()
-
-        df_adv["project"] = df_adv["nama_toko"].map(store_to_project_map)
-        df_adv["tanggal"] = pd.to_datetime(df_adv["tanggal"]).dt.date
-        df_adv.dropna(subset=["project"], inplace=True)
-
-        df_project = df_adv[df_adv["project"] == project_name].copy()
-
-    except Exception as e:
-        st.error(f"Gagal memuat atau memproses data advertiser CPAS: {e}")
-        st.stop()
-
-    if df_project.empty:
+    engine = get_engine()
+    store_names = tuple(get_store_project_mapping().store_names(project_name))
+    bounds = get_advertiser_date_bounds(engine, "cpas", store_names)
+    if bounds["max_date"] is None:
         st.warning(f"Tidak ada data advertiser CPAS untuk project {project_name}.")
         st.stop()
 
@@ -536,8 +506,8 @@ def display_advertiser_cpas_dashboard(project_name: str):
     with col1:
         st.write(" ")
     with col2:
-        min_date = df_project["tanggal"].min()
-        max_date = df_project["tanggal"].max()
+        min_date = bounds["min_date"]
+        max_date = bounds["max_date"]
         date_range = st.date_input(
             "Pilih Periode",
             value=(min_date, max_date),
@@ -551,9 +521,9 @@ def display_advertiser_cpas_dashboard(project_name: str):
         st.stop()
 
     start_date, end_date = date_range
-    df_filtered = df_project[
-        (df_project["tanggal"] >= start_date) & (df_project["tanggal"] <= end_date)
-    ]
+    df_filtered = get_advertiser_data_by_project(
+        engine, "cpas", project_name, store_names, start_date, end_date
+    )
 
     if df_filtered.empty:
         st.warning("Tidak ada data yang ditemukan untuk filter yang dipilih.")
@@ -677,15 +647,22 @@ def display_advertiser_cpas_dashboard(project_name: str):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_team_regular_tab(team_name, full_df, conn):
+def render_team_regular_tab(team_name, conn):
     """Merender seluruh UI dan logika untuk satu tab tim."""
     team_products_channels = REG_MAP_PROJECT[team_name]
     team_products = sorted(list(set([p[0] for p in team_products_channels])))
 
+    template_message = st.session_state.pop(f"template_msg_{team_name}", None)
+    if template_message:
+        st.toast(template_message, icon="🎉")
+
     with st.container(border=True):
         st.markdown("#### Generate Template Harian")
-        template_date = st.date_input(
-            "Pilih Tanggal", value=get_yesterday_in_jakarta(), key=f"date_{team_name}"
+        yesterday = get_yesterday_in_jakarta()
+        template_dates = st.date_input(
+            "Pilih Tanggal (pilih rentang untuk backfill)",
+            value=(yesterday, yesterday),
+            key=f"date_{team_name}",
         )
         if st.button(
             "Buat Template Harian",
@@ -693,26 +670,51 @@ def render_team_regular_tab(team_name, full_df, conn):
             width="stretch",
             key=f"btn_{team_name}",
         ):
+            # Tanggal dikosongkan: date_input mengembalikan tuple kosong
+            if not template_dates:
+                st.warning("⚠️ Silakan pilih tanggal terlebih dahulu.")
+                st.stop()
+            # Saat rentang baru dipilih separuh, date_input mengembalikan 1 tanggal
+            template_start = template_dates[0]
+            template_end = template_dates[-1]
             with st.spinner(f"Membuat template untuk {team_name}..."):
-                create_daily_template(conn, template_date, team_products_channels)
-                st.toast(f"✅ Template untuk {team_name} siap!", icon="🎉")
-                st.session_state[f"auto_filter_date_{team_name}"] = template_date
-                st.cache_data.clear()
-                if "full_df" in st.session_state:
-                    del st.session_state.full_df
-                time.sleep(2)
-                st.rerun()
+                try:
+                    created = create_daily_template(
+                        conn,
+                        template_start,
+                        team_products_channels,
+                        end_date=template_end,
+                    )
+                except Exception as e:
+                    conn.rollback()
+                    st.error(f"Gagal membuat template: {e}")
+                else:
+                    st.session_state[f"template_msg_{team_name}"] = (
+                        f"✅ {created} baris template dibuat untuk {team_name}."
+                        if created
+                        else f"Template {team_name} untuk tanggal tersebut sudah ada."
+                    )
+                    st.session_state[f"auto_filter_date_{team_name}"] = (
+                        template_start,
+                        template_end,
+                    )
+                    clear_regular_cache()
+                    st.rerun()
     st.divider()
 
     # 2. Filter & Tampilkan Data
-    team_df = full_df[full_df["product_name"].isin(team_products)]
-    default_start_date = st.session_state.get(
+    engine = get_engine()
+    bounds = get_regular_filter_bounds(engine, product_names=team_products)
+    latest_date = bounds["max_date"] or date.today()
+    default_start_date, default_end_date = st.session_state.get(
         f"auto_filter_date_{team_name}",
-        team_df["performance_date"].min() if not team_df.empty else date.today(),
-    )
-    default_end_date = st.session_state.get(
-        f"auto_filter_date_{team_name}",
-        team_df["performance_date"].max() if not team_df.empty else date.today(),
+        (
+            max(
+                bounds["min_date"] or latest_date,
+                latest_date - timedelta(days=REG_DEFAULT_WINDOW_DAYS - 1),
+            ),
+            latest_date,
+        ),
     )
 
     st.markdown("### 🔎 Filter Data")
@@ -741,18 +743,19 @@ def render_team_regular_tab(team_name, full_df, conn):
     if f"auto_filter_date_{team_name}" in st.session_state:
         del st.session_state[f"auto_filter_date_{team_name}"]
 
-    start_date_pd = pd.to_datetime(start_date).date()
-    end_date_pd = pd.to_datetime(end_date).date()
-    filtered_df = team_df[
-        (team_df["performance_date"] >= start_date_pd)
-        & (team_df["performance_date"] <= end_date_pd)
-    ]
-    if selected_product != "Semua Produk":
-        filtered_df = filtered_df[filtered_df["product_name"] == selected_product]
-    if selected_channel != "Semua Channel":
-        filtered_df = filtered_df[filtered_df["channel"] == selected_channel]
+    filtered_df = get_regular_performance(
+        engine,
+        start_date=pd.to_datetime(start_date).date(),
+        end_date=pd.to_datetime(end_date).date(),
+        product_names=(
+            team_products if selected_product == "Semua Produk" else [selected_product]
+        ),
+        channel=None if selected_channel == "Semua Channel" else selected_channel,
+    )
 
-    st.info(f"Menampilkan {len(filtered_df)} dari {len(team_df)} total data tim.")
+    st.info(
+        f"Menampilkan {len(filtered_df)} dari {bounds['total_rows']} total data tim."
+    )
 
     # 3. Data Editor (dengan kolom Channel)
     edited_df = st.data_editor(
@@ -820,9 +823,7 @@ def render_team_regular_tab(team_name, full_df, conn):
                     final_message = ", ".join(messages)
                     st.toast(f"✅ Berhasil! {final_message}.", icon="🎉")
                     time.sleep(5)
-                    st.cache_data.clear()
-                    if "full_df" in st.session_state:
-                        del st.session_state.full_df
+                    clear_regular_cache()
                     st.rerun()
             except Exception as e:
                 st.error(f"Terjadi kesalahan saat menyimpan: {e}")
@@ -954,16 +955,12 @@ def display_budgeting_regular_dashboard(project_id: int, project_name: str):
         f"Periode: {tgl_awal.strftime('%d %B %Y')} s/d {tgl_akhir.strftime('%d %B %Y')}"
     )
 
+    # Target, omset akrual, target rasio, dan data iklan dalam satu query
+    bundle = get_budgeting_regular_bundle(get_engine(), project_id, tgl_awal, tgl_akhir)
+
     # --- Bagian 1: Analisis Omset (Tidak Berubah) ---
-    total_target_omset = get_total_sales_target(project_id, tgl_awal, tgl_akhir)
-    df_raw = get_budget_regular_summary_by_project(
-        start_date=tgl_awal,
-        end_date=tgl_akhir,
-    )
-    total_omset_aktual = 0
-    if not df_raw.empty:
-        # total_omset_aktual = df_omset_unik["omset_akrual"].sum()
-        total_omset_aktual = df_raw["akrual_basis"].sum()
+    total_target_omset = bundle["target_omset"]
+    total_omset_aktual = bundle["omset_akrual"]
     pencapaian_persen = (
         (float(total_omset_aktual) / float(total_target_omset) * 100)
         if total_target_omset > 0
@@ -978,7 +975,7 @@ def display_budgeting_regular_dashboard(project_id: int, project_name: str):
 
     st.header("Analisis Performa Iklan")
 
-    df_ads = get_vw_ragular_performance_summary(tgl_awal, tgl_akhir)
+    df_ads = bundle["ads"]
 
     if df_ads.empty:
         st.info("Tidak ada data performa iklan yang ditemukan untuk periode ini.")
@@ -992,7 +989,7 @@ def display_budgeting_regular_dashboard(project_id: int, project_name: str):
 
         year = tgl_akhir.year
         quarter = (tgl_akhir.month - 1) // 3 + 1
-        target_rasio = get_target_ads_ratio(project_id, year, quarter)
+        target_rasio = bundle["target_rasio"]
 
         if target_rasio is None:
             st.warning(f"Target rasio untuk Q{quarter} {year} belum diatur.")
@@ -1009,20 +1006,6 @@ def display_budgeting_regular_dashboard(project_id: int, project_name: str):
                 status_text = "Over"
                 bar_color = "tomato"
 
-            df_ads["target_rasio"] = target_rasio
-            conditions = [
-                df_ads["ads_spend_percentage_net"] < safe_zone_start,
-                (df_ads["ads_spend_percentage_net"] >= safe_zone_start)
-                & (df_ads["ads_spend_percentage_net"] <= target_rasio),
-            ]
-
-            # Definisikan pilihan status sesuai kondisi
-            choices = ["Under", "Normal"]
-
-            # Tambahkan kolom 'target_rasio' dan 'status'
-            df_ads["target_rasio"] = target_rasio
-            df_ads["status"] = np.select(conditions, choices, default="Over")
-
             fig = go.Figure(
                 go.Indicator(
                     mode="gauge+number",
@@ -1077,16 +1060,11 @@ def display_budgeting_regular_dashboard(project_id: int, project_name: str):
 
         st.subheader("Total Omset Berjalan vs Ads Spend")
 
-        df_omset_daily = (
-            df_ads.groupby("tanggal")[["total_omset", "total_spending"]]
-            .sum()
-            .reset_index()
-            .rename(
-                columns={
-                    "total_omset": "Total Omset Berjalan",
-                    "total_spending": "Total Ad Spend",
-                }
-            )
+        df_omset_daily = bundle["ads_daily"].rename(
+            columns={
+                "total_omset": "Total Omset Berjalan",
+                "total_spending": "Total Ad Spend",
+            }
         )
 
         fig_line = px.line(
@@ -1147,11 +1125,14 @@ def calculate_ads_status(df, target_rasio, safe_zone_start):
     Menambahkan kolom 'status' ke DataFrame berdasarkan target rasio.
     Menggunakan kolom 'ads_spend_percentage' yang sudah ada di df.
     """
+    ratio = df["ads_spend_percentage"]
     conditions = [
-        df["ads_spend_percentage"] < safe_zone_start,  # Under
-        (df["ads_spend_percentage"] >= safe_zone_start)
-        & (df["ads_spend_percentage"] <= target_rasio),  # Normal
+        ratio < safe_zone_start,  # Under
+        (ratio >= safe_zone_start) & (ratio <= target_rasio),  # Normal
     ]
+    # Kolom ber-dtype Arrow menghasilkan boolean nullable; NA dianggap False
+    # (sama seperti perbandingan NaN pada float numpy)
+    conditions = [c.to_numpy(dtype=bool, na_value=False) for c in conditions]
     choices = ["Under", "Normal"]
     df["status"] = np.select(conditions, choices, default="Over")
     df["target_rasio"] = target_rasio
@@ -1647,6 +1628,7 @@ def render_regular_adv_cs_page(project_name: str, project_config: dict):
                 ):
                     result = insert_advertiser_marketplace_data(cleaned_df)
                     if result["status"] == "success":
+                        clear_advertiser_cache()
                         st.success(result["message"])
                         st.session_state[preview_key] = False
                     else:
@@ -7,11 +7,14 @@ import plotly.express as px
 import streamlit as st
 
 from database.db_manager import (
+    get_ads_performance_freshness,
     get_budget_ads_summary_by_project,
     get_target_ads_ratio,
     get_total_sales_target,
     get_vw_ads_performance_summary,
+    refresh_ads_performance_summary,
 )
+from database.result_cache import clear_result_cache
 from views.config import get_yesterday_in_jakarta
 
 
@@ -74,6 +77,39 @@ def format_rupiah(value):
     return f"Rp {value:,.0f}"
 
 
+def display_ads_data_freshness():
+    """
+    Menampilkan indikator kesegaran data mart performa iklan.
+    Jika mart ditandai stale, tampilkan peringatan dan tombol sinkronisasi ulang.
+    """
+    freshness = get_ads_performance_freshness()
+    last_refreshed_at = freshness["last_refreshed_at"]
+    waktu = (
+        last_refreshed_at.strftime("%d %b %Y %H:%M")
+        if last_refreshed_at is not None
+        else "belum pernah"
+    )
+
+    if not freshness["is_stale"]:
+        st.caption(f"Data iklan terakhir diperbarui: **{waktu}**")
+        return
+
+    col_warning, col_sync = st.columns([6, 1.2], vertical_alignment="center")
+    col_warning.warning(
+        f"Data iklan mungkin belum mutakhir (terakhir diperbarui: {waktu})."
+    )
+    if col_sync.button(
+        "Sinkronkan", icon=":material/sync:", key="sync_ads_mart", width="stretch"
+    ):
+        with st.spinner("Memperbarui data performa iklan..."):
+            result = refresh_ads_performance_summary()
+        if result["status"] == "success":
+            st.toast(result["message"], icon=":material/check_box:")
+            st.rerun()
+        else:
+            st.error(f"Gagal memperbarui data iklan: {result['message']}")
+
+
 # ==============================================================================
 # 1. BAGIAN OMSET (STRATEGIC - MTD)
 # ==============================================================================
@@ -440,6 +476,7 @@ def display_marketing_dashboard(project_id: int, project_name: str):
             label=" ", icon=":material/cached:", help="Refresh Data", width="stretch"
         ):
             st.cache_data.clear()
+            clear_result_cache()
             st.toast(
                 "Mengambil data terbaru...",
                 icon=":material/check_box:",
@@ -453,6 +490,8 @@ def display_marketing_dashboard(project_id: int, project_name: str):
     else:
         tgl_awal_filter, tgl_akhir_filter = date_range
 
+    display_ads_data_freshness()
+
     st.markdown("---")
 
     # 1. OMSET SUMMARY (Selalu MTD)